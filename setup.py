@@ -25,4 +25,12 @@ setup(
         "urllib3>=1.21.1",  # Retry 기능 안정화 버전
         "pydantic>=1.8.0",  # Python 3.7 지원 안정 버전
     ],
+    extras_require={
+        "async": [
+            "aiohttp>=3.8.0",  # Async*Service 트랜스포트
+        ],
+        "numpy": [
+            "numpy>=1.20.0",  # FrameColumns.to_numpy()
+        ],
+    },
 ) 
\ No newline at end of file
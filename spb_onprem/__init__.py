@@ -13,6 +13,16 @@ from .models.service import ModelService
 from .reports.service import ReportService
 from .diagnoses.service import DiagnosisService
 
+# Asyncio services
+from .datasets.async_service import AsyncDatasetService
+from .data.async_service import AsyncDataService
+from .slices.async_service import AsyncSliceService
+from .activities.async_service import AsyncActivityService
+from .contents.async_service import AsyncContentService
+from .models.async_service import AsyncModelService
+from .reports.async_service import AsyncReportService
+from .diagnoses.async_service import AsyncDiagnosisService
+
 # Core Entities and Enums
 from .entities import (
     # Core Entities
@@ -118,6 +128,16 @@ __all__ = (
     "ReportService",
     "DiagnosisService",
 
+    # Asyncio services
+    "AsyncDatasetService",
+    "AsyncDataService",
+    "AsyncSliceService",
+    "AsyncActivityService",
+    "AsyncContentService",
+    "AsyncModelService",
+    "AsyncReportService",
+    "AsyncDiagnosisService",
+
     # Core Entities
     "Data",
     "Scene",
@@ -1,8 +1,10 @@
 from .service import ActivityService
+from .async_service import AsyncActivityService
 from .entities import ActivityHistory, ActivityStatus
 
 __all__ = (
     "ActivityService",
+    "AsyncActivityService",
     "ActivityHistory", 
     "ActivityStatus",
 )
@@ -0,0 +1,15 @@
+"""
+This module defines the AsyncActivityService class, the asyncio variant of ActivityService.
+
+Classes:
+    AsyncActivityService: An asyncio service class that provides every ActivityService method as a coroutine.
+"""
+from spb_onprem.async_base_service import AsyncBaseService
+from .service import ActivityService
+
+
+class AsyncActivityService(AsyncBaseService, service_class=ActivityService):
+    """
+    Asyncio service class for handling activity-related operations.
+    Every public method of ActivityService is available as a coroutine with the same arguments.
+    """
@@ -0,0 +1,396 @@
+"""
+This module defines the asyncio transport and the base class of the asyncio services.
+
+Classes:
+    AsyncTransport: A pooled aiohttp transport with the same retry policy as the sync services.
+    AsyncResponse: The buffered HTTP response returned by ``AsyncTransport.request``.
+    AsyncBaseService: The base class of the asyncio variants of the services.
+
+The asyncio services do not duplicate the service code. A method of the wrapped sync
+service runs on the event loop until its first GraphQL request, which is awaited on the
+transport; the method is then replayed with the response to post-process it, as in a
+GraphQL batch. A method that makes a second request, or an HTTP request, continues in a
+worker thread from the responses already received, and every further request it makes
+is sent as a coroutine on the event loop while the thread waits for its result. The
+``Queries`` dicts, the ``*_params`` builders and the response handling are therefore
+shared with the sync services.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, ClassVar, Dict, List, Optional, Set, Tuple, Type
+
+from spb_onprem.base_service import (
+    BaseService,
+    _call_recorder,
+    _CallRecorder,
+    _PendingCall,
+    extract_gql_result,
+    print_gql_debug,
+)
+from spb_onprem.exceptions import (
+    BadRequestError,
+    BadResponseError,
+    BaseSDKError,
+    ResponseError,
+    SDKConfigError,
+)
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class AsyncResponse():
+    """A buffered HTTP response, mirroring the parts of ``requests.Response`` used by the SDK."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncTransport():
+    """Pooled aiohttp transport shared by asyncio services.
+
+    Args:
+        limit (int): The maximum number of connections open at once.
+        limit_per_host (int): The maximum number of connections open to a single host. 0 means no limit.
+        retries (int): The number of retries for connection errors and 500/502/504 responses.
+        backoff_factor (float): The backoff factor between retries.
+        timeout (float): The total timeout of a request in seconds.
+    """
+    STATUS_FORCELIST = (500, 502, 504)
+    BACKOFF_MAX = 120
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        retries: int = 5,
+        backoff_factor: float = 2,
+        timeout: float = 300,
+    ):
+        if aiohttp is None:
+            raise SDKConfigError(
+                "aiohttp is required for the asyncio services. "
+                "Install it with `pip install superb-ai-onprem[async]`."
+            )
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _backoff_time(self, attempt: int) -> float:
+        if attempt <= 1:
+            return 0
+        backoff = min(self.BACKOFF_MAX, self.backoff_factor * (2 ** (attempt - 1)))
+        return backoff * random.uniform(0.5, 1.5)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        data: Any = None,
+        json_data: Any = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """Send an HTTP request, retrying connection errors and 500/502/504 responses.
+
+        Raises:
+            BadRequestError: The request failed or the server answered with an error status.
+
+        Returns:
+            AsyncResponse: The buffered response.
+        """
+        session = self._get_session()
+        request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if hasattr(data, "seek") and attempt > 1:
+                    data.seek(0)
+                async with session.request(
+                    method.upper(),
+                    url,
+                    headers=headers,
+                    params=params,
+                    data=data,
+                    json=json_data,
+                    timeout=request_timeout,
+                ) as response:
+                    content = await response.read()
+                    if response.status in self.STATUS_FORCELIST and attempt <= self.retries:
+                        await asyncio.sleep(self._backoff_time(attempt))
+                        continue
+                    result = AsyncResponse(
+                        status_code=response.status,
+                        headers=dict(response.headers),
+                        content=content,
+                        url=str(response.url),
+                    )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt <= self.retries:
+                    await asyncio.sleep(self._backoff_time(attempt))
+                    continue
+                raise BadRequestError(f"HTTP request failed: {str(e)}") from e
+            if not result.ok:
+                raise BadRequestError(
+                    f"HTTP request failed: {result.status_code} Error for url: {result.url}"
+                )
+            return result
+
+    async def close(self):
+        """Close the pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class _LoopBridge():
+    """Sends the requests of a service method running in a worker thread on the event loop.
+
+    The outcomes of the requests already sent on the event loop are played back first.
+    """
+
+    def __init__(
+        self,
+        service: "AsyncBaseService",
+        loop: asyncio.AbstractEventLoop,
+        outcomes: List[Tuple[Tuple[Any, ...], bool, Any]],
+    ):
+        self._service = service
+        self._loop = loop
+        self._recorded = _CallRecorder(outcomes)
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the method at its next request."""
+        self._cancelled.set()
+
+    def _send(self, coroutine):
+        if self._cancelled.is_set():
+            coroutine.close()
+            raise asyncio.CancelledError()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def request_gql(self, query: Any, variables: Dict[str, Any]):
+        try:
+            return self._recorded.request_gql(query, variables)
+        except _PendingCall:
+            return self._send(self._service.request_gql(query=query, variables=variables))
+
+    def request(self, **kwargs):
+        try:
+            return self._recorded.request(**kwargs)
+        except _PendingCall:
+            return self._send(self._service.request(**kwargs))
+
+
+def _make_async_method(name: str, func):
+    @functools.wraps(func)
+    async def method(self, *args, **kwargs):
+        return await self._run(func, args, kwargs)
+    method.__qualname__ = name
+    return method
+
+
+class AsyncBaseService():
+    """The base class of the asyncio services.
+
+    A subclass names the sync service it wraps, and gets a coroutine for every public method of it.
+    A method that makes a single GraphQL request never leaves the event loop, so as many calls
+    as the transport has connections can be in flight. A method that makes more requests, or
+    is marked with ``async_in_thread``, occupies a worker thread until it returns; the
+    service has ``transport.limit`` of them::
+
+        class AsyncDataService(AsyncBaseService, service_class=DataService):
+            pass
+
+        async with AsyncDataService() as data_service:
+            data = await data_service.get_data(dataset_id, data_id)
+
+    Args:
+        transport (Optional[AsyncTransport]): The transport to send requests with.
+            Pass the same transport to several services to share one connection pool.
+    """
+    _service_class: ClassVar[Type[BaseService]] = BaseService
+    # The methods that run in a worker thread: the marked ones, and those seen making several requests.
+    _threaded: ClassVar[Set[Any]] = set()
+
+    def __init_subclass__(cls, service_class: Optional[Type[BaseService]] = None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if service_class is None:
+            return
+        cls._service_class = service_class
+        cls._threaded = set()
+        for name, func in inspect.getmembers(service_class, inspect.isfunction):
+            if name.startswith("_") or hasattr(BaseService, name) or name in cls.__dict__:
+                continue
+            if getattr(func, "__sync_only__", False):
+                continue
+            if inspect.isgeneratorfunction(func) or inspect.iscoroutinefunction(func):
+                continue
+            if getattr(func, "__async_in_thread__", False):
+                cls._threaded.add(func)
+            setattr(cls, name, _make_async_method(name, func))
+
+    def __init__(self, transport: Optional[AsyncTransport] = None):
+        self._service = self._service_class()
+        self._owns_transport = transport is None
+        self.transport = transport or AsyncTransport()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def endpoint(self) -> str:
+        return self._service.endpoint
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Stop the worker threads, and close the transport if this service created it."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._owns_transport:
+            await self.transport.close()
+
+    async def request_gql(self, query: Any, variables: Dict[str, Any]):
+        """Request Graphql query to the server."""
+        print_gql_debug(
+            "request",
+            {
+                "endpoint": self.endpoint,
+                "operation": query.get("name"),
+                "variables": variables,
+            },
+        )
+        try:
+            response = await self.transport.request(
+                "POST",
+                self.endpoint,
+                headers=self._service._auth_user.auth_headers,
+                json_data={
+                    "query": query["query"],
+                    "variables": variables,
+                },
+            )
+            return extract_gql_result(query, response.json())
+        except BadRequestError as e:
+            raise BadResponseError(str(e)) from e
+        except BaseSDKError as e:
+            raise e
+        except Exception as e:
+            raise ResponseError(f"Unexpected error: {str(e)}") from e
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        data: Any = None,
+        json_data: Any = None,
+        timeout: int = 30,
+    ) -> AsyncResponse:
+        """Send an HTTP request with the auth headers, like ``BaseService.request``."""
+        return await self.transport.request(
+            method,
+            url,
+            headers={
+                **(headers or {}),
+                **self._service._auth_user.auth_headers,
+            },
+            params=params,
+            data=data,
+            json_data=json_data,
+            timeout=timeout,
+        )
+
+    def _replay(self, func, args, kwargs, outcomes: List[Tuple[Tuple[Any, ...], bool, Any]]):
+        # Runs the method on the event loop; raises _PendingCall at its first request without an outcome.
+        token = _call_recorder.set(_CallRecorder(outcomes))
+        try:
+            return func(self._service, *args, **kwargs)
+        finally:
+            _call_recorder.reset(token)
+
+    async def _run(self, func, args, kwargs):
+        outcomes: List[Tuple[Tuple[Any, ...], bool, Any]] = []
+        if func not in self._threaded:
+            try:
+                return self._replay(func, args, kwargs, outcomes)
+            except _PendingCall as pending:
+                if pending.kind == "gql":
+                    try:
+                        outcomes.append((pending.signature, False, await self.request_gql(**pending.kwargs)))
+                    except BaseSDKError as e:
+                        outcomes.append((pending.signature, True, e))
+                    try:
+                        return self._replay(func, args, kwargs, outcomes)
+                    except _PendingCall:
+                        pass
+            self._threaded.add(func)
+        return await self._run_in_thread(func, args, kwargs, outcomes)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.transport.limit, thread_name_prefix="spb-onprem-async"
+            )
+        return self._executor
+
+    async def _run_in_thread(self, func, args, kwargs, outcomes: List[Tuple[Tuple[Any, ...], bool, Any]]):
+        loop = asyncio.get_running_loop()
+        bridge = _LoopBridge(self, loop, outcomes)
+
+        def call():
+            token = _call_recorder.set(bridge)
+            try:
+                return func(self._service, *args, **kwargs)
+            finally:
+                _call_recorder.reset(token)
+
+        try:
+            return await loop.run_in_executor(self._get_executor(), contextvars.copy_context().run, call)
+        except asyncio.CancelledError:
+            bridge.cancel()
+            raise
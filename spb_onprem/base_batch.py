@@ -0,0 +1,197 @@
+"""
+This module defines the GraphQLBatch class for sending many service calls in one HTTP round trip.
+
+Classes:
+    BatchOperation: The pending result of a service call queued in a batch.
+    GraphQLBatch: A context that merges queued service calls into aliased GraphQL documents.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from spb_onprem.base_service import (
+    BaseService,
+    _call_recorder,
+    _CallRecorder,
+    _PendingCall,
+)
+from spb_onprem.exceptions import BadParameterError, BaseSDKError, RequestError
+from spb_onprem.utils.graphql import operation_type
+
+
+class BatchOperation():
+    """The pending result of a service call queued in a GraphQLBatch.
+
+    The result is available once the batch has been flushed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        query: Any,
+        variables: Dict[str, Any],
+        signature: Tuple[Any, ...],
+    ):
+        self.name = name
+        self.query = query
+        self.variables = variables
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._signature = signature
+        self._done = False
+        self._result: Any = None
+        self._error: Optional[BaseSDKError] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def error(self) -> Optional[BaseSDKError]:
+        return self._error
+
+    def result(self) -> Any:
+        """Get the value the service method returned for this call.
+
+        Raises:
+            RequestError: The batch has not been flushed yet.
+            BaseSDKError: The error the server reported for this call.
+        """
+        if not self._done:
+            raise RequestError(f"The batched '{self.name}' call has not been sent yet.")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _resolve(self, service: BaseService, response: Any, error: Optional[BaseSDKError]):
+        # Replay the service method with the response, so it post-processes it as usual.
+        outcome = (self._signature, True, error) if error is not None else (self._signature, False, response)
+        token = _call_recorder.set(_CallRecorder([outcome]))
+        try:
+            self._result = self._func(service, *self._args, **self._kwargs)
+        except _PendingCall:
+            self._error = BadParameterError(f"'{self.name}' makes more than one request and can not be batched.")
+        except BaseSDKError as e:
+            self._error = e
+        finally:
+            _call_recorder.reset(token)
+        self._done = True
+
+
+class GraphQLBatch():
+    """Queue service calls and send them as aliased GraphQL operations, up to ``max_ops`` per request.
+
+    Any service method that makes exactly one GraphQL request can be queued by calling it on the batch.
+    The call returns a BatchOperation whose result is available after the batch is flushed::
+
+        with data_service.batch(max_ops=100) as batch:
+            operations = [
+                batch.update_tags(dataset_id=dataset_id, slice_id=slice_id, data_id=data_id, tags=["night"])
+                for data_id in data_ids
+            ]
+        updated = [operation.result() for operation in operations]
+
+    Queries and mutations are sent in separate documents. The batch is flushed when it
+    holds ``max_ops`` operations and when the context exits without an exception.
+    A batch is not thread-safe.
+
+    Args:
+        service (BaseService): The service whose methods are queued.
+        max_ops (int): The maximum number of operations per HTTP request.
+    """
+
+    def __init__(self, service: BaseService, max_ops: int = 100):
+        if max_ops < 1:
+            raise BadParameterError("max_ops must be at least 1.")
+        self._service = service
+        self.max_ops = max_ops
+        self._pending: List[BatchOperation] = []
+        self.requests_sent = 0
+        self.operations_sent = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._pending = []
+
+    def __getattr__(self, name: str):
+        func = getattr(type(self._service), name, None)
+        if name.startswith("_") or not callable(func) or hasattr(BaseService, name):
+            raise AttributeError(f"'{type(self._service).__name__}' has no batchable method '{name}'")
+
+        def queue(*args, **kwargs) -> BatchOperation:
+            return self.queue(name, *args, **kwargs)
+        queue.__doc__ = func.__doc__
+        return queue
+
+    @property
+    def pending(self) -> int:
+        """The number of queued operations that have not been sent."""
+        return len(self._pending)
+
+    def queue(self, method_name: str, *args, **kwargs) -> BatchOperation:
+        """Queue a call of a service method.
+
+        Args:
+            method_name (str): The name of the service method.
+
+        Raises:
+            BadParameterError: The method does not make a single GraphQL request.
+
+        Returns:
+            BatchOperation: The pending result of the call.
+        """
+        func = getattr(type(self._service), method_name)
+        pending = self._record(method_name, func, args, kwargs)
+        operation = BatchOperation(
+            method_name, func, args, kwargs,
+            pending.kwargs["query"], pending.kwargs["variables"], pending.signature,
+        )
+        self._pending.append(operation)
+        if len(self._pending) >= self.max_ops:
+            self.flush()
+        return operation
+
+    def _record(self, method_name: str, func: Callable, args: tuple, kwargs: dict) -> _PendingCall:
+        # Run the method until its request; parameter validation errors are raised here.
+        token = _call_recorder.set(_CallRecorder([]))
+        try:
+            func(self._service, *args, **kwargs)
+        except _PendingCall as pending:
+            if pending.kind == "gql":
+                return pending
+        finally:
+            _call_recorder.reset(token)
+        raise BadParameterError(f"'{method_name}' does not make a single GraphQL request and can not be batched.")
+
+    def flush(self) -> List[BatchOperation]:
+        """Send every queued operation.
+
+        Returns:
+            List[BatchOperation]: The operations that were sent.
+        """
+        operations, self._pending = self._pending, []
+        groups: Dict[str, List[BatchOperation]] = {}
+        for operation in operations:
+            groups.setdefault(operation_type(operation.query), []).append(operation)
+
+        for group in groups.values():
+            for start in range(0, len(group), self.max_ops):
+                chunk = group[start:start + self.max_ops]
+                try:
+                    outcomes = self._service.request_gql_batch(
+                        [(operation.query, operation.variables) for operation in chunk]
+                    )
+                except BaseSDKError as e:
+                    outcomes = [(None, e)] * len(chunk)
+                self.requests_sent += 1
+                self.operations_sent += len(chunk)
+                for operation, (response, error) in zip(chunk, outcomes):
+                    operation._resolve(self._service, response, error)
+        return operations
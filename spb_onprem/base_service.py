@@ -1,12 +1,17 @@
-from typing import Optional, Dict, Any, ClassVar
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, ClassVar, List, Tuple, Union
 import json
 import os
 import random
+import warnings
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 
+from spb_onprem.base_types import Undefined, UndefinedType
+from spb_onprem.session_pool import SessionPool
+from spb_onprem.utils.graphql import merge_aliased_operations
 from spb_onprem.users.entities import AuthUser
 from spb_onprem.exceptions import (
     NotFoundError,
@@ -19,6 +24,164 @@ from spb_onprem.exceptions import (
     ResponseError,
 )
 
+# Set while a service method runs under a recorder (GraphQL batches) or an asyncio
+# service, so that every request the method makes goes through it instead of requests.
+_call_recorder: ContextVar[Optional[Any]] = ContextVar("spb_onprem_call_recorder", default=None)
+
+
+def sync_only(func):
+    """Mark a service method that must not get an asyncio variant.
+
+    Use this for methods that issue requests from worker threads or yield results lazily;
+    they cannot run on the asyncio transport.
+    """
+    func.__sync_only__ = True
+    return func
+
+
+def async_in_thread(func):
+    """Mark a service method whose asyncio variant always runs in a worker thread.
+
+    Use this for methods that read or hash files before their first request, so that the
+    work does not block the event loop.
+    """
+    func.__async_in_thread__ = True
+    return func
+
+
+def _call_signature(kind: str, kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+    # What identifies a request when a recorded outcome is played back.
+    if kind == "gql":
+        query = kwargs["query"]
+        return kind, query.get("name"), query.get("query")
+    return kind, str(kwargs.get("method", "")).upper(), kwargs.get("url")
+
+
+class _PendingCall(BaseException):
+    """Raised inside a recorded service method at its first request that has no recorded response yet.
+
+    It derives from BaseException so that ``except Exception`` blocks in the service code do not catch it.
+    """
+
+    def __init__(self, kind: str, kwargs: Dict[str, Any]):
+        super().__init__(kind)
+        self.kind = kind
+        self.kwargs = kwargs
+
+    @property
+    def signature(self) -> Tuple[Any, ...]:
+        return _call_signature(self.kind, self.kwargs)
+
+
+class _CallRecorder():
+    """Plays back the recorded outcomes of the requests made by a service method.
+
+    Every outcome is ``(signature, is_error, value)``. A request that does not match the
+    signature of the next outcome raises a RequestError instead of receiving the response
+    of another request.
+    """
+
+    def __init__(self, outcomes: List[Tuple[Tuple[Any, ...], bool, Any]]):
+        self._outcomes = outcomes
+        self._position = 0
+
+    def _next(self, kind: str, kwargs: Dict[str, Any]):
+        if self._position < len(self._outcomes):
+            signature, is_error, value = self._outcomes[self._position]
+            if signature != _call_signature(kind, kwargs):
+                raise RequestError(
+                    f"Recorded response for {signature[:2]} does not match the request "
+                    f"{_call_signature(kind, kwargs)[:2]}."
+                )
+            self._position += 1
+            if is_error:
+                raise value
+            return value
+        raise _PendingCall(kind, kwargs)
+
+    def request_gql(self, query: Any, variables: Dict[str, Any]):
+        return self._next("gql", {"query": query, "variables": variables})
+
+    def request(self, **kwargs):
+        return self._next("http", kwargs)
+
+
+def print_gql_debug(title: str, obj: Any = None):
+    """Print a GraphQL debug block when SDK_DEBUG_GQL=1."""
+    if os.environ.get("SDK_DEBUG_GQL") != "1":
+        return
+    try:
+        debug_max_chars = int(os.environ.get("SDK_DEBUG_GQL_MAX_CHARS", "10000"))
+    except ValueError:
+        debug_max_chars = 10000
+
+    print(f"\n=== SDK_DEBUG_GQL: {title} ===")
+    if obj is None:
+        return
+    try:
+        text = json.dumps(obj, ensure_ascii=False, default=str)
+    except Exception:
+        text = str(obj)
+    if debug_max_chars > 0 and len(text) > debug_max_chars:
+        text = text[:debug_max_chars] + "...<truncated>"
+    print(text)
+
+
+def gql_error(error: Dict[str, Any]) -> BaseSDKError:
+    """Convert a GraphQL error into the matching SDK exception."""
+    code = error.get("code") or (error.get("extensions") or {}).get("code")
+    message = error.get("message", "Unknown error")
+    if code == "NOT_FOUND":
+        return NotFoundError(message)
+    return UnknownError(f"GraphQL errors: {message}")
+
+
+def extract_gql_result(query: Any, result: Any):
+    """Validate a GraphQL response body and extract the result of the query.
+
+    Args:
+        query (Any): The query object that was requested.
+        result (Any): The decoded JSON response body.
+
+    Raises:
+        NotFoundError: The server reported a NOT_FOUND error.
+        UnknownError: The server reported any other GraphQL error.
+        BadResponseError: The response does not contain the query result.
+
+    Returns:
+        Any: The value of ``data[query["name"]]``.
+    """
+    print_gql_debug("response_json", result)
+    if not isinstance(result, dict):
+        raise BadRequestError(f"Invalid response format: {type(result).__name__}, expected dict")
+
+    # Check for GraphQL errors
+    if 'errors' in result and result['errors']:
+        print_gql_debug("response_graphql_errors", result.get("errors"))
+        for error in result['errors']:
+            if error['code'] == 'NOT_FOUND':
+                raise NotFoundError(error['message'])
+        error_messages = [error.get('message', 'Unknown error') for error in result['errors']]
+        raise UnknownError(f"GraphQL errors: {', '.join(error_messages)}")
+    
+    # Validate response structure
+    if 'data' not in result:
+        raise BadResponseError("Missing 'data' field in response")
+    
+    query_name = query.get("name")
+    if not query_name:
+        raise BadResponseError("Missing query name in query object")
+    
+    # Handle different response structures
+    data = result['data']
+    
+    # For other queries, expect the query name to be directly in data
+    if query_name not in data:
+        raise BadResponseError(f"Missing '{query_name}' in response data")
+    
+    return data[query_name]
+
+
 class RetryWithJitter(Retry):
     def get_backoff_time(self):
         base_backoff = super().get_backoff_time()
@@ -26,10 +189,55 @@ class RetryWithJitter(Retry):
         return jitter
 
 
+_DEFAULT_RETRIES = 5
+_DEFAULT_BACKOFF_FACTOR = 2
+_DEFAULT_STATUS_FORCELIST = (500, 502, 504)
+_DEFAULT_ALLOWED_METHODS = [
+    'GET',
+    'POST',
+    'PUT',
+    'DELETE',
+    'OPTIONS',
+    'HEAD',
+    'PATCH',
+    'TRACE',
+    'CONNECT'
+]
+
+
+def build_retry(
+    retries=_DEFAULT_RETRIES,
+    backoff_factor=_DEFAULT_BACKOFF_FACTOR,
+    status_forcelist=_DEFAULT_STATUS_FORCELIST,
+    allowed_methods=_DEFAULT_ALLOWED_METHODS,
+) -> Retry:
+    """Build the retry policy mounted on every pooled session."""
+    # urllib3 < 1.26에서는 method_whitelist, >= 1.26에서는 allowed_methods 사용
+    try:
+        return RetryWithJitter(
+            total=retries,
+            read=retries,
+            connect=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset(allowed_methods),
+        )
+    except TypeError:
+        # Fallback for older urllib3 versions
+        return RetryWithJitter(
+            total=retries,
+            read=retries,
+            connect=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            method_whitelist=frozenset(allowed_methods),
+        )
+
+
 class BaseService():
     """The BaseService class is an abstract base class that defines the interface for services that handle data operations.
     """
-    _retry_session: ClassVar[Optional[requests.Session]] = None
+    _session_pool: ClassVar[SessionPool] = SessionPool(max_retries=build_retry)
     _auth_user: Optional[AuthUser] = None
     
     def __init__(self):
@@ -42,86 +250,96 @@ class BaseService():
     @classmethod
     def requests_retry_session(
         cls,
-        retries=5,
-        backoff_factor=2,
-        status_forcelist=(500, 502, 504),
+        retries=_DEFAULT_RETRIES,
+        backoff_factor=_DEFAULT_BACKOFF_FACTOR,
+        status_forcelist=_DEFAULT_STATUS_FORCELIST,
         session=None,
-        allowed_methods=[
-            'GET',
-            'POST',
-            'PUT',
-            'DELETE',
-            'OPTIONS',
-            'HEAD',
-            'PATCH',
-            'TRACE',
-            'CONNECT'
-        ]
+        allowed_methods=_DEFAULT_ALLOWED_METHODS,
+        url: Optional[str] = None,
     ) -> requests.Session:
-        if BaseService._retry_session is None:
+        """Get the long-lived, keep-alive session for the host of the url.
+
+        Args:
+            retries, backoff_factor, status_forcelist, session, allowed_methods: Deprecated. Passing any
+                of them returns a session of its own with that retry policy, outside of the pool, as
+                before the pool existed. Use configure_session_pool() to tune the pool instead.
+            url (Optional[str]): Any url on the target host. Defaults to the configured SDK host.
+
+        Returns:
+            requests.Session: The pooled session. Do not close it; it is shared across services.
+        """
+        legacy = (
+            retries != _DEFAULT_RETRIES
+            or backoff_factor != _DEFAULT_BACKOFF_FACTOR
+            or tuple(status_forcelist) != _DEFAULT_STATUS_FORCELIST
+            or session is not None
+            or list(allowed_methods) != _DEFAULT_ALLOWED_METHODS
+        )
+        if legacy:
+            warnings.warn(
+                "The retry arguments of requests_retry_session() are deprecated; "
+                "use BaseService.configure_session_pool() to tune the shared pool.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
             session = session or requests.Session()
-            # urllib3 < 1.26에서는 method_whitelist, >= 1.26에서는 allowed_methods 사용
-            try:
-                retry = RetryWithJitter(
-                    total=retries,
-                    read=retries,
-                    connect=retries,
-                    backoff_factor=backoff_factor,
-                    status_forcelist=status_forcelist,
-                    allowed_methods=frozenset(allowed_methods),
-                )
-            except TypeError:
-                # Fallback for older urllib3 versions
-                retry = RetryWithJitter(
-                    total=retries,
-                    read=retries,
-                    connect=retries,
-                    backoff_factor=backoff_factor,
-                    status_forcelist=status_forcelist,
-                    method_whitelist=frozenset(allowed_methods),
-                )
-            adapter = HTTPAdapter(max_retries=retry)
+            adapter = HTTPAdapter(max_retries=build_retry(
+                retries=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=status_forcelist,
+                allowed_methods=allowed_methods,
+            ))
             session.mount('http://', adapter)
             session.mount('https://', adapter)
-            BaseService._retry_session = session
-        return BaseService._retry_session
+            return session
+        if url is None:
+            url = AuthUser.get_instance().host
+        return BaseService._session_pool.get_session(url)
+
+    @classmethod
+    def configure_session_pool(
+        cls,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        idle_timeout: Union[Optional[float], UndefinedType] = Undefined,
+    ):
+        """Configure the connection pool shared by all services.
+
+        Args:
+            pool_connections (Optional[int]): The number of connection pools to cache per host session.
+            pool_maxsize (Optional[int]): The maximum number of keep-alive connections per connection pool.
+                Set this to at least the number of threads issuing requests concurrently.
+            idle_timeout (Union[Optional[float], UndefinedType]): Seconds of inactivity after which a host
+                session is evicted. None disables idle eviction.
+        """
+        BaseService._session_pool.configure(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            idle_timeout=idle_timeout,
+        )
+
+    @classmethod
+    def session_pool_stats(cls) -> dict:
+        """Get the statistics of the connection pool shared by all services.
+
+        Returns:
+            dict: The pool settings, lifetime counters and per-host usage.
+        """
+        return BaseService._session_pool.stats()
 
     def request_gql(self, query: Any, variables: Dict[str, Any]):
         """Request Graphql query to the server."""
-        debug_gql = os.environ.get("SDK_DEBUG_GQL") == "1"
-        debug_max_chars_raw = os.environ.get("SDK_DEBUG_GQL_MAX_CHARS", "10000")
-        try:
-            debug_max_chars = int(debug_max_chars_raw)
-        except ValueError:
-            debug_max_chars = 10000
-
-        def _safe_dump(obj: Any) -> str:
-            try:
-                return json.dumps(obj, ensure_ascii=False, default=str)
-            except Exception:
-                return str(obj)
-
-        def _print_debug(title: str, obj: Any = None):
-            if not debug_gql:
-                return
-            print(f"\n=== SDK_DEBUG_GQL: {title} ===")
-            if obj is None:
-                return
-            text = _safe_dump(obj)
-            if debug_max_chars > 0 and len(text) > debug_max_chars:
-                text = text[:debug_max_chars] + "...<truncated>"
-            print(text)
+        recorder = _call_recorder.get()
+        if recorder is not None:
+            return recorder.request_gql(query, variables)
 
         payload = {
             "query": query["query"],
             "variables": variables
         }
         
-        # Create a new session for each request
-        session = self.requests_retry_session()
-        
         try:
-            _print_debug(
+            print_gql_debug(
                 "request",
                 {
                     "endpoint": self.endpoint,
@@ -129,12 +347,13 @@ class BaseService():
                     "variables": variables,
                 },
             )
-            response = session.post(
-                self.endpoint,
-                json=payload,
-                headers=self._auth_user.auth_headers
-            )
-            _print_debug(
+            with BaseService._session_pool.session(self.endpoint) as session:
+                response = session.post(
+                    self.endpoint,
+                    json=payload,
+                    headers=self._auth_user.auth_headers
+                )
+            print_gql_debug(
                 "response_http",
                 {
                     "status_code": response.status_code,
@@ -143,36 +362,7 @@ class BaseService():
             )
             response.raise_for_status()
             
-            result = response.json()
-            _print_debug("response_json", result)
-            if not isinstance(result, dict):
-                raise BadRequestError(f"Invalid response format: {type(result).__name__}, expected dict")
-
-            # Check for GraphQL errors
-            if 'errors' in result and result['errors']:
-                _print_debug("response_graphql_errors", result.get("errors"))
-                for error in result['errors']:
-                    if error['code'] == 'NOT_FOUND':
-                        raise NotFoundError(error['message'])
-                error_messages = [error.get('message', 'Unknown error') for error in result['errors']]
-                raise UnknownError(f"GraphQL errors: {', '.join(error_messages)}")
-            
-            # Validate response structure
-            if 'data' not in result:
-                raise BadResponseError("Missing 'data' field in response")
-            
-            query_name = query.get("name")
-            if not query_name:
-                raise BadResponseError("Missing query name in query object")
-            
-            # Handle different response structures
-            data = result['data']
-            
-            # For other queries, expect the query name to be directly in data
-            if query_name not in data:
-                raise BadResponseError(f"Missing '{query_name}' in response data")
-            
-            return data[query_name]
+            return extract_gql_result(query, response.json())
             
         except requests.exceptions.RequestException as e:
             # Log detailed error information for debugging
@@ -191,9 +381,85 @@ class BaseService():
             raise e
         except Exception as e:
             raise ResponseError(f"Unexpected error: {str(e)}") from e
-        finally:
-            # Close the session after use
-            session.close()
+
+    def request_gql_batch(
+        self,
+        operations: List[Tuple[Any, Dict[str, Any]]],
+        timeout: int = 300,
+    ) -> List[Tuple[Any, Optional[BaseSDKError]]]:
+        """Request several Graphql operations in one HTTP round trip.
+
+        The operations are merged into one document with field aliases, and the
+        per-alias results and errors are demultiplexed back in order.
+
+        Args:
+            operations (List[Tuple[Any, Dict[str, Any]]]): The (query object, variables) pairs.
+                All operations must be queries, or all must be mutations.
+            timeout (int): The timeout of the HTTP request in seconds.
+
+        Returns:
+            List[Tuple[Any, Optional[BaseSDKError]]]: The (result, error) pair of every operation.
+        """
+        if not operations:
+            return []
+        document, variables, aliases = merge_aliased_operations(operations)
+        print_gql_debug(
+            "request_batch",
+            {
+                "endpoint": self.endpoint,
+                "operations": [query.get("name") for query, _ in operations],
+            },
+        )
+        response = self.request(
+            method="POST",
+            url=self.endpoint,
+            headers={"Content-Type": "application/json"},
+            json_data={
+                "query": document,
+                "variables": variables,
+            },
+            timeout=timeout,
+        )
+        try:
+            result = response.json()
+        except ValueError as e:
+            raise BadResponseError("Failed to parse the GraphQL response as JSON.") from e
+        print_gql_debug("response_json", result)
+        if not isinstance(result, dict):
+            raise BadResponseError(f"Invalid response format: {type(result).__name__}, expected dict")
+
+        errors: Dict[str, BaseSDKError] = {}
+        for error in result.get("errors") or []:
+            path = error.get("path") or []
+            alias = path[0] if path else None
+            if alias not in aliases:
+                # An error outside any alias (e.g. a validation error) fails the whole document.
+                raise gql_error(error)
+            errors.setdefault(alias, gql_error(error))
+
+        data = result.get("data") or {}
+        outcomes = []
+        for alias in aliases:
+            if alias in errors:
+                outcomes.append((None, errors[alias]))
+            elif alias not in data:
+                outcomes.append((None, BadResponseError(f"Missing '{alias}' in response data")))
+            else:
+                outcomes.append((data[alias], None))
+        return outcomes
+
+    def batch(self, max_ops: int = 100) -> "GraphQLBatch":
+        """Open a batch that sends the queued service calls as aliased GraphQL operations.
+
+        Args:
+            max_ops (int): The maximum number of operations per HTTP request.
+                The batch is flushed automatically when it holds this many operations.
+
+        Returns:
+            GraphQLBatch: The batch context.
+        """
+        from spb_onprem.base_batch import GraphQLBatch
+        return GraphQLBatch(self, max_ops=max_ops)
 
     def request(
         self,
@@ -205,20 +471,32 @@ class BaseService():
         json_data: Optional[dict] = None,
         timeout: int = 30
     ):
-        session = self.requests_retry_session()
-        try:
-            response = session.request(
-                method=method.upper(),
+        recorder = _call_recorder.get()
+        if recorder is not None:
+            return recorder.request(
+                method=method,
                 url=url,
-                headers={
-                    **headers,
-                    **self._auth_user.auth_headers
-                },
+                headers=headers,
                 params=params,
                 data=data,
-                json=json_data,
-                timeout=timeout
+                json_data=json_data,
+                timeout=timeout,
             )
+
+        try:
+            with BaseService._session_pool.session(url) as session:
+                response = session.request(
+                    method=method.upper(),
+                    url=url,
+                    headers={
+                        **headers,
+                        **self._auth_user.auth_headers
+                    },
+                    params=params,
+                    data=data,
+                    json=json_data,
+                    timeout=timeout
+                )
             response.raise_for_status()
             return response
 
@@ -229,5 +507,3 @@ class BaseService():
             raise BadRequestParameterError("Failed to parse the HTTP response as JSON.") from e
         except Exception as e:
             raise RequestError(f"An error occurred while processing the HTTP response: {str(e)}") from e
-        finally:
-            session.close()
@@ -1,6 +1,16 @@
 from .service import ContentService
+from .async_service import AsyncContentService
+from .hash_index import ContentHashIndex
+from .upload_journal import UploadJournal
+from .upload_stream import UploadStream
+from .url_cache import PresignedURLCache
 
 
 __all__ = (
     "ContentService",
+    "AsyncContentService",
+    "ContentHashIndex",
+    "UploadJournal",
+    "UploadStream",
+    "PresignedURLCache",
 )
@@ -0,0 +1,15 @@
+"""
+This module defines the AsyncContentService class, the asyncio variant of ContentService.
+
+Classes:
+    AsyncContentService: An asyncio service class that provides every ContentService method as a coroutine.
+"""
+from spb_onprem.async_base_service import AsyncBaseService
+from .service import ContentService
+
+
+class AsyncContentService(AsyncBaseService, service_class=ContentService):
+    """
+    Asyncio service class for handling content-related operations.
+    Every public method of ContentService is available as a coroutine with the same arguments.
+    """
@@ -0,0 +1,252 @@
+"""
+This module defines the streaming and ranged downloads of contents from presigned URLs.
+
+Functions:
+    download_to_file: Download a URL to a file, with parallel ranged requests and resume.
+    iter_download: Stream a URL in chunks, resuming with a ranged request after a dropped connection.
+"""
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional, Tuple
+
+import requests
+
+from spb_onprem.exceptions import BadParameterError, BadRequestError, BadResponseError
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+|\*)$")
+
+SessionGetter = Callable[[str], requests.Session]
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """Parse a Content-Range header into (first byte, last byte, total size or None)."""
+    match = _CONTENT_RANGE_RE.match((value or "").strip())
+    if match is None:
+        return None
+    total = match.group(3)
+    return int(match.group(1)), int(match.group(2)), None if total == "*" else int(total)
+
+
+def _get(get_session: SessionGetter, url: str, first: int = 0, last: Optional[int] = None, timeout: int = 300):
+    headers = {}
+    if first or last is not None:
+        headers["Range"] = f"bytes={first}-{'' if last is None else last}"
+    try:
+        # Presigned URLs carry their own signature; the SDK auth headers must not be sent.
+        response = get_session(url).get(url, headers=headers, stream=True, timeout=timeout)
+        if response.status_code == 416 and first == 0:
+            # An empty object has no byte range.
+            response.close()
+            response = get_session(url).get(url, stream=True, timeout=timeout)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise BadRequestError(f"HTTP request failed: {str(e)}") from e
+    return response
+
+
+def _response_size(response) -> Tuple[bool, Optional[int]]:
+    # Returns whether the response is a partial response, and the total size of the object.
+    if response.status_code == 206:
+        content_range = parse_content_range(response.headers.get("Content-Range"))
+        if content_range is None:
+            raise BadResponseError("A partial response without a valid Content-Range.")
+        return True, content_range[2]
+    length = response.headers.get("Content-Length")
+    return False, int(length) if length is not None else None
+
+
+def iter_download(
+    get_session: SessionGetter,
+    url: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_resumes: int = 3,
+    timeout: int = 300,
+) -> Iterator[bytes]:
+    """Stream a URL in chunks.
+
+    When the connection drops, the rest of the object is requested with a Range header,
+    up to ``max_resumes`` times.
+
+    Raises:
+        BadRequestError: The request failed, or the connection dropped once too often.
+        BadResponseError: The number of bytes received does not match the object size.
+    """
+    received = 0
+    total: Optional[int] = None
+    resumes = 0
+    while True:
+        response = _get(get_session, url, first=received, timeout=timeout)
+        try:
+            partial, size = _response_size(response)
+            if received and not partial:
+                raise BadResponseError("The server does not support ranged requests; the download can not resume.")
+            if total is None:
+                total = size
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    received += len(chunk)
+                    yield chunk
+        except (requests.exceptions.RequestException, ConnectionError) as e:
+            resumes += 1
+            if resumes > max_resumes:
+                raise BadRequestError(f"The download was interrupted {resumes} times: {str(e)}") from e
+            continue
+        finally:
+            response.close()
+        break
+    if total is not None and received != total:
+        raise BadResponseError(f"Received {received} bytes, expected {total}.")
+
+
+def _load_parts(journal_path: str) -> Optional[dict]:
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_parts(journal_path: str, state: dict):
+    temp_path = journal_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, journal_path)
+
+
+def _write_response(response, f, offset: int, expected: Optional[int], chunk_size: int) -> int:
+    f.seek(offset)
+    written = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if chunk:
+            f.write(chunk)
+            written += len(chunk)
+    if expected is not None and written != expected:
+        raise BadResponseError(f"Received {written} bytes at offset {offset}, expected {expected}.")
+    return written
+
+
+def download_to_file(
+    get_session: SessionGetter,
+    url: str,
+    dest: str,
+    part_size: int = DEFAULT_PART_SIZE,
+    max_workers: int = 4,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resume: bool = True,
+    timeout: int = 300,
+) -> int:
+    """Download a URL to a file.
+
+    The object is downloaded in ranged parts of ``part_size`` bytes, ``max_workers`` at a time,
+    into ``dest + ".part"``. Completed parts are recorded in ``dest + ".part.json"``, so an
+    interrupted download resumes with the missing parts when ``resume`` is set. The file is
+    renamed to ``dest`` once its size has been verified. A server without ranged requests
+    gets a single streamed request.
+
+    Raises:
+        BadRequestError: A request failed.
+        BadResponseError: The size of the object or of a part does not match.
+
+    Returns:
+        int: The size of the downloaded file.
+    """
+    if part_size < 1:
+        raise BadParameterError("part_size must be at least 1.")
+    if max_workers < 1:
+        raise BadParameterError("max_workers must be at least 1.")
+    temp_path = dest + ".part"
+    journal_path = dest + ".part.json"
+    state = _load_parts(journal_path) if resume and os.path.exists(temp_path) else None
+    if state is not None and state.get("part_size") != part_size:
+        state = None
+    done = set(state["done"]) if state is not None else set()
+    if state is not None and len(done) >= -(-state["size"] // part_size):
+        # Every part was written before the download was interrupted.
+        if os.path.getsize(temp_path) == state["size"]:
+            os.replace(temp_path, dest)
+            os.remove(journal_path)
+            return state["size"]
+        state, done = None, set()
+
+    # The first missing part also tells the size and the version of the object.
+    first_part = min(set(range(len(done) + 1)) - done)
+    response = _get(get_session, url, first_part * part_size, (first_part + 1) * part_size - 1, timeout)
+    try:
+        partial, total = _response_size(response)
+        etag = response.headers.get("ETag")
+        if state is not None and (not partial or state.get("size") != total or state.get("etag") != etag):
+            # The object changed since the interrupted download.
+            state, done = None, set()
+            if first_part != 0:
+                response.close()
+                response = _get(get_session, url, 0, part_size - 1, timeout)
+                partial, total = _response_size(response)
+                etag = response.headers.get("ETag")
+                first_part = 0
+
+        if not partial:
+            with open(temp_path, "wb") as f:
+                written = _write_response(response, f, 0, total, chunk_size)
+            os.replace(temp_path, dest)
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+            return written
+        if total is None:
+            raise BadResponseError("The size of the object is unknown.")
+
+        parts = max(1, -(-total // part_size))
+        if state is None:
+            with open(temp_path, "wb") as f:
+                f.truncate(total)
+            state = {"size": total, "etag": etag, "part_size": part_size, "done": []}
+            _save_parts(journal_path, state)
+        lock = threading.Lock()
+
+        def complete(index: int):
+            with lock:
+                done.add(index)
+                state["done"] = sorted(done)
+                _save_parts(journal_path, state)
+
+        def expected_size(index: int) -> int:
+            return min(part_size, total - index * part_size)
+
+        with open(temp_path, "r+b") as f:
+            _write_response(response, f, first_part * part_size, expected_size(first_part), chunk_size)
+        complete(first_part)
+    finally:
+        response.close()
+
+    def fetch(index: int):
+        part_response = _get(get_session, url, index * part_size, (index + 1) * part_size - 1, timeout)
+        try:
+            if part_response.status_code != 206:
+                raise BadResponseError("The server stopped answering ranged requests.")
+            if etag is not None and part_response.headers.get("ETag") not in (None, etag):
+                raise BadResponseError("The object changed during the download.")
+            with open(temp_path, "r+b") as f:
+                _write_response(part_response, f, index * part_size, expected_size(index), chunk_size)
+        finally:
+            part_response.close()
+        complete(index)
+
+    missing = [index for index in range(parts) if index not in done]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spb-onprem-download") as executor:
+            for future in [executor.submit(fetch, index) for index in missing]:
+                future.result()
+
+    size = os.path.getsize(temp_path)
+    if size != total:
+        raise BadResponseError(f"Downloaded {size} bytes, expected {total}.")
+    os.replace(temp_path, dest)
+    os.remove(journal_path)
+    return size
@@ -1,8 +1,10 @@
 from .base_content import BaseContent
 from .content import Content
+from .folder_upload_report import FolderUploadReport
 
 
 __all__ = (
     "BaseContent",
     "Content",
+    "FolderUploadReport",
 )
@@ -0,0 +1,23 @@
+from typing import Dict, List
+
+from spb_onprem.base_model import CustomBaseModel, Field
+
+
+class FolderUploadReport(CustomBaseModel):
+    """The outcome of uploading a local directory into a folder content.
+
+    Files are identified by their path relative to the uploaded directory, with "/" separators.
+    """
+    content_id: str = Field(..., description="The folder content id")
+    uploaded: List[str] = Field(default_factory=list, description="The files uploaded")
+    failed: Dict[str, str] = Field(default_factory=dict, description="The error of every file that failed")
+    bytes_uploaded: int = Field(0, description="The number of bytes uploaded")
+    elapsed_seconds: float = Field(0.0, description="The duration of the upload")
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.uploaded) / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_uploaded / self.elapsed_seconds if self.elapsed_seconds else 0.0
@@ -0,0 +1,109 @@
+"""
+This module defines the ContentHashIndex class, a local content-addressed index of uploaded contents.
+
+Classes:
+    ContentHashIndex: Maps the SHA-256, key and content type of uploaded bytes to the id of their content.
+"""
+import sqlite3
+import threading
+from typing import Optional, Tuple
+
+# A content is reused only for an upload with the same key and content type, so the
+# key ("" for none) and the content type ("" for none) are part of the primary key.
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS uploaded_contents (
+    sha256 TEXT NOT NULL,
+    key TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    content_id TEXT NOT NULL,
+    size INTEGER,
+    PRIMARY KEY (sha256, key, content_type)
+);
+CREATE INDEX IF NOT EXISTS uploaded_contents_size ON uploaded_contents (size, key, content_type);
+CREATE INDEX IF NOT EXISTS uploaded_contents_content_id ON uploaded_contents (content_id);
+'''
+
+
+def _columns(key: Optional[str], content_type: Optional[str]) -> Tuple[str, str]:
+    return (key if isinstance(key, str) else ""), (content_type or "")
+
+
+class ContentHashIndex():
+    """A SQLite index from the SHA-256 of uploaded bytes to the id of their content.
+
+    Pass it to the upload methods of ContentService to skip uploading bytes that have
+    already been uploaded with the same key and content type; the existing content is
+    returned instead. The same bytes uploaded with another key or content type are
+    uploaded as a content of their own::
+
+        index = ContentHashIndex("contents.sqlite")
+        content = content_service.upload_content(path, hash_index=index)
+
+    Args:
+        path (str): The SQLite file. ":memory:" keeps the index in memory.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM uploaded_contents").fetchone()[0]
+
+    def lookup(self, sha256: str, key: Optional[str] = None, content_type: Optional[str] = None) -> Optional[str]:
+        """Get the id of the content uploaded with these bytes, key and content type, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content_id FROM uploaded_contents WHERE sha256 = ? AND key = ? AND content_type = ?",
+                (sha256, *_columns(key, content_type)),
+            ).fetchone()
+        return row[0] if row else None
+
+    def has_size(self, size: int, key: Optional[str] = None, content_type: Optional[str] = None) -> bool:
+        """Check whether any content of this size was uploaded with this key and content type.
+
+        When none was, the bytes can not be a duplicate, and hashing them before the upload is not needed.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM uploaded_contents WHERE size = ? AND key = ? AND content_type = ? LIMIT 1",
+                (size, *_columns(key, content_type)),
+            ).fetchone()
+        return row is not None
+
+    def record(
+        self,
+        sha256: str,
+        content_id: str,
+        size: Optional[int] = None,
+        content_type: Optional[str] = None,
+        key: Optional[str] = None,
+    ):
+        """Record the content uploaded with these bytes, key and content type."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO uploaded_contents (sha256, key, content_type, content_id, size) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (sha256, key, content_type) DO UPDATE SET content_id = excluded.content_id, "
+                "size = excluded.size",
+                (sha256, *_columns(key, content_type), content_id, size),
+            )
+
+    def forget(self, content_id: str) -> int:
+        """Remove a content from the index, e.g. after it has been deleted.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM uploaded_contents WHERE content_id = ?", (content_id,)
+            ).rowcount
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self._connection.close()
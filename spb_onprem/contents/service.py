@@ -1,17 +1,32 @@
 import mimetypes
+import os
 import requests
 import json
+import threading
+import time
 
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from typing import Optional, Tuple, Union
+from typing import Any, BinaryIO, Callable, ClassVar, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from spb_onprem.base_service import BaseService
+from spb_onprem.base_service import BaseService, async_in_thread, sync_only
 from spb_onprem.base_types import (
     Undefined,
     UndefinedType,
 )
-from .entities import BaseContent, Content
+from spb_onprem.exceptions import BadParameterError, BadResponseError, NotFoundError
+from .download import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PART_SIZE,
+    download_to_file,
+    iter_download,
+)
+from .entities import BaseContent, Content, FolderUploadReport
+from .hash_index import ContentHashIndex
 from .queries import Queries
+from .upload_journal import UploadJournal
+from .upload_stream import DEFAULT_BUFFER_SIZE, UploadStream
+from .url_cache import PresignedURLCache
 
 
 
@@ -19,6 +34,39 @@ class ContentService(BaseService):
     """The content service for the SDK.
     Content service is the service that handles the content operations.
     """
+    _url_cache: ClassVar[Optional[PresignedURLCache]] = None
+
+    @classmethod
+    def configure_url_cache(
+        cls,
+        max_size: int = 10000,
+        refresh_margin: float = 60.0,
+        default_ttl: float = 300.0,
+    ) -> Optional[PresignedURLCache]:
+        '''
+        Enables the presigned URL cache shared by all content services, or disables it with max_size=0.
+        Download and upload URLs are reused until ``refresh_margin`` seconds before they expire.
+        Args:
+            max_size (int): The maximum number of URLs kept. 0 disables the cache.
+            refresh_margin (float): The number of seconds before expiry at which a URL is refreshed.
+            default_ttl (float): The lifetime assumed for URLs without a readable expiry.
+        Returns:
+            Optional[PresignedURLCache]: The cache, or None when disabled.
+        '''
+        ContentService._url_cache = PresignedURLCache(
+            max_size=max_size,
+            refresh_margin=refresh_margin,
+            default_ttl=default_ttl,
+        ) if max_size > 0 else None
+        return ContentService._url_cache
+
+    @classmethod
+    def url_cache_stats(cls) -> Optional[Dict[str, int]]:
+        '''
+        Gets the size and the hit and miss counts of the presigned URL cache, or None when it is disabled.
+        '''
+        cache = ContentService._url_cache
+        return cache.stats() if cache is not None else None
 
     def create_content(
         self,
@@ -48,6 +96,7 @@ class ContentService(BaseService):
         content = Content.model_validate(response['content'])
         return content, response['uploadURL']
 
+    @async_in_thread
     def upload_content(
         self,
         file_path: str,
@@ -55,33 +104,153 @@ class ContentService(BaseService):
             str,
             UndefinedType    
         ] = Undefined,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        hash_index: Optional[ContentHashIndex] = None,
     ):
         '''
         Uploads the content to the server.
+        The file is streamed, so it is never read into memory as a whole.
         Args:
             file_path (str):
                 The path of the file to be uploaded.
                 You must provide the full path of the file (with extensions).
+            buffer_size (int):
+                The maximum number of bytes read from the file at a time.
+            hash_index (Optional[ContentHashIndex]):
+                If given, a file whose bytes were already uploaded is not uploaded again,
+                and the existing content is returned.
         '''
-        with open(file_path, 'rb') as f:
-            file = f.read()
+        return self.upload_content_stream(
+            UploadStream(file_path, buffer_size=buffer_size),
+            content_type=mimetypes.guess_type(file_path)[0],
+            key=key,
+            hash_index=hash_index,
+        )
+
+    @async_in_thread
+    def upload_content_stream(
+        self,
+        source: Union[str, os.PathLike, BinaryIO, UploadStream],
+        content_type: Optional[str],
+        key: Union[
+            str,
+            UndefinedType    
+        ] = Undefined,
+        offset: int = 0,
+        length: Optional[int] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        hash_index: Optional[ContentHashIndex] = None,
+    ):
+        '''
+        Uploads a file, a file object or a region of it to the server without reading it into memory.
+
+        Args:
+            source (Union[str, os.PathLike, BinaryIO, UploadStream]):
+                A file path, a seekable binary file object (e.g. an open file or an mmap), or an UploadStream.
+            content_type (Optional[str]):
+                The MIME type of the content (e.g., "video/mp4").
+            key (Optional[str]):
+                An optional key to associate with the uploaded content.
+            offset (int):
+                The position of the region to upload. Ignored for an UploadStream.
+            length (Optional[int]):
+                The size of the region to upload. Defaults to the rest of the source. Ignored for an UploadStream.
+            buffer_size (int):
+                The maximum number of bytes read from the source at a time. Ignored for an UploadStream.
+            hash_index (Optional[ContentHashIndex]):
+                If given, bytes that were already uploaded with the same key and content type are not
+                uploaded again; the existing content is returned instead. The source is hashed (SHA-256)
+                while it is uploaded, and hashed before only if the index has a content of the same size.
+        '''
+        stream = source if isinstance(source, UploadStream) else UploadStream(
+            source, offset=offset, length=length, buffer_size=buffer_size
+        )
+        stream.seek(0)
+        if hash_index is not None:
+            index_key = key if key is not Undefined else None
+            if hash_index.has_size(len(stream), index_key, content_type):
+                # Only bytes of a size already uploaded can be a duplicate; hash them before the upload.
+                content_id = hash_index.lookup(stream.sha256(), index_key, content_type)
+                if content_id is not None:
+                    return BaseContent(id=content_id)
+            else:
+                stream.track_sha256()
         response = self.request_gql(
             query=Queries.CREATE,
-            variables=Queries.CREATE["variables"](key, mimetypes.guess_type(file_path)[0])
+            variables=Queries.CREATE["variables"](key, content_type)
         )
         upload_url = response['uploadURL']
-        
+
+        headers = {'Content-Length': str(len(stream))}
+        if content_type is not None:
+            headers['Content-Type'] = content_type
         self.request(
             method="PUT",
             url=upload_url,
-            headers={
-                'Content-Type': mimetypes.guess_type(file_path)[0]
-            },
-            data=file,
+            headers=headers,
+            data=stream,
         )
-        content = response['content']
-        return BaseContent.model_validate(content)
+        content = BaseContent.model_validate(response['content'])
+        if hash_index is not None:
+            hash_index.record(stream.sha256(), content.id, len(stream), content_type, index_key)
+        return content
     
+    @sync_only
+    def upload_contents(
+        self,
+        file_paths: Sequence[str],
+        keys: Optional[Sequence[Union[str, UndefinedType]]] = None,
+        max_workers: int = 8,
+        journal: Optional[Union[str, UploadJournal]] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        hash_index: Optional[ContentHashIndex] = None,
+    ) -> List[BaseContent]:
+        '''
+        Uploads many files concurrently, checkpointing every completed upload to a journal.
+        Files recorded in the journal as uploaded unchanged are skipped, so rerunning an
+        interrupted call only uploads the remaining files.
+        Args:
+            file_paths (Sequence[str]):
+                The paths of the files to be uploaded.
+            keys (Optional[Sequence[Union[str, UndefinedType]]]):
+                The key of every file. Defaults to no key.
+            max_workers (int):
+                The number of files uploaded concurrently.
+            journal (Optional[Union[str, UploadJournal]]):
+                The journal, or the path of its file. Defaults to no journal.
+            buffer_size (int):
+                The maximum number of bytes read from a file at a time.
+            hash_index (Optional[ContentHashIndex]):
+                If given, files whose bytes were already uploaded are not uploaded again.
+        Returns:
+            List[BaseContent]: The content of every file, in order.
+        Raises:
+            BadParameterError: keys does not have one key per file.
+            BaseSDKError: The first failed upload, raised once every other upload has finished.
+        '''
+        if keys is None:
+            keys = [Undefined] * len(file_paths)
+        if len(keys) != len(file_paths):
+            raise BadParameterError("keys must have one key per file.")
+        if max_workers < 1:
+            raise BadParameterError("max_workers must be at least 1.")
+        if isinstance(journal, str):
+            journal = UploadJournal(journal)
+
+        def upload(file_path: str, key: Union[str, UndefinedType]) -> BaseContent:
+            if journal is not None:
+                content_id = journal.lookup(file_path, key)
+                if content_id is not None:
+                    return BaseContent(id=content_id)
+            content = self.upload_content(file_path, key=key, buffer_size=buffer_size, hash_index=hash_index)
+            if journal is not None:
+                journal.record(file_path, content.id, key)
+            return content
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spb-onprem-upload") as executor:
+            futures = [executor.submit(upload, file_path, key) for file_path, key in zip(file_paths, keys)]
+        return [future.result() for future in futures]
+
     def upload_json_content(
         self,
         data: dict,
@@ -115,49 +284,31 @@ class ContentService(BaseService):
         content = response['content']
         return BaseContent.model_validate(content)
 
+    @async_in_thread
     def upload_content_with_data(
         self,
-        file_data: BytesIO,
+        file_data: Union[BytesIO, BinaryIO],
         content_type: str,
         key: Union[
             str,
             UndefinedType    
         ] = Undefined,
+        hash_index: Optional[ContentHashIndex] = None,
     ):
         '''
         Uploads the content to the server.
 
         Args:
-            file_data (BytesIO):
-                The file data to be uploaded.
+            file_data (Union[BytesIO, BinaryIO]):
+                The file data to be uploaded. Any seekable binary file object is streamed from its start.
             content_type (str):
                 The MIME type of the file being uploaded (e.g., "image/jpeg").
             key (Optional[str]):
                 An optional key to associate with the uploaded content.
+            hash_index (Optional[ContentHashIndex]):
+                If given, bytes that were already uploaded are not uploaded again.
         '''
-        # Reset the BytesIO pointer to the beginning
-        file_data.seek(0)
-
-        # Request to get the upload URL
-        response = self.request_gql(
-            query=Queries.CREATE,
-            variables=Queries.CREATE["variables"](key, content_type)
-        )
-        upload_url = response['uploadURL']
-
-        # Upload the file data using the PUT request
-        self.request(
-            method="PUT",
-            url=upload_url,
-            headers={
-                'Content-Type': content_type
-            },
-            data=file_data.read(),
-        )
-
-        # Retrieve the uploaded content details
-        content = response['content']
-        return BaseContent.model_validate(content)
+        return self.upload_content_stream(file_data, content_type=content_type, key=key, hash_index=hash_index)
     
     def create_folder_content(self) -> str:
         '''
@@ -172,6 +323,98 @@ class ContentService(BaseService):
         )
         return response['id']
     
+    @sync_only
+    def upload_folder(
+        self,
+        local_dir: str,
+        concurrency: int = 8,
+        url_batch_size: int = 100,
+        content_id: Optional[str] = None,
+        on_progress: Optional[Callable[[FolderUploadReport], Any]] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> FolderUploadReport:
+        '''
+        Uploads every file of a local directory tree into a folder content.
+        Upload URLs are generated ``url_batch_size`` at a time in one request, and the files are
+        PUT by ``concurrency`` workers. A failed file is reported and does not stop the others.
+        Args:
+            local_dir (str): The directory to upload. Files keep their path relative to it.
+            concurrency (int): The number of files uploaded concurrently.
+            url_batch_size (int): The number of upload URLs generated per request.
+            content_id (Optional[str]): The folder content to upload into. Defaults to a new folder content.
+            on_progress (Optional[Callable[[FolderUploadReport], Any]]): Called after every file.
+            buffer_size (int): The maximum number of bytes read from a file at a time.
+        Returns:
+            FolderUploadReport: The folder content id, the uploaded and failed files and the throughput.
+        '''
+        if not os.path.isdir(local_dir):
+            raise BadParameterError(f"'{local_dir}' is not a directory.")
+        if concurrency < 1:
+            raise BadParameterError("concurrency must be at least 1.")
+        if url_batch_size < 1:
+            raise BadParameterError("url_batch_size must be at least 1.")
+
+        file_names = sorted(
+            os.path.relpath(os.path.join(root, name), local_dir).replace(os.sep, "/")
+            for root, _, names in os.walk(local_dir)
+            for name in names
+        )
+        report = FolderUploadReport(content_id=content_id or self.create_folder_content())
+        started = time.monotonic()
+        lock = threading.Lock()
+        # Bounds the URLs generated ahead of the uploads, so they do not expire while queued.
+        in_flight = threading.BoundedSemaphore(concurrency * 2)
+
+        def finish(file_name: str, size: int, error: Optional[Exception]):
+            with lock:
+                if error is None:
+                    report.uploaded.append(file_name)
+                    report.bytes_uploaded += size
+                else:
+                    report.failed[file_name] = str(error)
+                report.elapsed_seconds = time.monotonic() - started
+                if on_progress is not None:
+                    on_progress(report)
+
+        def upload(file_name: str, upload_url: str, content_type: Optional[str]):
+            try:
+                stream = UploadStream(os.path.join(local_dir, file_name), buffer_size=buffer_size)
+                headers = {'Content-Length': str(len(stream))}
+                if content_type is not None:
+                    headers['Content-Type'] = content_type
+                self.request(method="PUT", url=upload_url, headers=headers, data=stream)
+                finish(file_name, len(stream), None)
+            except Exception as e:
+                finish(file_name, 0, e)
+            finally:
+                in_flight.release()
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="spb-onprem-folder-upload") as executor:
+            for start in range(0, len(file_names), url_batch_size):
+                batch = [
+                    (file_name, mimetypes.guess_type(file_name)[0])
+                    for file_name in file_names[start:start + url_batch_size]
+                ]
+                try:
+                    outcomes = self.request_gql_batch([
+                        (
+                            Queries.GET_UPLOAD_URL,
+                            Queries.GET_UPLOAD_URL["variables"](report.content_id, file_name, content_type),
+                        )
+                        for file_name, content_type in batch
+                    ])
+                except Exception as e:
+                    outcomes = [(None, e)] * len(batch)
+                for (file_name, content_type), (upload_url, error) in zip(batch, outcomes):
+                    if error is not None or not upload_url:
+                        finish(file_name, 0, error or BadResponseError("No upload URL was generated."))
+                        continue
+                    in_flight.acquire()
+                    executor.submit(upload, file_name, upload_url, content_type)
+
+        report.elapsed_seconds = time.monotonic() - started
+        return report
+
     def get_upload_url(
         self,
         content_id: str,
@@ -185,10 +428,17 @@ class ContentService(BaseService):
             file_name (str): The name of the file to be uploaded.
             content_type (Optional[str]): The MIME type of the file being uploaded.
         '''
+        cache = ContentService._url_cache
+        cache_key = ("upload", content_id, file_name, content_type)
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            return cached
         response = self.request_gql(
             query=Queries.GET_UPLOAD_URL,
             variables=Queries.GET_UPLOAD_URL["variables"](content_id, file_name, content_type)
         )
+        if cache is not None and isinstance(response, str):
+            cache.put(cache_key, response)
         return response
 
     def get_download_url(
@@ -204,17 +454,140 @@ class ContentService(BaseService):
         Returns:
             str: The download URL.
         '''
+        cache = ContentService._url_cache
+        cache_key = ("download", content_id, file_name)
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            return cached
+        query, variables = self._download_url_operation(content_id, file_name)
+        response = self.request_gql(query=query, variables=variables)
+        if cache is not None and isinstance(response, str):
+            cache.put(cache_key, response)
+        return response
+
+    def prefetch_download_urls(
+        self,
+        contents: Iterable[Any],
+        file_name: Optional[str] = None,
+        batch_size: int = 100,
+    ) -> Dict[str, str]:
+        '''
+        Gets the download URLs of many contents, ``batch_size`` per request.
+        URLs already in the presigned URL cache are not requested again, and the fetched
+        URLs are cached for later get_download_url calls.
+        Args:
+            contents (Iterable[Any]): Content ids, contents, or data whose scene contents are fetched
+                (e.g. a page of ``get_data_list``).
+            file_name (Optional[str]): The name of the file in folder contents.
+            batch_size (int): The number of URLs generated per request.
+        Returns:
+            Dict[str, str]: The download URL of every content id. Contents that were not found are left out.
+        '''
+        if batch_size < 1:
+            raise BadParameterError("batch_size must be at least 1.")
+        content_ids: List[str] = []
+        for item in contents:
+            if isinstance(item, str):
+                content_ids.append(item)
+            elif getattr(item, "scene", None) is not None:
+                content_ids.extend(scene.content.id for scene in item.scene if scene.content is not None)
+            elif getattr(item, "id", None) is not None:
+                content_ids.append(item.id)
+        content_ids = list(dict.fromkeys(content_ids))
+
+        cache = ContentService._url_cache
+        urls: Dict[str, str] = {}
+        missing = []
+        for content_id in content_ids:
+            cached = cache.get(("download", content_id, file_name)) if cache is not None else None
+            if cached is not None:
+                urls[content_id] = cached
+            else:
+                missing.append(content_id)
+
+        for start in range(0, len(missing), batch_size):
+            chunk = missing[start:start + batch_size]
+            outcomes = self.request_gql_batch([
+                self._download_url_operation(content_id, file_name) for content_id in chunk
+            ])
+            for content_id, (url, error) in zip(chunk, outcomes):
+                if isinstance(error, NotFoundError):
+                    continue
+                if error is not None:
+                    raise error
+                urls[content_id] = url
+                if cache is not None and isinstance(url, str):
+                    cache.put(("download", content_id, file_name), url)
+        return urls
+
+    def _download_url_operation(self, content_id: str, file_name: Optional[str]) -> Tuple[dict, dict]:
         if file_name is not None:
-            response = self.request_gql(
-                query=Queries.GET_FILE_DOWNLOAD_URL,
-                variables=Queries.GET_FILE_DOWNLOAD_URL["variables"](content_id, file_name)
-            )
-        else:
-            response = self.request_gql(
-                query=Queries.GET_DOWNLOAD_URL,
-                variables=Queries.GET_DOWNLOAD_URL["variables"](content_id)
+            return (
+                Queries.GET_FILE_DOWNLOAD_URL,
+                Queries.GET_FILE_DOWNLOAD_URL["variables"](content_id, file_name),
             )
-        return response
+        return Queries.GET_DOWNLOAD_URL, Queries.GET_DOWNLOAD_URL["variables"](content_id)
+
+    @sync_only
+    def download_content(
+        self,
+        content_id: str,
+        dest: str,
+        file_name: Optional[str] = None,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_workers: int = 4,
+        resume: bool = True,
+    ) -> str:
+        '''
+        Downloads a content, or a file of a folder content, to a local file.
+        The object is streamed to disk in ranged parts of ``part_size`` bytes, ``max_workers`` at a time.
+        Completed parts are recorded next to the file, so an interrupted download resumes
+        with the missing parts. The size of the file is verified before it is moved to ``dest``.
+        Args:
+            content_id (str): The ID of the content to download.
+            dest (str): The path of the local file.
+            file_name (Optional[str]): The name of the file in a folder content.
+            part_size (int): The size of the ranged requests.
+            max_workers (int): The number of ranged requests sent concurrently.
+            resume (bool): Continue an interrupted download of the same object to ``dest``.
+        Returns:
+            str: The path of the downloaded file.
+        '''
+        if content_id is None:
+            raise BadParameterError("content_id is required.")
+        url = self.get_download_url(content_id, file_name)
+        download_to_file(
+            self._session_pool.get_session,
+            url,
+            dest,
+            part_size=part_size,
+            max_workers=max_workers,
+            resume=resume,
+        )
+        return dest
+
+    def iter_content(
+        self,
+        content_id: str,
+        file_name: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_resumes: int = 3,
+    ) -> Iterator[bytes]:
+        '''
+        Streams a content, or a file of a folder content, in chunks.
+        A dropped connection is resumed with a ranged request from the last byte received.
+        Args:
+            content_id (str): The ID of the content to download.
+            file_name (Optional[str]): The name of the file in a folder content.
+            chunk_size (int): The size of the chunks.
+            max_resumes (int): The number of times a dropped connection is resumed.
+        Yields:
+            bytes: The chunks of the content.
+        '''
+        if content_id is None:
+            raise BadParameterError("content_id is required.")
+        url = self.get_download_url(content_id, file_name)
+        yield from iter_download(self._session_pool.get_session, url, chunk_size=chunk_size, max_resumes=max_resumes)
 
     def delete_content(
         self,
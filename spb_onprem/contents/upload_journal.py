@@ -0,0 +1,72 @@
+"""
+This module defines the UploadJournal class, a local checkpoint of completed content uploads.
+
+Classes:
+    UploadJournal: An append-only JSON lines file recording which local files have been uploaded.
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+from spb_onprem.base_types import Undefined, UndefinedType
+from spb_onprem.utils.jsonl import JsonLinesLog
+
+_Fingerprint = Tuple[str, int, int, Optional[str]]
+
+
+def _fingerprint(file_path: str, key: Union[str, UndefinedType]) -> _Fingerprint:
+    stat = os.stat(file_path)
+    return (
+        os.path.abspath(file_path),
+        stat.st_size,
+        stat.st_mtime_ns,
+        None if key is Undefined else key,
+    )
+
+
+class UploadJournal():
+    """An append-only record of the local files that have been uploaded.
+
+    Each completed upload is appended as one JSON line and flushed to disk before the
+    upload is reported as done, so a journal survives a crash of the process. A file is
+    considered uploaded while its path, size, modification time and key are unchanged.
+
+    Args:
+        path (str): The journal file. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[_Fingerprint, str] = {}
+        self._log = JsonLinesLog(path)
+        for entry in self._log.load():
+            self._entries[
+                (entry["path"], entry["size"], entry["mtime_ns"], entry.get("key"))
+            ] = entry["content_id"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, file_path: str, key: Union[str, UndefinedType] = Undefined) -> Optional[str]:
+        """Get the content id of a file uploaded unchanged, or None."""
+        with self._lock:
+            return self._entries.get(_fingerprint(file_path, key))
+
+    def record(self, file_path: str, content_id: str, key: Union[str, UndefinedType] = Undefined):
+        """Record the upload of a file."""
+        fingerprint = _fingerprint(file_path, key)
+        with self._lock:
+            self._log.append({
+                "path": fingerprint[0],
+                "size": fingerprint[1],
+                "mtime_ns": fingerprint[2],
+                "key": fingerprint[3],
+                "content_id": content_id,
+            })
+            self._entries[fingerprint] = content_id
+
+    def close(self):
+        """Close the journal file."""
+        with self._lock:
+            self._log.close()
@@ -0,0 +1,161 @@
+"""
+This module defines the UploadStream class, a file-like request body that streams a file
+or a region of it with a bounded read size.
+
+Classes:
+    UploadStream: A seekable, sized, read-only stream over a file path, a binary file object or an mmap.
+"""
+import hashlib
+import io
+import os
+from typing import BinaryIO, Optional, Union
+
+from spb_onprem.exceptions import BadParameterError
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+class UploadStream(io.RawIOBase):
+    """A read-only stream over a region of a file, used as an upload body.
+
+    HTTP clients read the body piece by piece, so at most ``buffer_size`` bytes of the
+    file are held in memory by each read whatever the file size. The stream has a length,
+    so uploads are sent with a Content-Length instead of chunked encoding, and it can be
+    rewound, so failed requests can be retried.
+
+    A path is opened on the first read and closed again at the end of the region; the
+    stream reopens it if it is rewound. File objects (including ``mmap.mmap``) are not
+    closed by the stream.
+
+    After ``track_sha256()``, the bytes are hashed as the upload reads them, so the
+    digest of an uploaded file is known without reading the file a second time.
+
+    Args:
+        source (Union[str, os.PathLike, BinaryIO]): A file path, or a seekable binary file object.
+        offset (int): The position of the region in the source. Defaults to 0.
+        length (Optional[int]): The size of the region. Defaults to the rest of the source.
+        buffer_size (int): The maximum number of bytes returned by a read. Defaults to 1 MiB.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, BinaryIO],
+        offset: int = 0,
+        length: Optional[int] = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ):
+        super().__init__()
+        if offset < 0:
+            raise BadParameterError("offset must not be negative.")
+        if buffer_size < 1:
+            raise BadParameterError("buffer_size must be at least 1.")
+        if isinstance(source, (str, os.PathLike)):
+            self._path = os.fspath(source)
+            self._file: Optional[BinaryIO] = None
+            source_size = os.path.getsize(self._path)
+        else:
+            if not hasattr(source, "seek") or not hasattr(source, "read"):
+                raise BadParameterError("source must be a path or a seekable binary file object.")
+            self._path = None
+            self._file = source
+            source.seek(0, io.SEEK_END)
+            source_size = source.tell()
+        if offset > source_size:
+            raise BadParameterError(f"offset {offset} is past the end of the source ({source_size} bytes).")
+        if length is None:
+            length = source_size - offset
+        elif length < 0 or offset + length > source_size:
+            raise BadParameterError(f"The region {offset}+{length} exceeds the source ({source_size} bytes).")
+        self.offset = offset
+        self.length = length
+        self.buffer_size = buffer_size
+        self._position = 0
+        self._sha256 = None
+        self._hashed = 0
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._path
+
+    def __len__(self) -> int:
+        return self.length
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed stream.")
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.length + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position.")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed stream.")
+        size = min(len(buffer), self.buffer_size, self.length - self._position)
+        if size <= 0:
+            self._release()
+            return 0
+        source = self._open()
+        source.seek(self.offset + self._position)
+        chunk = source.read(size)
+        buffer[:len(chunk)] = chunk
+        if self._sha256 is not None and self._position == self._hashed:
+            # Bytes read again after a rewind (e.g. by a retry) are already hashed.
+            self._sha256.update(chunk)
+            self._hashed += len(chunk)
+        self._position += len(chunk)
+        if self._position >= self.length:
+            self._release()
+        return len(chunk)
+
+    def track_sha256(self):
+        """Hash the bytes of the region as they are read, from the start of the region."""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256()
+            self._hashed = 0
+
+    def sha256(self) -> str:
+        """Get the SHA-256 hex digest of the region.
+
+        With ``track_sha256()``, only the bytes that have not been read yet are read to finish
+        it; otherwise the whole region is read. The position of the stream is kept.
+        """
+        self.track_sha256()
+        position = self._position
+        self.seek(self._hashed)
+        while self.read(self.buffer_size):
+            pass
+        self.seek(position)
+        return self._sha256.hexdigest()
+
+    def close(self):
+        self._release()
+        super().close()
+
+    def _open(self) -> BinaryIO:
+        if self._file is None:
+            self._file = open(self._path, "rb")
+        return self._file
+
+    def _release(self):
+        # Only files opened by the stream are closed.
+        if self._path is not None and self._file is not None:
+            self._file.close()
+            self._file = None
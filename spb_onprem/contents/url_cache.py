@@ -0,0 +1,127 @@
+"""
+This module defines the PresignedURLCache class, an LRU cache of presigned URLs that knows when they expire.
+
+Classes:
+    PresignedURLCache: A thread-safe LRU cache of presigned download and upload URLs.
+
+Functions:
+    parse_url_expiry: Read the expiry time out of a presigned URL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+def _parse_compact_datetime(value: str) -> float:
+    return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc).timestamp()
+
+
+def parse_url_expiry(url: str) -> Optional[float]:
+    """Read the expiry time out of a presigned URL.
+
+    S3 and GCS signature v4 (X-Amz-Date/X-Amz-Expires, X-Goog-Date/X-Goog-Expires),
+    signature v2 and CloudFront (Expires) and Azure SAS (se) URLs are understood.
+
+    Args:
+        url (str): The presigned URL.
+
+    Returns:
+        Optional[float]: The expiry as a UNIX timestamp, or None if the URL does not tell.
+    """
+    query = {key.lower(): values[-1] for key, values in parse_qs(urlsplit(url).query).items()}
+    try:
+        for prefix in ("x-amz-", "x-goog-"):
+            if f"{prefix}date" in query and f"{prefix}expires" in query:
+                return _parse_compact_datetime(query[f"{prefix}date"]) + int(query[f"{prefix}expires"])
+        if "expires" in query:
+            return float(query["expires"])
+        if "se" in query:
+            return datetime.fromisoformat(query["se"].replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+    return None
+
+
+class PresignedURLCache():
+    """A thread-safe LRU cache of presigned URLs.
+
+    An entry is refreshed ``refresh_margin`` seconds before its URL expires (or half way
+    through its lifetime for URLs valid for less than twice the margin), so a cached URL
+    is never handed out when it is about to be rejected. URLs whose expiry can not be read
+    from the query string are kept for ``default_ttl`` seconds.
+
+    Args:
+        max_size (int): The maximum number of URLs kept.
+        refresh_margin (float): The number of seconds before expiry at which a URL is refreshed.
+        default_ttl (float): The lifetime assumed for URLs without a readable expiry.
+        clock (Callable[[], float]): The current UNIX time. Defaults to time.time.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        refresh_margin: float = 60.0,
+        default_ttl: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_size = max_size
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Get a cached URL that is not about to expire, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._clock() >= entry[1]:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, url: str):
+        """Cache a presigned URL until shortly before it expires."""
+        now = self._clock()
+        expires_at = parse_url_expiry(url)
+        if expires_at is None:
+            expires_at = now + self.default_ttl
+        margin = min(self.refresh_margin, max(expires_at - now, 0) / 2)
+        with self._lock:
+            if self.max_size <= 0:
+                return
+            self._entries[key] = (url, expires_at - margin)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one entry, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the size of the cache and its hit and miss counts."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
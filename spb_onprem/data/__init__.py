@@ -1,6 +1,19 @@
 from .service import DataService
+from .async_service import AsyncDataService
+from .diff import DataChanges, DataDiffReport
+from .frame_columns import FrameColumns
+from .frame_patch import FramePatch
+from .mirror import DatasetMirror
+from .write_buffer import WriteBehindBuffer
 
 
 __all__ = (
     "DataService",
+    "AsyncDataService",
+    "DataChanges",
+    "DataDiffReport",
+    "DatasetMirror",
+    "FrameColumns",
+    "FramePatch",
+    "WriteBehindBuffer",
 )
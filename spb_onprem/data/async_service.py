@@ -0,0 +1,15 @@
+"""
+This module defines the AsyncDataService class, the asyncio variant of DataService.
+
+Classes:
+    AsyncDataService: An asyncio service class that provides every DataService method as a coroutine.
+"""
+from spb_onprem.async_base_service import AsyncBaseService
+from .service import DataService
+
+
+class AsyncDataService(AsyncBaseService, service_class=DataService):
+    """
+    Asyncio service class for handling data-related operations.
+    Every public method of DataService is available as a coroutine with the same arguments.
+    """
@@ -0,0 +1,214 @@
+"""
+This module defines the bulk ingest pipeline of DataService.bulk_create.
+
+Classes:
+    BulkCreateItem: A data to create from local files or bytes.
+    BulkCreateResult: The outcome of one item.
+    BulkCreateReport: The outcome of a bulk ingest, with its throughput.
+
+Functions:
+    run_bulk_create: Upload the scenes and create the data of many items concurrently.
+"""
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from spb_onprem.base_model import CustomBaseModel, Field
+from spb_onprem.contents.entities import BaseContent
+from spb_onprem.exceptions import NotFoundError, RequestError, ResponseError
+from .entities import Data, DataMeta, DataSlice, Scene
+from .enums import DataMetaValue, DataType, SceneType
+
+# Errors worth retrying: the request did not go through or the server failed to answer.
+# GraphQL errors (e.g. a duplicate key) are not retried.
+TRANSIENT_ERRORS = (RequestError, ResponseError)
+
+
+class BulkCreateItem(CustomBaseModel):
+    """A data to create from local files or bytes."""
+    key: str = Field(..., description="The key of the data")
+    scenes: List[Union[bytes, str]] = Field(..., description="The scene files: local paths or raw bytes")
+    data_type: DataType = Field(DataType.SUPERB_IMAGE, description="The type of the data")
+    scene_type: SceneType = Field(SceneType.IMAGE, description="The type of every scene")
+    content_type: Optional[str] = Field(None, description="The MIME type of the scenes; guessed from paths if omitted")
+    meta: Optional[Dict[str, DataMetaValue]] = Field(None, description="The meta of the data")
+    slice_ids: Optional[List[str]] = Field(None, description="The slices the data is added to")
+
+
+class BulkCreateResult(CustomBaseModel):
+    """The outcome of one item of a bulk ingest."""
+    index: int = Field(..., description="The position of the item in the input")
+    key: str = Field(..., description="The key of the data")
+    data_id: Optional[str] = Field(None, description="The id of the created data")
+    content_ids: List[str] = Field(default_factory=list, description="The ids of the uploaded scene contents")
+    error: Optional[str] = Field(None, description="The error of the last attempt, if the item failed")
+    attempts: int = Field(0, description="The number of attempts made")
+    bytes_uploaded: int = Field(0, description="The number of scene bytes uploaded")
+
+    @property
+    def ok(self) -> bool:
+        return self.data_id is not None
+
+
+class BulkCreateReport(CustomBaseModel):
+    """The outcome of a bulk ingest: one result per item, in input order."""
+    results: List[BulkCreateResult] = Field(default_factory=list, description="The result of every item")
+    elapsed_seconds: float = Field(0.0, description="The duration of the ingest")
+
+    @property
+    def created(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def failed(self) -> List[BulkCreateResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def bytes_uploaded(self) -> int:
+        return sum(result.bytes_uploaded for result in self.results)
+
+    @property
+    def items_per_second(self) -> float:
+        return self.created / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_uploaded / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class _IndexProbe():
+    """Wraps a ContentHashIndex for one upload, to tell whether the upload was skipped."""
+
+    def __init__(self, hash_index):
+        self._hash_index = hash_index
+        self.hit = False
+
+    def has_size(self, *args) -> bool:
+        return self._hash_index.has_size(*args)
+
+    def lookup(self, *args) -> Optional[str]:
+        content_id = self._hash_index.lookup(*args)
+        self.hit = content_id is not None
+        return content_id
+
+    def record(self, *args):
+        self._hash_index.record(*args)
+
+
+def _upload_scene(
+    content_service, scene: Union[bytes, str], content_type: Optional[str], hash_index,
+) -> Tuple[BaseContent, int]:
+    # Returns the content and the number of bytes sent, 0 when the hash index skipped the upload.
+    probe = _IndexProbe(hash_index) if hash_index is not None else None
+    if isinstance(scene, bytes):
+        content = content_service.upload_content_with_data(
+            BytesIO(scene),
+            content_type=content_type or "application/octet-stream",
+            hash_index=probe,
+        )
+        size = len(scene)
+    else:
+        content = content_service.upload_content_stream(
+            scene,
+            content_type=content_type or mimetypes.guess_type(scene)[0],
+            hash_index=probe,
+        )
+        size = os.path.getsize(scene)
+    return content, 0 if probe is not None and probe.hit else size
+
+
+def run_bulk_create(
+    data_service,
+    content_service,
+    dataset_id: str,
+    items: List[BulkCreateItem],
+    concurrency: int = 8,
+    max_attempts: int = 3,
+    backoff: float = 0.5,
+    hash_index: Any = None,
+    journal: Any = None,
+    on_progress: Optional[Callable[[BulkCreateResult], Any]] = None,
+) -> BulkCreateReport:
+    """Upload the scenes and create the data of many items, ``concurrency`` items at a time.
+
+    Each worker takes an item through its scene uploads and its createData mutation, so
+    uploads of some items overlap with the mutations of others. Transient failures are
+    retried with exponential backoff; scenes already uploaded are not uploaded again. Before
+    a createData is retried, the key is looked up, so a mutation that succeeded on the server
+    but failed on the way back is not repeated.
+
+    With a ``journal`` (an OperationJournal), items completed by an earlier run are skipped
+    and report their recorded data id with no attempts. Items left pending or failed by an
+    earlier run are looked up by key before they are created again.
+    """
+    report = BulkCreateReport(results=[
+        BulkCreateResult(index=index, key=item.key) for index, item in enumerate(items)
+    ])
+    started = time.monotonic()
+    lock = threading.Lock()
+
+    def find(key: str) -> Optional[str]:
+        try:
+            return data_service.get_data_by_key(dataset_id=dataset_id, data_key=key, fields="id").id
+        except NotFoundError:
+            return None
+
+    def ingest(item: BulkCreateItem, result: BulkCreateResult) -> str:
+        contents: List[Optional[BaseContent]] = [None] * len(item.scenes)
+        while True:
+            result.attempts += 1
+            try:
+                for i, scene in enumerate(item.scenes):
+                    if contents[i] is None:
+                        contents[i], sent = _upload_scene(content_service, scene, item.content_type, hash_index)
+                        result.bytes_uploaded += sent
+                result.content_ids = [content.id for content in contents]
+                if result.attempts > 1:
+                    existing_id = find(item.key)
+                    if existing_id is not None:
+                        return existing_id
+                created = data_service.create_data(
+                    Data(
+                        dataset_id=dataset_id,
+                        key=item.key,
+                        type=item.data_type,
+                        scene=[Scene(type=item.scene_type, content=content) for content in contents],
+                        meta=DataMeta.from_dict(item.meta) if item.meta else None,
+                        slices=[DataSlice(id=slice_id) for slice_id in item.slice_ids or []],
+                    ),
+                    returning="id",
+                )
+                return created.id
+            except TRANSIENT_ERRORS:
+                if result.attempts >= max_attempts:
+                    raise
+                time.sleep(backoff * (2 ** (result.attempts - 1)))
+
+    def create(item: BulkCreateItem, result: BulkCreateResult):
+        try:
+            if journal is None:
+                result.data_id = ingest(item, result)
+            else:
+                result.data_id = journal.run(
+                    f"create_data:{dataset_id}:{item.key}",
+                    lambda: ingest(item, result),
+                    reconcile=lambda: find(item.key),
+                )
+            result.error = None
+        except Exception as e:
+            # Any error of one item, e.g. a ValidationError of its meta, fails only that item.
+            result.error = str(e)
+        with lock:
+            report.elapsed_seconds = time.monotonic() - started
+            if on_progress is not None:
+                on_progress(result)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="spb-onprem-bulk-create") as executor:
+        for future in [executor.submit(create, item, result) for item, result in zip(items, report.results)]:
+            future.result()
+    report.elapsed_seconds = time.monotonic() - started
+    return report
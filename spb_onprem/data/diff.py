@@ -0,0 +1,136 @@
+"""
+This module defines the diff-aware updates of DataService.apply_data_changes.
+
+Classes:
+    DataChanges: The desired state of some fields of a data.
+    DataDiffReport: The outcome of applying the changes of many data.
+
+Functions:
+    diff_data: Compare a data snapshot with a desired state.
+    typed_meta: Build the meta list of a desired state with the types of the snapshot keys.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from spb_onprem.base_model import CustomBaseModel, Field
+from spb_onprem.exceptions import BadParameterError
+from .entities import Data, DataMeta
+from .enums import DataMetaTypes, DataMetaValue, DataStatus
+from .scan import format_datetime, parse_datetime
+
+# The fields compared, in the order their mutations are sent.
+DIFF_FIELDS = ("meta", "annotation_meta", "tags", "status", "slice_meta")
+
+
+class DataChanges(CustomBaseModel):
+    """The desired state of a data. The fields left None are neither compared nor written."""
+    meta: Optional[Dict[str, DataMetaValue]] = Field(None, description="The whole meta of the data")
+    annotation_meta: Optional[dict] = Field(None, description="The meta of the annotation")
+    slice_id: Optional[str] = Field(None, description="The slice of tags, status and slice_meta")
+    tags: Optional[List[str]] = Field(None, description="The tags of the data slice; their order is not compared")
+    status: Optional[DataStatus] = Field(None, description="The status of the data slice")
+    slice_meta: Optional[dict] = Field(None, description="The meta of the data slice")
+
+
+class DataDiffReport(CustomBaseModel):
+    """The outcome of applying the changes of many data."""
+    compared: int = Field(0, description="The number of data compared")
+    mutations_sent: int = Field(0, description="The number of mutations sent")
+    mutations_skipped: int = Field(0, description="The number of mutations avoided because the field was unchanged")
+    changed_fields: Dict[str, int] = Field(default_factory=dict, description="The number of data changed per field")
+    failed: Dict[str, str] = Field(default_factory=dict, description="The error of every data id that failed")
+
+
+def _normalize_meta_value(value: Any, meta_type: Optional[DataMetaTypes] = None) -> Any:
+    # The server returns DateTime meta as ISO strings; compare them as timestamps.
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    if meta_type == DataMetaTypes.DATETIME and isinstance(value, str):
+        try:
+            return format_datetime(parse_datetime(value))
+        except BadParameterError:
+            return value
+    return value
+
+
+def _meta_map(meta: List[DataMeta]) -> Dict[str, Any]:
+    return {item.key: _normalize_meta_value(item.value, item.type) for item in meta}
+
+
+def typed_meta(meta: Dict[str, DataMetaValue], snapshot: Optional[Data] = None) -> List[DataMeta]:
+    """Build the meta list of a desired state with the types of the snapshot keys.
+
+    DataMeta.from_dict types an ISO string as String; a key the snapshot has as DateTime
+    keeps its DateTime type, with the value canonicalized, if the string parses.
+
+    Args:
+        meta (Dict[str, DataMetaValue]): The desired meta.
+        snapshot (Optional[Data]): The data as last read from the server.
+
+    Returns:
+        List[DataMeta]: The meta items, with DateTime values as ISO strings.
+    """
+    types = {item.key: item.type for item in (snapshot.meta if snapshot is not None else None) or []}
+    items = []
+    for item in DataMeta.from_dict(meta):
+        if types.get(item.key) == DataMetaTypes.DATETIME and item.type == DataMetaTypes.STRING:
+            try:
+                item = item.model_copy(
+                    update={"type": DataMetaTypes.DATETIME, "value": format_datetime(parse_datetime(item.value))}
+                )
+            except BadParameterError:
+                pass
+        elif isinstance(item.value, datetime):
+            item = item.model_copy(update={"value": format_datetime(item.value)})
+        items.append(item)
+    return items
+
+
+def diff_data(snapshot: Data, desired: DataChanges) -> List[str]:
+    """Compare a data snapshot with a desired state.
+
+    A field the snapshot was not fetched with (for example the slices of a data listed
+    with ``fields="meta"``) is reported as changed, so it is written rather than missed.
+
+    Args:
+        snapshot (Data): The data as last read from the server.
+        desired (DataChanges): The desired state.
+
+    Raises:
+        BadParameterError: Slice fields are given without a slice_id.
+
+    Returns:
+        List[str]: The names of the fields of DIFF_FIELDS that differ, in DIFF_FIELDS order.
+    """
+    if desired.slice_id is None and any(
+        value is not None for value in (desired.tags, desired.status, desired.slice_meta)
+    ):
+        raise BadParameterError("slice_id is required to change tags, status or slice_meta.")
+
+    changed = []
+    if desired.meta is not None:
+        if "meta" not in snapshot.model_fields_set or snapshot.meta is None:
+            changed.append("meta")
+        else:
+            # A desired DateTime is usually an ISO string; compare it with the type of the snapshot key.
+            if _meta_map(snapshot.meta) != _meta_map(typed_meta(desired.meta, snapshot)):
+                changed.append("meta")
+    if desired.annotation_meta is not None:
+        annotation = snapshot.annotation
+        if annotation is None or "meta" not in annotation.model_fields_set or annotation.meta != desired.annotation_meta:
+            changed.append("annotation_meta")
+
+    if desired.slice_id is not None:
+        data_slice = next(
+            (data_slice for data_slice in snapshot.slices or [] if data_slice.id == desired.slice_id), None
+        )
+        fetched = data_slice.model_fields_set if data_slice is not None else set()
+        if desired.tags is not None and (
+            "tags" not in fetched or set(data_slice.tags or []) != set(desired.tags)
+        ):
+            changed.append("tags")
+        if desired.status is not None and ("status" not in fetched or data_slice.status != desired.status):
+            changed.append("status")
+        if desired.slice_meta is not None and ("meta" not in fetched or data_slice.meta != desired.slice_meta):
+            changed.append("slice_meta")
+    return changed
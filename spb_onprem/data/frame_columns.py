@@ -0,0 +1,210 @@
+"""
+This module defines the FrameColumns class, a compact array-backed representation of the frames of a video.
+
+Classes:
+    FrameColumns: The frames of a data as columns of machine numbers.
+"""
+import math
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+from spb_onprem.exceptions import BadParameterError, SDKConfigError
+from .entities.frame import Frame, GeoLocation
+from .scan import format_datetime, parse_datetime
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+_NAN = float("nan")
+
+
+def _epoch(value: Optional[str]) -> float:
+    return parse_datetime(value).timestamp() if value else _NAN
+
+
+def _as_epoch(value: Union[datetime, float, int]) -> float:
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+
+def _numpy_view(column: array) -> Any:
+    return numpy.frombuffer(column, dtype=numpy.int64 if column.typecode == "q" else numpy.float64)
+
+
+def _is_sorted(column: array) -> bool:
+    # NaN compares False, so a column with a missing value is never sorted.
+    if numpy is not None:
+        values = _numpy_view(column)
+        return bool(numpy.all(values[:-1] <= values[1:]))
+    return all(column[i] <= column[i + 1] for i in range(len(column) - 1))
+
+
+class FrameColumns():
+    """The frames of a data as columns instead of one Frame model per frame.
+
+    The index, the capture time (UNIX seconds), the latitude and the longitude of the frames
+    are kept in ``array`` columns; a missing time or location is NaN. The ids and the meta
+    are kept as the plain values of the response, and a Frame is only built when one is
+    asked for. A 30k-frame video takes a few flat buffers instead of ~60k models::
+
+        columns = data_service.get_frame_columns(dataset_id, data_id)
+        clip = columns.range(1000, 2000).between(since, until)
+        for position in range(len(clip)):
+            print(clip.index[position], clip.meta(position))
+
+    Range and time queries bisect sorted columns, and fall back to a NumPy mask (or a scan
+    without NumPy) otherwise; whether a column is sorted is checked once, when it is built.
+    ``to_numpy()`` returns the columns as a structured array; it requires NumPy, which is
+    optional. Capture times are kept at millisecond precision.
+    """
+
+    __slots__ = ("index", "captured_at", "lat", "lon", "_ids", "_meta", "_sorted")
+
+    def __init__(
+        self,
+        index: Sequence[int] = (),
+        captured_at: Optional[Sequence[float]] = None,
+        lat: Optional[Sequence[float]] = None,
+        lon: Optional[Sequence[float]] = None,
+        ids: Optional[List[Optional[str]]] = None,
+        meta: Optional[List[Optional[dict]]] = None,
+    ):
+        self.index = array("q", index)
+        count = len(self.index)
+        self.captured_at = array("d", captured_at if captured_at is not None else [_NAN] * count)
+        self.lat = array("d", lat if lat is not None else [_NAN] * count)
+        self.lon = array("d", lon if lon is not None else [_NAN] * count)
+        self._ids = ids if ids is not None else [None] * count
+        self._meta = meta if meta is not None else [None] * count
+        if any(len(column) != count for column in (self.captured_at, self.lat, self.lon, self._ids, self._meta)):
+            raise BadParameterError("Every frame column must have the same length.")
+        self._sorted = {"index": _is_sorted(self.index), "captured_at": _is_sorted(self.captured_at)}
+
+    @classmethod
+    def from_frames(cls, frames: List[Frame]) -> "FrameColumns":
+        """Build the columns of a list of Frame models."""
+        return cls(
+            index=[frame.index for frame in frames],
+            captured_at=[_epoch(frame.captured_at) for frame in frames],
+            lat=[frame.geo_location.lat if frame.geo_location else _NAN for frame in frames],
+            lon=[frame.geo_location.lon if frame.geo_location else _NAN for frame in frames],
+            ids=[frame.id for frame in frames],
+            meta=[frame.meta for frame in frames],
+        )
+
+    @classmethod
+    def from_response(cls, frames: List[dict]) -> "FrameColumns":
+        """Build the columns of the frames of a GraphQL response, without building Frame models."""
+        locations = [frame.get("geoLocation") or {} for frame in frames]
+        return cls(
+            index=[frame["index"] for frame in frames],
+            captured_at=[_epoch(frame.get("capturedAt")) for frame in frames],
+            lat=[location.get("lat", _NAN) for location in locations],
+            lon=[location.get("lon", _NAN) for location in locations],
+            ids=[frame.get("id") for frame in frames],
+            meta=[frame.get("meta") for frame in frames],
+        )
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[Frame]:
+        return (self.frame(position) for position in range(len(self)))
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Frame, "FrameColumns"]:
+        if isinstance(key, slice):
+            return self.take(range(len(self))[key])
+        return self.frame(key)
+
+    def meta(self, position: int) -> Optional[dict]:
+        """Get the meta of the frame at a position."""
+        return self._meta[position]
+
+    def frame(self, position: int) -> Frame:
+        """Build the Frame at a position."""
+        captured_at = self.captured_at[position]
+        lat, lon = self.lat[position], self.lon[position]
+        return Frame(
+            id=self._ids[position],
+            index=self.index[position],
+            captured_at=None if math.isnan(captured_at) else format_datetime(
+                datetime.fromtimestamp(captured_at, timezone.utc)
+            ),
+            geo_location=None if math.isnan(lat) or math.isnan(lon) else GeoLocation(lat=lat, lon=lon),
+            meta=self._meta[position],
+        )
+
+    def to_frames(self) -> List[Frame]:
+        """Build the list of Frame models, e.g. for DataService.update_frames."""
+        return list(self)
+
+    def take(self, positions: Sequence[int]) -> "FrameColumns":
+        """Get the frames at some positions as new columns."""
+        if isinstance(positions, range) and positions.step == 1:
+            return self._slice(positions.start, positions.stop)
+        return FrameColumns(
+            index=[self.index[position] for position in positions],
+            captured_at=[self.captured_at[position] for position in positions],
+            lat=[self.lat[position] for position in positions],
+            lon=[self.lon[position] for position in positions],
+            ids=[self._ids[position] for position in positions],
+            meta=[self._meta[position] for position in positions],
+        )
+
+    def _slice(self, start: int, stop: int) -> "FrameColumns":
+        # A run of consecutive frames; a run of a sorted column is sorted, so it is not checked again.
+        columns = FrameColumns.__new__(FrameColumns)
+        columns.index = self.index[start:stop]
+        columns.captured_at = self.captured_at[start:stop]
+        columns.lat = self.lat[start:stop]
+        columns.lon = self.lon[start:stop]
+        columns._ids = self._ids[start:stop]
+        columns._meta = self._meta[start:stop]
+        columns._sorted = {
+            name: is_sorted or _is_sorted(getattr(columns, name)) for name, is_sorted in self._sorted.items()
+        }
+        return columns
+
+    def _select(self, name: str, low: float, high: float) -> "FrameColumns":
+        # The frames whose value of the column is in [low, high).
+        column = getattr(self, name)
+        if self._sorted[name]:
+            return self.take(range(bisect_left(column, low), bisect_left(column, high)))
+        if numpy is not None:
+            values = _numpy_view(column)
+            return self.take(numpy.flatnonzero((values >= low) & (values < high)).tolist())
+        return self.take([position for position, value in enumerate(column) if low <= value < high])
+
+    def range(self, start: int, stop: int) -> "FrameColumns":
+        """Get the frames whose index is in [start, stop)."""
+        return self._select("index", start, stop)
+
+    def between(self, since: Union[datetime, float], until: Union[datetime, float]) -> "FrameColumns":
+        """Get the frames captured in [since, until), given as datetimes or UNIX seconds.
+
+        Frames without a capture time are never selected.
+        """
+        return self._select("captured_at", _as_epoch(since), _as_epoch(until))
+
+    def to_numpy(self) -> Any:
+        """Get the columns as a NumPy structured array with index, captured_at, lat and lon fields.
+
+        Raises:
+            SDKConfigError: NumPy is not installed.
+        """
+        if numpy is None:
+            raise SDKConfigError(
+                "numpy is required for FrameColumns.to_numpy(). "
+                "Install it with `pip install superb-ai-onprem[numpy]`."
+            )
+        result = numpy.empty(len(self), dtype=[
+            ("index", numpy.int64), ("captured_at", numpy.float64), ("lat", numpy.float64), ("lon", numpy.float64),
+        ])
+        result["index"] = numpy.frombuffer(self.index, dtype=numpy.int64)
+        result["captured_at"] = numpy.frombuffer(self.captured_at, dtype=numpy.float64)
+        result["lat"] = numpy.frombuffer(self.lat, dtype=numpy.float64)
+        result["lon"] = numpy.frombuffer(self.lon, dtype=numpy.float64)
+        return result
@@ -0,0 +1,71 @@
+"""
+This module defines the frame patches of DataService.patch_frames.
+
+Classes:
+    FramePatch: A change of the frames in an index range.
+
+Functions:
+    apply_frame_patches: Apply patches to a list of frames.
+"""
+from typing import List, Optional, Tuple
+
+from spb_onprem.base_model import CustomBaseModel, Field
+from spb_onprem.exceptions import BadParameterError
+from .entities.frame import Frame, GeoLocation
+
+
+class FramePatch(CustomBaseModel):
+    """A change of the frames whose index is in [start, stop)."""
+    start: int = Field(..., description="The index of the first frame")
+    stop: Optional[int] = Field(None, description="The index after the last frame; defaults to start + 1")
+    meta: Optional[dict] = Field(None, description="The meta keys to set; a None value removes the key")
+    captured_at: Optional[str] = Field(None, description="The capture time to set (ISO 8601)")
+    geo_location: Optional[GeoLocation] = Field(None, description="The location to set")
+
+
+def apply_frame_patches(frames: List[Frame], patches: List[FramePatch]) -> Tuple[List[Frame], int]:
+    """Apply patches to a list of frames, in order.
+
+    Frames are matched by their index; indexes no frame has are ignored. The input
+    frames are not modified.
+
+    Raises:
+        BadParameterError: A patch has an empty range.
+
+    Returns:
+        Tuple[List[Frame], int]: The patched frames and the number of frames that changed.
+    """
+    patched = list(frames)
+    positions = {frame.index: position for position, frame in enumerate(frames)}
+    changed = set()
+    for patch in patches:
+        stop = patch.start + 1 if patch.stop is None else patch.stop
+        if stop <= patch.start:
+            raise BadParameterError(f"The frame range [{patch.start}, {stop}) is empty.")
+        if stop - patch.start <= len(positions):
+            indexes = range(patch.start, stop)
+        else:
+            indexes = [index for index in positions if patch.start <= index < stop]
+        for index in indexes:
+            position = positions.get(index)
+            if position is None:
+                continue
+            frame = patched[position]
+            update = {}
+            if patch.meta is not None:
+                meta = dict(frame.meta or {})
+                for key, value in patch.meta.items():
+                    if value is None:
+                        meta.pop(key, None)
+                    else:
+                        meta[key] = value
+                if meta != (frame.meta or {}):
+                    update["meta"] = meta
+            if patch.captured_at is not None and patch.captured_at != frame.captured_at:
+                update["captured_at"] = patch.captured_at
+            if patch.geo_location is not None and patch.geo_location != frame.geo_location:
+                update["geo_location"] = patch.geo_location
+            if update:
+                patched[position] = frame.model_copy(update=update)
+                changed.add(position)
+    return patched, len(changed)
@@ -0,0 +1,448 @@
+"""
+This module defines the DatasetMirror class, a local SQLite copy of the data of a dataset.
+
+Classes:
+    DatasetMirror: Mirrors the data of a dataset into a SQLite file and keeps it up to date
+        with incremental syncs on updatedAt.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from spb_onprem.base_types import Undefined, UndefinedType
+from spb_onprem.exceptions import BadParameterError
+from .entities import Data, DataMeta
+from .enums import DataMetaTypes
+from .params import DataListFilter, DataFilterOptions, DateTimeRangeFilterOption
+from .scan import format_datetime, parse_datetime
+from .service import DataService
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS mirror_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS data (
+    id TEXT PRIMARY KEY,
+    key TEXT,
+    type TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS data_key ON data (key);
+CREATE INDEX IF NOT EXISTS data_updated_at ON data (updated_at);
+CREATE TABLE IF NOT EXISTS data_meta (
+    data_id TEXT NOT NULL REFERENCES data (id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    type TEXT,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS data_meta_key ON data_meta (key, value);
+CREATE INDEX IF NOT EXISTS data_meta_data_id ON data_meta (data_id);
+CREATE TABLE IF NOT EXISTS data_slices (
+    data_id TEXT NOT NULL REFERENCES data (id) ON DELETE CASCADE,
+    slice_id TEXT NOT NULL,
+    status TEXT,
+    labeler TEXT,
+    reviewer TEXT,
+    tags TEXT,
+    status_changed_at TEXT,
+    PRIMARY KEY (data_id, slice_id)
+);
+CREATE INDEX IF NOT EXISTS data_slices_slice ON data_slices (slice_id, status);
+CREATE TABLE IF NOT EXISTS data_annotation_stats (
+    data_id TEXT NOT NULL REFERENCES data (id) ON DELETE CASCADE,
+    type TEXT,
+    "group" TEXT,
+    annotation_class TEXT,
+    sub_class TEXT,
+    count INTEGER
+);
+CREATE INDEX IF NOT EXISTS data_annotation_stats_class ON data_annotation_stats (annotation_class);
+CREATE INDEX IF NOT EXISTS data_annotation_stats_data_id ON data_annotation_stats (data_id);
+'''
+
+# The fields mirrored by default: everything but the scene, frames, thumbnail and annotation versions.
+DEFAULT_MIRROR_FIELDS = (
+    "datasetId",
+    "key",
+    "type",
+    "meta",
+    "slices",
+    "annotationStats",
+    "createdAt",
+    "createdBy",
+    "updatedAt",
+    "updatedBy",
+)
+
+
+# Data updated while a sync runs can commit with an updatedAt just before the newest one
+# the sync saw. The next sync starts this much before the high-water mark to pick them up.
+DEFAULT_SYNC_OVERLAP = 60.0
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return format_datetime(value)
+    raise TypeError(f"Can not compare a meta value of type {type(value).__name__}.")
+
+
+def _meta_value(meta: DataMeta) -> Any:
+    # DateTime meta is stored as format_datetime text, whatever precision it was given with,
+    # so find(meta_value=<datetime>) compares equal values equal.
+    value = meta.model_dump(mode="json")["value"]
+    if meta.type == DataMetaTypes.DATETIME:
+        if isinstance(meta.value, datetime):
+            return format_datetime(meta.value)
+        if isinstance(value, str):
+            try:
+                return format_datetime(parse_datetime(value))
+            except BadParameterError:
+                return value
+    return value
+
+
+class DatasetMirror():
+    """A local SQLite copy of the data of a dataset.
+
+    The first ``sync()`` downloads every data; later syncs only fetch the data whose
+    updatedAt is at or after the high-water mark of the previous sync, less an overlap
+    of ``sync_overlap`` seconds for the data updated while that sync ran. The file can be
+    queried offline and is ready as soon as it is opened::
+
+        with DatasetMirror("dataset.sqlite", dataset_id) as mirror:
+            mirror.sync()
+            labeled = mirror.find(slice_id=slice_id, status="COMPLETED")
+
+    Deleted data do not change updatedAt; ``sync(prune=True)`` also lists the ids of the
+    dataset and removes the local rows that no longer exist.
+
+    Args:
+        path (str): The SQLite file. ":memory:" keeps the mirror in memory.
+        dataset_id (str): The dataset id.
+        data_service (Optional[DataService]): The service used to sync. Defaults to a new DataService.
+        fields (Iterable[str]): The Data fields stored in the mirror. updatedAt is always stored.
+        sync_overlap (float): The seconds before the high-water mark an incremental sync starts at.
+            Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dataset_id: str,
+        data_service: Optional[DataService] = None,
+        fields: Iterable[str] = DEFAULT_MIRROR_FIELDS,
+        sync_overlap: float = DEFAULT_SYNC_OVERLAP,
+    ):
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if isinstance(fields, str):
+            raise BadParameterError("fields must be a set of Data field names.")
+        if sync_overlap < 0:
+            raise BadParameterError("sync_overlap must not be negative.")
+        self.path = path
+        self.dataset_id = dataset_id
+        self.fields = tuple(dict.fromkeys(list(fields) + ["updatedAt"]))
+        self._data_service = data_service
+        self.sync_overlap = sync_overlap
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+        mirrored_dataset_id = self._get_state("dataset_id")
+        if mirrored_dataset_id is None:
+            self._set_state("dataset_id", dataset_id)
+            self._connection.commit()
+        elif mirrored_dataset_id != dataset_id:
+            self._connection.close()
+            raise BadParameterError(
+                f"'{path}' mirrors the dataset '{mirrored_dataset_id}', not '{dataset_id}'."
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM data").fetchone()[0]
+
+    def __contains__(self, data_id: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM data WHERE id = ?", (data_id,)).fetchone() is not None
+
+    @property
+    def data_service(self) -> DataService:
+        if self._data_service is None:
+            self._data_service = DataService()
+        return self._data_service
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """The largest updatedAt seen by the last completed sync."""
+        with self._lock:
+            return self._get_state("high_water_mark")
+
+    def close(self):
+        """Close the SQLite connection."""
+        with self._lock:
+            self._connection.close()
+
+    def sync(
+        self,
+        data_filter: Optional[DataListFilter] = None,
+        full: bool = False,
+        prune: bool = False,
+        page_size: int = 50,
+    ) -> int:
+        """Fetch the data updated since the last sync and store them.
+
+        The high-water mark is only advanced once every page has been stored, so an
+        interrupted sync is repeated from the previous mark.
+
+        Args:
+            data_filter (Optional[DataListFilter]): An additional filter. Its updatedAt condition is replaced.
+                The high-water mark is shared by every sync, so use the same filter each time.
+            full (bool): Ignore the high-water mark and fetch every data. Defaults to False.
+            prune (bool): Remove the local data that no longer exist in the dataset. Defaults to False.
+            page_size (int): The number of data per request. Max 50. Defaults to 50.
+
+        Returns:
+            int: The number of data stored.
+        """
+        mark = None if full else self.high_water_mark
+        since = parse_datetime(mark) if mark is not None else None
+        sync_filter = data_filter.model_copy(deep=True) if data_filter is not None else DataListFilter()
+        if since is not None:
+            if sync_filter.must_filter is None:
+                sync_filter.must_filter = DataFilterOptions()
+            sync_filter.must_filter.updated_at = DateTimeRangeFilterOption(
+                datetime_from=format_datetime(since - timedelta(seconds=self.sync_overlap))
+            )
+
+        stored = 0
+        high_water_mark = since
+        page: List[Data] = []
+        for data in self.data_service.iter_data(
+            dataset_id=self.dataset_id,
+            data_filter=sync_filter,
+            page_size=page_size,
+            fields=self.fields,
+        ):
+            page.append(data)
+            if data.updated_at is not None:
+                # Timestamps come back with and without milliseconds; compare them as times.
+                updated_at = parse_datetime(data.updated_at)
+                if high_water_mark is None or updated_at > high_water_mark:
+                    high_water_mark = updated_at
+            if len(page) >= page_size:
+                stored += self.upsert(page)
+                page = []
+        stored += self.upsert(page)
+
+        if prune:
+            remote_ids = set(self.data_service.iter_data_ids(dataset_id=self.dataset_id, page_size=page_size))
+            self.delete([data_id for data_id in self._ids() if data_id not in remote_ids])
+
+        with self._lock, self._connection:
+            if high_water_mark is not None:
+                self._set_state("high_water_mark", format_datetime(high_water_mark))
+        return stored
+
+    def upsert(self, data_list: Iterable[Data]) -> int:
+        """Store data in the mirror, replacing the stored rows with the same id.
+
+        Args:
+            data_list (Iterable[Data]): The data.
+
+        Returns:
+            int: The number of data stored.
+        """
+        count = 0
+        with self._lock, self._connection:
+            for data in data_list:
+                if data.id is None:
+                    raise BadParameterError("Data without an id can not be mirrored.")
+                self._connection.execute("DELETE FROM data WHERE id = ?", (data.id,))
+                self._connection.execute(
+                    "INSERT INTO data (id, key, type, created_at, updated_at, document) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        data.id,
+                        data.key,
+                        data.type.value if data.type is not None else None,
+                        data.created_at,
+                        data.updated_at,
+                        data.model_dump_json(by_alias=True, exclude_none=True),
+                    ),
+                )
+                self._connection.executemany(
+                    "INSERT INTO data_meta (data_id, key, type, value) VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            data.id,
+                            meta.key,
+                            meta.type.value if meta.type is not None else None,
+                            json.dumps(_meta_value(meta)),
+                        )
+                        for meta in data.meta or []
+                    ],
+                )
+                self._connection.executemany(
+                    "INSERT INTO data_slices (data_id, slice_id, status, labeler, reviewer, tags, status_changed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            data.id,
+                            data_slice.id,
+                            data_slice.status.value if data_slice.status is not None else None,
+                            data_slice.labeler,
+                            data_slice.reviewer,
+                            json.dumps(data_slice.tags or []),
+                            data_slice.status_changed_at,
+                        )
+                        for data_slice in data.slices or []
+                        if data_slice.id is not None
+                    ],
+                )
+                self._connection.executemany(
+                    'INSERT INTO data_annotation_stats (data_id, type, "group", annotation_class, sub_class, count) '
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (data.id, stat.type, stat.group, stat.annotation_class, stat.sub_class, stat.count)
+                        for stat in data.annotation_stats or []
+                    ],
+                )
+                count += 1
+        return count
+
+    def delete(self, data_ids: Iterable[str]) -> int:
+        """Remove data from the mirror.
+
+        Args:
+            data_ids (Iterable[str]): The ids of the data.
+
+        Returns:
+            int: The number of data removed.
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.executemany("DELETE FROM data WHERE id = ?", [(data_id,) for data_id in data_ids])
+            return cursor.rowcount
+
+    def get(self, data_id: str) -> Optional[Data]:
+        """Get a mirrored data by id, or None."""
+        return next(self._select("WHERE id = ?", (data_id,)), None)
+
+    def get_by_key(self, data_key: str) -> Optional[Data]:
+        """Get a mirrored data by key, or None."""
+        return next(self._select("WHERE key = ?", (data_key,)), None)
+
+    def iter_data(self) -> Iterator[Data]:
+        """Iterate over every mirrored data, ordered by key."""
+        return self._select("", ())
+
+    def find(
+        self,
+        key_prefix: Optional[str] = None,
+        data_type: Optional[str] = None,
+        slice_id: Optional[str] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        meta_key: Optional[str] = None,
+        meta_value: Union[Any, UndefinedType] = Undefined,
+        annotation_class: Optional[str] = None,
+    ) -> List[Data]:
+        """Find mirrored data. All given conditions must match.
+
+        Args:
+            key_prefix (Optional[str]): The prefix of the key.
+            data_type (Optional[str]): The data type, e.g. "SUPERB_IMAGE".
+            slice_id (Optional[str]): A slice the data belongs to. status and tag apply to this slice.
+            status (Optional[str]): The slice status, e.g. "COMPLETED".
+            tag (Optional[str]): A slice tag.
+            meta_key (Optional[str]): A meta key the data has.
+            meta_value (Union[Any, UndefinedType]): The value of meta_key.
+            annotation_class (Optional[str]): An annotation class with at least one annotation.
+
+        Returns:
+            List[Data]: The data, ordered by key.
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        if key_prefix is not None:
+            conditions.append("key LIKE ? ESCAPE '\\'")
+            params.append(key_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if data_type is not None:
+            conditions.append("type = ?")
+            params.append(getattr(data_type, "value", data_type))
+        if slice_id is not None or status is not None or tag is not None:
+            slice_conditions = ["data_slices.data_id = data.id"]
+            if slice_id is not None:
+                slice_conditions.append("slice_id = ?")
+                params.append(slice_id)
+            if status is not None:
+                slice_conditions.append("status = ?")
+                params.append(getattr(status, "value", status))
+            if tag is not None:
+                slice_conditions.append("EXISTS (SELECT 1 FROM json_each(data_slices.tags) WHERE json_each.value = ?)")
+                params.append(tag)
+            conditions.append(f"EXISTS (SELECT 1 FROM data_slices WHERE {' AND '.join(slice_conditions)})")
+        if meta_key is not None:
+            if meta_value is Undefined:
+                conditions.append("EXISTS (SELECT 1 FROM data_meta WHERE data_id = data.id AND key = ?)")
+                params.append(meta_key)
+            else:
+                conditions.append("EXISTS (SELECT 1 FROM data_meta WHERE data_id = data.id AND key = ? AND value = ?)")
+                params.extend([meta_key, json.dumps(meta_value, default=_json_default)])
+        elif meta_value is not Undefined:
+            raise BadParameterError("meta_value requires meta_key.")
+        if annotation_class is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM data_annotation_stats "
+                "WHERE data_id = data.id AND annotation_class = ? AND count > 0)"
+            )
+            params.append(annotation_class)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return list(self._select(where, tuple(params)))
+
+    def query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[tuple]:
+        """Run a read-only SQL query against the mirror tables.
+
+        The tables are data, data_meta, data_slices and data_annotation_stats.
+
+        Args:
+            sql (str): The SQL query.
+            params (Tuple[Any, ...]): The query parameters.
+
+        Returns:
+            List[tuple]: The rows.
+        """
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def _select(self, where: str, params: tuple) -> Iterator[Data]:
+        with self._lock:
+            rows = self._connection.execute(f"SELECT document FROM data {where} ORDER BY key, id", params).fetchall()
+        for (document,) in rows:
+            yield Data.model_validate_json(document)
+
+    def _ids(self) -> List[str]:
+        with self._lock:
+            return [data_id for (data_id,) in self._connection.execute("SELECT id FROM data")]
+
+    def _get_state(self, name: str) -> Optional[str]:
+        row = self._connection.execute("SELECT value FROM mirror_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, name: str, value: str):
+        self._connection.execute(
+            "INSERT INTO mirror_state (name, value) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (name, value),
+        )
@@ -91,6 +91,12 @@ from .update_tags import (
 from .update_scene import (
     update_scene_params,
 )
+from .upsert_data_meta import (
+    upsert_data_meta_params,
+)
+from .remove_data_meta import (
+    remove_data_meta_params,
+)
 
 __all__ = [
     "create_params",
@@ -140,4 +146,6 @@ __all__ = [
     "update_frames_params",
     "update_tags_params",
     "update_scene_params",
+    "upsert_data_meta_params",
+    "remove_data_meta_params",
 ]
@@ -1,3 +1,7 @@
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from spb_onprem.exceptions import BadParameterError
+from .entities import Data
 from .params import (
     create_params,
     update_params,
@@ -23,6 +27,8 @@ from .params import (
     update_frames_params,
     update_tags_params,
     update_scene_params,
+    upsert_data_meta_params,
+    remove_data_meta_params,
 )
 
 
@@ -38,12 +44,14 @@ class Schemas:
         next
         totalCount
     '''
-    
-    DATA = '''
-        id
-        datasetId
-        key
-        type
+
+    # The selection of every top-level Data field, keyed by its GraphQL name.
+    DATA_FIELDS = {
+        "id": "id",
+        "datasetId": "datasetId",
+        "key": "key",
+        "type": "type",
+        "scene": '''
         scene {
             id
             type
@@ -51,7 +59,8 @@ class Schemas:
                 id
             }
             meta
-        }
+        }''',
+        "frames": '''
         frames {
             id
             index
@@ -61,7 +70,8 @@ class Schemas:
                 lon
             }
             meta
-        }
+        }''',
+        "annotation": '''
         annotation {
             meta
             versions {
@@ -73,19 +83,22 @@ class Schemas:
                 }
                 meta
             }
-        }
+        }''',
+        "annotationStats": '''
         annotationStats {
             type
             group
             annotationClass
             subClass
             count
-        }
+        }''',
+        "meta": '''
         meta {
             key
             type
             value
-        }
+        }''',
+        "slices": '''
         slices {
             id
             status
@@ -132,16 +145,43 @@ class Schemas:
                 createdBy
             }
             meta
-        }
+        }''',
+        "thumbnail": '''
         thumbnail {
             id
-        }
-        createdAt
+        }''',
+        "createdAt": "createdAt",
+        "updatedAt": "updatedAt",
+        "createdBy": "createdBy",
+        "updatedBy": "updatedBy",
+    }
+
+    DATA = "\n".join(
+        selection.strip("\n") if "{" in selection else f"        {selection}"
+        for selection in DATA_FIELDS.values()
+    )
+
+    DATA_MINIMAL = '''
+        id
+        datasetId
+        key
+        type
         updatedAt
-        createdBy
         updatedBy
     '''
 
+    # The slice memberships without their annotations and comments.
+    DATA_SLICE_STATUS = '''
+        slices {
+            id
+            status
+            labeler
+            reviewer
+            tags
+            statusChangedAt
+            meta
+        }'''
+
     DATA_PAGE = f'''
         data {{
             {DATA}  
@@ -206,6 +246,48 @@ class Queries():
         "variables": update_params,
     }
 
+    UPSERT_DATA_META = {
+        "name": "upsertDataMeta",
+        "query": f'''
+            mutation (
+                $dataset_id: ID!,
+                $data_id: ID!,
+                $meta: [DataMetaInput!]
+            ) {{
+                upsertDataMeta(
+                    datasetId: $dataset_id,
+                    id: $data_id,
+                    meta: $meta,
+                ) {{
+                    {Schemas.DATA}
+                }}
+            }}
+        ''',
+        "variables": upsert_data_meta_params,
+    }
+
+    REMOVE_DATA_META = {
+        "name": "removeDataMeta",
+        "query": f'''
+            mutation (
+                $dataset_id: ID!,
+                $data_id: ID!,
+                $meta: [DataMetaInput!],
+                $system_meta: [DataMetaInput!]
+            ) {{
+                removeDataMeta(
+                    datasetId: $dataset_id,
+                    id: $data_id,
+                    meta: $meta,
+                    systemMeta: $system_meta,
+                ) {{
+                    {Schemas.DATA}
+                }}
+            }}
+        ''',
+        "variables": remove_data_meta_params,
+    }
+
     GET = {
         "name": "data",
         "query": f'''
@@ -670,3 +752,109 @@ class Queries():
         ''',
         "variables": update_scene_params,
     }
+
+
+DataSelection = Union[str, Iterable[str]]
+
+# Named projections for reads; "slice:<slice_id>" selects the slim slice memberships.
+_DATA_PROJECTIONS = {
+    "keys": ("key",),
+    "meta": ("key", "meta"),
+    "annotation": ("key", "annotation", "annotationStats"),
+    "frames": ("key", "frames"),
+}
+_DATA_SELECTIONS = {
+    "id": "id",
+    "minimal": Schemas.DATA_MINIMAL,
+    "full": Schemas.DATA,
+}
+_DATA_FIELD_NAMES = {
+    **{name: name for name in Schemas.DATA_FIELDS},
+    **{
+        field_name: field.alias
+        for field_name, field in Data.model_fields.items()
+        if field.alias in Schemas.DATA_FIELDS
+    },
+}
+_SLICE_PROJECTION_PREFIX = "slice:"
+_selected_queries: Dict[Tuple[str, str], dict] = {}
+
+
+def projection_slice_id(returning: DataSelection) -> Optional[str]:
+    """Get the slice id of a "slice:<slice_id>" projection, or None for any other selection."""
+    if isinstance(returning, str) and returning.startswith(_SLICE_PROJECTION_PREFIX):
+        slice_id = returning[len(_SLICE_PROJECTION_PREFIX):]
+        if not slice_id:
+            raise BadParameterError("The slice projection requires a slice id, e.g. 'slice:<slice_id>'.")
+        return slice_id
+    return None
+
+
+def build_data_selection(returning: DataSelection = "full", required: Iterable[str] = ()) -> str:
+    """Build the GraphQL selection of a Data result.
+
+    Args:
+        returning (DataSelection): "id", "minimal", "full", a read projection ("keys", "meta",
+            "annotation", "frames", "slice:<slice_id>"), or an iterable of Data field names
+            (GraphQL or python names, e.g. ["meta", "annotation_stats"]). "id" is always selected.
+        required (Iterable[str]): Data field names that must be selected whatever the selection.
+
+    Raises:
+        BadParameterError: The selection name or a field name is unknown.
+
+    Returns:
+        str: The selection.
+    """
+    overrides = {}
+    if isinstance(returning, str):
+        required = list(required)
+        if returning == "full" or (returning in _DATA_SELECTIONS and not required):
+            return _DATA_SELECTIONS[returning]
+        if returning == "id":
+            fields = []
+        elif returning == "minimal":
+            fields = ["datasetId", "key", "type", "updatedAt", "updatedBy"]
+        elif returning in _DATA_PROJECTIONS:
+            fields = list(_DATA_PROJECTIONS[returning])
+        elif projection_slice_id(returning) is not None:
+            fields = ["key", "slices"]
+            overrides["slices"] = Schemas.DATA_SLICE_STATUS
+        else:
+            raise BadParameterError(
+                f"returning must be one of {list(_DATA_SELECTIONS) + list(_DATA_PROJECTIONS)}, "
+                f"'slice:<slice_id>' or a set of Data fields, got '{returning}'."
+            )
+        fields = fields + required
+    else:
+        fields = list(returning) + list(required)
+
+    selected = ["id"]
+    for name in fields:
+        if name not in _DATA_FIELD_NAMES:
+            raise BadParameterError(f"Unknown Data field '{name}'.")
+        if _DATA_FIELD_NAMES[name] not in selected:
+            selected.append(_DATA_FIELD_NAMES[name])
+    return "\n".join(overrides.get(field, Schemas.DATA_FIELDS[field]) for field in selected)
+
+
+def with_data_selection(query: dict, returning: DataSelection = "full", required: Iterable[str] = ()) -> dict:
+    """Get a variant of a query object that selects only the requested Data fields.
+
+    Args:
+        query (dict): A query object of ``Queries`` that selects ``Schemas.DATA``.
+        returning (DataSelection): The selection, see ``build_data_selection``.
+        required (Iterable[str]): Data field names that must be selected whatever the selection.
+
+    Returns:
+        dict: The query object itself for "full", otherwise a cached copy with the smaller selection.
+    """
+    selection = build_data_selection(returning, required)
+    if selection == Schemas.DATA:
+        return query
+    cache_key = (query["query"], selection)
+    if cache_key not in _selected_queries:
+        _selected_queries[cache_key] = {
+            **query,
+            "query": query["query"].replace(Schemas.DATA, selection),
+        }
+    return _selected_queries[cache_key]
@@ -0,0 +1,199 @@
+"""
+This module defines the sharded parallel scan of a dataset.
+
+Classes:
+    ScanShard: The progress of one createdAt window of a parallel scan. It can be persisted to resume the scan.
+
+Functions:
+    build_scan_shards: Split a createdAt range into disjoint windows.
+    scan_shards: Walk the windows concurrently and merge them into one stream.
+"""
+import queue
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from spb_onprem.base_model import CustomBaseModel, Field
+from spb_onprem.exceptions import BadParameterError
+from .entities import Data
+from .params import DataListFilter, DataFilterOptions, DateTimeRangeFilterOption
+
+_ISO_RE = re.compile(r"^(?P<base>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(?P<fraction>\d+))?(?P<tz>Z|[+-]\d{2}:?\d{2})?$")
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp returned by the server into an aware UTC datetime."""
+    match = _ISO_RE.match(value.strip())
+    if match is None:
+        raise BadParameterError(f"Invalid ISO 8601 datetime: '{value}'")
+    fraction = (match.group("fraction") or "0")[:6].ljust(6, "0")
+    tz = match.group("tz") or "Z"
+    tz = "+00:00" if tz == "Z" else tz if ":" in tz else f"{tz[:3]}:{tz[3:]}"
+    return datetime.fromisoformat(f"{match.group('base')}.{fraction}{tz}").astimezone(timezone.utc)
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a datetime as the ISO 8601 UTC timestamp the server expects."""
+    value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+
+class ScanShard(CustomBaseModel):
+    """
+    The progress of one createdAt window of a parallel scan.
+
+    Persist the shards (e.g. ``[shard.model_dump() for shard in shards]``) and pass them
+    back as ``resume_from`` to continue an interrupted scan.
+    """
+    index: int = Field(..., description="Position of the window in the scan")
+    created_from: Optional[str] = Field(None, alias="createdFrom", description="Inclusive lower bound; None for open")
+    created_to: Optional[str] = Field(None, alias="createdTo", description="Inclusive upper bound; None for open")
+    cursor: Optional[str] = Field(None, description="Cursor of the next page to read")
+    count: int = Field(0, description="The number of data yielded from this window")
+    done: bool = Field(False, description="Whether the window has been read completely")
+
+
+def build_scan_shards(
+    shards: int,
+    created_from: datetime,
+    created_to: datetime,
+    open_start: bool = True,
+    open_end: bool = True,
+) -> List[ScanShard]:
+    """Split a createdAt range into ``shards`` contiguous windows of equal length.
+
+    Adjacent windows share their boundary instant; ``scan_shards`` drops the duplicates.
+
+    Args:
+        shards (int): The number of windows.
+        created_from (datetime): The start of the range.
+        created_to (datetime): The end of the range.
+        open_start (bool): Leave the first window unbounded below, so nothing before created_from is missed.
+        open_end (bool): Leave the last window unbounded above, so nothing after created_to is missed.
+
+    Returns:
+        List[ScanShard]: The windows.
+    """
+    if shards < 1:
+        raise BadParameterError("shards must be at least 1.")
+    if created_to < created_from:
+        raise BadParameterError("created_to must not be before created_from.")
+    step = (created_to - created_from) / shards
+    boundaries = [created_from + step * i for i in range(shards)] + [created_to]
+    return [
+        ScanShard(
+            index=i,
+            created_from=None if (i == 0 and open_start) else format_datetime(boundaries[i]),
+            created_to=None if (i == shards - 1 and open_end) else format_datetime(boundaries[i + 1]),
+        )
+        for i in range(shards)
+    ]
+
+
+def shard_filter(data_filter: Optional[DataListFilter], shard: ScanShard) -> DataListFilter:
+    """Restrict a data filter to the createdAt window of a shard."""
+    sharded = data_filter.model_copy(deep=True) if data_filter is not None else DataListFilter()
+    window = DateTimeRangeFilterOption()
+    if shard.created_from is not None:
+        window.datetime_from = shard.created_from
+    if shard.created_to is not None:
+        window.to = shard.created_to
+    if sharded.must_filter is None:
+        sharded.must_filter = DataFilterOptions(created_at=window)
+    else:
+        sharded.must_filter.created_at = window
+    return sharded
+
+
+_DONE = object()
+
+
+def scan_shards(
+    fetch_page: Callable[[DataListFilter, Optional[str]], Tuple[List[Data], Optional[str]]],
+    data_filter: Optional[DataListFilter],
+    shards: List[ScanShard],
+    on_progress: Optional[Callable[[ScanShard], Any]] = None,
+    max_pending_pages: Optional[int] = None,
+) -> Iterator[Data]:
+    """Walk the shards concurrently, one thread each, and merge them into one stream.
+
+    A shard's cursor and count are updated after all data of a page have been yielded,
+    so persisted shards resume after the last page the consumer has fully received.
+
+    Args:
+        fetch_page (Callable): Fetches a page for a filter and cursor and returns its data and the next cursor.
+        data_filter (Optional[DataListFilter]): The filter of the scan.
+        shards (List[ScanShard]): The windows to walk. Windows marked done are skipped.
+        on_progress (Optional[Callable[[ScanShard], Any]]): Called with a shard after each of its pages.
+        max_pending_pages (Optional[int]): The number of fetched pages held in memory. Defaults to twice the number of shards.
+
+    Yields:
+        Data: The data of every shard, in no particular order.
+    """
+    active = [shard for shard in shards if not shard.done]
+    if not active:
+        return
+    pages: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending_pages or 2 * len(active))
+    stop = threading.Event()
+    boundaries = {
+        parse_datetime(bound)
+        for shard in shards
+        for bound in (shard.created_from, shard.created_to)
+        if bound is not None
+    }
+    boundary_ids = set()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def walk(shard: ScanShard):
+        sharded = shard_filter(data_filter, shard)
+        cursor = shard.cursor
+        try:
+            while not stop.is_set():
+                data, cursor = fetch_page(sharded, cursor)
+                if not put((shard, data, cursor)) or cursor is None:
+                    break
+        except BaseException as e:
+            put(e)
+            return
+        put((shard, _DONE, None))
+
+    threads = [
+        threading.Thread(target=walk, args=(shard,), name=f"spb-onprem-scan-{shard.index}", daemon=True)
+        for shard in active
+    ]
+    for thread in threads:
+        thread.start()
+
+    remaining = len(active)
+    try:
+        while remaining:
+            item = pages.get()
+            if isinstance(item, BaseException):
+                raise item
+            shard, data, cursor = item
+            if data is _DONE:
+                remaining -= 1
+                continue
+            for item_data in data:
+                if item_data.created_at is not None and parse_datetime(item_data.created_at) in boundaries:
+                    # Adjacent windows both contain their shared boundary instant.
+                    if item_data.id in boundary_ids:
+                        continue
+                    boundary_ids.add(item_data.id)
+                yield item_data
+                shard.count += 1
+            shard.cursor = cursor
+            shard.done = cursor is None
+            if on_progress is not None:
+                on_progress(shard)
+    finally:
+        stop.set()
@@ -4,16 +4,23 @@ This module defines the DataService class for handling data-related operations.
 Classes:
     DataService: A service class that provides methods for data management operations.
 """
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import (
-    Optional, List, Union,
+    Optional, Dict, List, Tuple, Union, Iterator, Callable, Any,
 )
 
-from spb_onprem.base_service import BaseService
+from spb_onprem.base_service import BaseService, sync_only
 from spb_onprem.base_types import (
     Undefined,
     UndefinedType,
 )
-from .queries import Queries
+from .queries import (
+    Queries,
+    DataSelection,
+    projection_slice_id,
+    with_data_selection,
+)
 from .entities import (
     Data,
     AnnotationVersion,
@@ -23,12 +30,56 @@ from .entities import (
     Scene,
 )
 from .enums import (
+    DataMetaTypes,
+    DataMetaValue,
     DataStatus,
 )
 from .params import (
     DataListFilter,
 )
-from spb_onprem.exceptions import BadParameterError
+from .bulk import (
+    BulkCreateItem,
+    BulkCreateReport,
+    BulkCreateResult,
+    run_bulk_create,
+)
+from .frame_columns import FrameColumns
+from .frame_patch import FramePatch, apply_frame_patches
+from .diff import DIFF_FIELDS, DataChanges, DataDiffReport, diff_data, typed_meta
+from .write_buffer import WriteBehindBuffer
+from .scan import (
+    ScanShard,
+    build_scan_shards,
+    format_datetime,
+    parse_datetime,
+    scan_shards,
+)
+from spb_onprem.exceptions import BadParameterError, BaseSDKError, NotFoundError
+from spb_onprem.utils.pagination import iter_pages
+
+def _meta_list(meta: Union[List[DataMeta], Dict[str, DataMetaValue]]) -> List[DataMeta]:
+    # Accepts a list of DataMeta or a {key: value} map; DateTime values are sent as ISO strings.
+    meta = DataMeta.from_dict(meta) if isinstance(meta, dict) else list(meta)
+    return [
+        item.model_copy(update={"value": format_datetime(item.value)}) if isinstance(item.value, datetime) else item
+        for item in meta
+    ]
+
+
+def _meta_keys(meta: Union[List[DataMeta], Dict[str, DataMetaTypes]]) -> List[DataMeta]:
+    # Accepts a list of DataMeta or a {key: type} map.
+    if isinstance(meta, dict):
+        return [DataMeta(key=key, type=DataMetaTypes(meta_type)) for key, meta_type in meta.items()]
+    return list(meta)
+
+
+def _project_data(data: Data, fields: DataSelection) -> Data:
+    # The slices field takes no arguments, so a slice projection is narrowed client-side.
+    slice_id = projection_slice_id(fields)
+    if slice_id is not None:
+        data.slices = [data_slice for data_slice in data.slices or [] if data_slice.id == slice_id]
+    return data
+
 
 class DataService(BaseService):
     """
@@ -39,12 +90,16 @@ class DataService(BaseService):
         self,
         dataset_id: str,
         data_id: str,
+        fields: DataSelection = "full",
     ):
         """Get a data by id or key.
 
         Args:
             dataset_id (str): The dataset id.
             data_id (Union[ str, UndefinedType ], optional): The id of the data. Defaults to Undefined.
+            fields (DataSelection, optional): The fields to fetch: "full", "keys", "meta", "annotation",
+                "frames", "slice:<slice_id>" (only that slice's membership, without annotations and comments),
+                or a set of Data field names. Defaults to "full".
 
         Raises:
             BadParameterError: Either data_id or key must be provided.
@@ -58,25 +113,29 @@ class DataService(BaseService):
             raise BadParameterError("data_id is required.")
 
         response = self.request_gql(
-            Queries.GET,
+            with_data_selection(Queries.GET, fields),
             Queries.GET["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
             )
         )
 
-        return Data.model_validate(response)
+        return _project_data(Data.model_validate(response), fields)
 
     def get_data_by_key(
         self,
         dataset_id: str,
         data_key: str,
+        fields: DataSelection = "full",
     ):
         """Get a data by key.
 
         Args:
             dataset_id (str): The dataset id.
             data_key (str): The key of the data.
+            fields (DataSelection, optional): The fields to fetch: "full", "keys", "meta", "annotation",
+                "frames", "slice:<slice_id>" (only that slice's membership, without annotations and comments),
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The data.
@@ -86,10 +145,110 @@ class DataService(BaseService):
         if data_key is None:
             raise BadParameterError("data_key is required.")
         response = self.request_gql(
-            Queries.GET,
+            with_data_selection(Queries.GET, fields),
             Queries.GET["variables"](dataset_id=dataset_id, data_key=data_key)
         )
-        return Data.model_validate(response)
+        return _project_data(Data.model_validate(response), fields)
+
+    @sync_only
+    def get_data_many(
+        self,
+        dataset_id: str,
+        data_ids: List[str],
+        chunk_size: int = 50,
+        max_workers: int = 4,
+        fields: DataSelection = "full",
+    ) -> List[Optional[Data]]:
+        """Get many data by id, packing ``chunk_size`` lookups into each request.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_ids (List[str]): The ids of the data.
+            chunk_size (int): The number of lookups per request. Defaults to 50.
+            max_workers (int): The number of requests sent concurrently. Defaults to 4.
+            fields (DataSelection, optional): The fields to fetch, see get_data_list. Defaults to "full".
+
+        Returns:
+            List[Optional[Data]]: The data in the order of data_ids, None for the ids that were not found.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if data_ids is None:
+            raise BadParameterError("data_ids is required.")
+        return self._get_data_many(
+            [
+                Queries.GET["variables"](dataset_id=dataset_id, data_id=data_id)
+                for data_id in data_ids
+            ],
+            chunk_size,
+            max_workers,
+            fields,
+        )
+
+    @sync_only
+    def get_data_many_by_key(
+        self,
+        dataset_id: str,
+        data_keys: List[str],
+        chunk_size: int = 50,
+        max_workers: int = 4,
+        fields: DataSelection = "full",
+    ) -> List[Optional[Data]]:
+        """Get many data by key, packing ``chunk_size`` lookups into each request.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_keys (List[str]): The keys of the data.
+            chunk_size (int): The number of lookups per request. Defaults to 50.
+            max_workers (int): The number of requests sent concurrently. Defaults to 4.
+            fields (DataSelection, optional): The fields to fetch, see get_data_list. Defaults to "full".
+
+        Returns:
+            List[Optional[Data]]: The data in the order of data_keys, None for the keys that were not found.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if data_keys is None:
+            raise BadParameterError("data_keys is required.")
+        return self._get_data_many(
+            [
+                Queries.GET["variables"](dataset_id=dataset_id, data_key=data_key)
+                for data_key in data_keys
+            ],
+            chunk_size,
+            max_workers,
+            fields,
+        )
+
+    def _get_data_many(
+        self,
+        lookups: List[dict],
+        chunk_size: int,
+        max_workers: int,
+        fields: DataSelection,
+    ) -> List[Optional[Data]]:
+        if chunk_size < 1:
+            raise BadParameterError("chunk_size must be at least 1.")
+        if max_workers < 1:
+            raise BadParameterError("max_workers must be at least 1.")
+        query = with_data_selection(Queries.GET, fields)
+
+        def fetch_chunk(chunk: List[dict]) -> List[Optional[Data]]:
+            found = []
+            for response, error in self.request_gql_batch([(query, variables) for variables in chunk]):
+                if isinstance(error, NotFoundError) or (error is None and response is None):
+                    found.append(None)
+                elif error is not None:
+                    raise error
+                else:
+                    found.append(_project_data(Data.model_validate(response), fields))
+            return found
+
+        chunks = [lookups[start:start + chunk_size] for start in range(0, len(lookups), chunk_size)]
+        if len(chunks) <= 1:
+            return [data for chunk in chunks for data in fetch_chunk(chunk)]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spb-onprem-get-many") as executor:
+            return [data for found in executor.map(fetch_chunk, chunks) for data in found]
 
     def get_data_list(
         self,
@@ -97,7 +256,8 @@ class DataService(BaseService):
         data_filter: Optional[DataListFilter] = None,
         cursor: Optional[str] = None,
         length: int = 10,
-        include_selected_frames: bool = False
+        include_selected_frames: bool = False,
+        fields: DataSelection = "full",
     ):
         """Get data list of a dataset.
 
@@ -107,6 +267,9 @@ class DataService(BaseService):
             cursor (Optional[str]): The cursor to use for pagination.
             length (int): The length of the data to retrieve.
             include_selected_frames (bool): If True, returns selected frames as 4th element in tuple. Defaults to False.
+            fields (DataSelection, optional): The fields to fetch: "full", "keys", "meta", "annotation",
+                "frames", "slice:<slice_id>" (only that slice's membership, without annotations and comments),
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             tuple: A tuple containing the data, the next cursor, the total count of data, 
@@ -115,17 +278,9 @@ class DataService(BaseService):
         if length > 50:
             raise ValueError("Length must be less than or equal to 50.")
 
-        response = self.request_gql(
-            Queries.GET_LIST,
-            Queries.GET_LIST["variables"](
-                dataset_id=dataset_id,
-                data_filter=data_filter,
-                cursor=cursor,
-                length=length
-            )
-        )
+        response = self._request_data_page(dataset_id, data_filter, cursor, length, fields)
         data_list = response.get("data", [])
-        data = [Data.model_validate(data_dict) for data_dict in data_list]
+        data = [_project_data(Data.model_validate(data_dict), fields) for data_dict in data_list]
         
         if include_selected_frames:
             selected_frames = response.get("selectedFrames", [])
@@ -142,6 +297,25 @@ class DataService(BaseService):
             response.get("totalCount", 0),
         )
 
+    def _request_data_page(
+        self,
+        dataset_id: str,
+        data_filter: Optional[DataListFilter],
+        cursor: Optional[str],
+        length: int,
+        fields: DataSelection,
+        required: tuple = (),
+    ) -> dict:
+        return self.request_gql(
+            with_data_selection(Queries.GET_LIST, fields, required),
+            Queries.GET_LIST["variables"](
+                dataset_id=dataset_id,
+                data_filter=data_filter,
+                cursor=cursor,
+                length=length
+            )
+        )
+
     def get_data_id_list(
         self,
         dataset_id: str,
@@ -193,24 +367,564 @@ class DataService(BaseService):
             response.get("totalCount", 0),
         )
 
+    def get_data_ids(
+        self,
+        dataset_id: str,
+        data_filter: Optional[DataListFilter] = None,
+        cursor: Optional[str] = None,
+        length: int = 50,
+        include_selected_frames: bool = False,
+    ):
+        """Get a page of data ids of a dataset as plain strings.
+
+        Unlike get_data_id_list, no Data object is built per row.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_filter (Optional[DataListFilter]): The filter to apply to the data.
+            cursor (Optional[str]): The cursor to use for pagination.
+            length (int): The number of ids to retrieve. Max 50. Defaults to 50.
+            include_selected_frames (bool): If True, returns the selected frames as
+                (data_id, selected_frame_index) tuples as 4th element in tuple. Defaults to False.
+
+        Returns:
+            tuple: A tuple containing the ids, the next cursor, the total count of data,
+                   and optionally selected_frames (if include_selected_frames=True).
+        """
+        if length > 50:
+            raise ValueError("Length must be less than or equal to 50.")
+
+        response = self.request_gql(
+            Queries.GET_ID_LIST,
+            Queries.GET_ID_LIST["variables"](
+                dataset_id=dataset_id,
+                data_filter=data_filter,
+                cursor=cursor,
+                length=length
+            )
+        )
+        ids = [data_dict["id"] for data_dict in response.get("data") or []]
+
+        if include_selected_frames:
+            selected_frames = [
+                (frame["dataId"], frame["selectedFrameIndex"])
+                for frame in response.get("selectedFrames") or []
+            ]
+            return (
+                ids,
+                response.get("next", None),
+                response.get("totalCount", 0),
+                selected_frames,
+            )
+
+        return (
+            ids,
+            response.get("next", None),
+            response.get("totalCount", 0),
+        )
+
+    def iter_data_ids(
+        self,
+        dataset_id: str,
+        data_filter: Optional[DataListFilter] = None,
+        page_size: int = 50,
+        prefetch: int = 2,
+        cursor: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Iterate over the ids of every data of a dataset that matches the filter.
+
+        The next pages are fetched in the background while the current page is consumed.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_filter (Optional[DataListFilter]): The filter to apply to the data.
+            page_size (int): The number of ids per request. Max 50. Defaults to 50.
+            prefetch (int): The number of pages fetched ahead. 0 fetches one page at a time. Defaults to 2.
+            cursor (Optional[str]): The cursor to resume from. Defaults to None.
+
+        Yields:
+            str: The data id.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if page_size > 50:
+            raise BadParameterError("page_size must be less than or equal to 50.")
+
+        def fetch_page(page_cursor: Optional[str]):
+            ids, next_cursor, _ = self.get_data_ids(
+                dataset_id=dataset_id,
+                data_filter=data_filter,
+                cursor=page_cursor,
+                length=page_size,
+            )
+            return ids, next_cursor
+
+        for ids, _ in iter_pages(fetch_page, cursor=cursor, prefetch=prefetch):
+            yield from ids
+
+    def iter_data(
+        self,
+        dataset_id: str,
+        data_filter: Optional[DataListFilter] = None,
+        page_size: int = 50,
+        prefetch: int = 2,
+        cursor: Optional[str] = None,
+        fields: DataSelection = "full",
+    ) -> Iterator[Data]:
+        """Iterate over every data of a dataset that matches the filter.
+
+        The next pages are fetched in the background while the current page is consumed.
+        At most ``prefetch`` pages are held in memory ahead of the consumer.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_filter (Optional[DataListFilter]): The filter to apply to the data.
+            page_size (int): The number of data per request. Max 50. Defaults to 50.
+            prefetch (int): The number of pages fetched ahead. 0 fetches one page at a time. Defaults to 2.
+            cursor (Optional[str]): The cursor to resume from. Defaults to None.
+            fields (DataSelection, optional): The fields to fetch, see get_data_list. Defaults to "full".
+
+        Yields:
+            Data: The data.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if page_size > 50:
+            raise BadParameterError("page_size must be less than or equal to 50.")
+
+        def fetch_page(page_cursor: Optional[str]):
+            data, next_cursor, _ = self.get_data_list(
+                dataset_id=dataset_id,
+                data_filter=data_filter,
+                cursor=page_cursor,
+                length=page_size,
+                fields=fields,
+            )
+            return data, next_cursor
+
+        for data, _ in iter_pages(fetch_page, cursor=cursor, prefetch=prefetch):
+            yield from data
+
+    @sync_only
+    def scan_parallel(
+        self,
+        dataset_id: str,
+        data_filter: Optional[DataListFilter] = None,
+        shards: int = 4,
+        page_size: int = 50,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        resume_from: Optional[List[ScanShard]] = None,
+        on_progress: Optional[Callable[[ScanShard], Any]] = None,
+        fields: DataSelection = "full",
+    ) -> Iterator[Data]:
+        """Scan a dataset with several concurrent cursors, one per createdAt window.
+
+        The createdAt range is split into ``shards`` disjoint windows, which are walked
+        concurrently and merged into one stream. The range is ``created_from``/``created_to``,
+        else the createdAt filter of ``data_filter``. A bound given either way closes its end
+        window, so data outside the range are not scanned. A missing lower bound defaults to
+        the dataset creation and a missing upper bound to now, and the end window on that side
+        is left open-ended, so data created outside the default range are not missed.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_filter (Optional[DataListFilter]): The filter to apply to the data.
+            shards (int): The number of windows walked concurrently. Defaults to 4.
+            page_size (int): The number of data per request. Max 50. Defaults to 50.
+            created_from (Optional[str]): The start of the createdAt range (ISO 8601).
+            created_to (Optional[str]): The end of the createdAt range (ISO 8601).
+            resume_from (Optional[List[ScanShard]]): The shards of an interrupted scan to continue.
+            on_progress (Optional[Callable[[ScanShard], Any]]): Called with a shard after each of its pages.
+            fields (DataSelection, optional): The fields to fetch, see get_data_list. createdAt is always
+                fetched, as it is needed to drop duplicates at window boundaries. Defaults to "full".
+
+        Returns:
+            Iterator[Data]: The data of every window, in no particular order.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if page_size > 50:
+            raise BadParameterError("page_size must be less than or equal to 50.")
+        with_data_selection(Queries.GET_LIST, fields)
+
+        if resume_from is not None:
+            scan = [ScanShard.model_validate(shard) for shard in resume_from]
+        else:
+            created_at = data_filter.must_filter.created_at if data_filter and data_filter.must_filter else None
+            if created_at is not None and created_at.equals is not None:
+                raise BadParameterError("A createdAt equals filter can not be split into shards.")
+            lower = created_from or (created_at.datetime_from if created_at else None)
+            upper = created_to or (created_at.to if created_at else None)
+            if lower is None:
+                from spb_onprem.datasets.service import DatasetService
+                dataset = DatasetService().get_dataset(dataset_id=dataset_id)
+                lower_bound = parse_datetime(dataset.created_at) if dataset.created_at else datetime.now(timezone.utc)
+            else:
+                lower_bound = parse_datetime(lower)
+            upper_bound = parse_datetime(upper) if upper else datetime.now(timezone.utc)
+            scan = build_scan_shards(
+                shards,
+                lower_bound,
+                max(lower_bound, upper_bound),
+                open_start=lower is None,
+                open_end=upper is None,
+            )
+
+        def fetch_page(shard_filter: DataListFilter, cursor: Optional[str]):
+            response = self._request_data_page(
+                dataset_id, shard_filter, cursor, page_size, fields, required=("createdAt",)
+            )
+            data = [
+                _project_data(Data.model_validate(data_dict), fields)
+                for data_dict in response.get("data", [])
+            ]
+            return data, response.get("next", None)
+
+        return scan_shards(fetch_page, data_filter, scan, on_progress=on_progress)
+
     def create_data(
         self,
         data: Data,
+        returning: DataSelection = "full",
     ):
         """Create data in the dataset.
 
         Args:
             data (Data): The data object to create.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The created data.
         """
         response = self.request_gql(
-            Queries.CREATE,
+            with_data_selection(Queries.CREATE, returning),
             Queries.CREATE["variables"](data)
         )
         return Data.model_validate(response)
 
+    @sync_only
+    def bulk_create(
+        self,
+        dataset_id: str,
+        items: List[Union[BulkCreateItem, dict]],
+        concurrency: int = 8,
+        max_attempts: int = 3,
+        hash_index: Optional[Any] = None,
+        journal: Optional[Any] = None,
+        on_progress: Optional[Callable[[BulkCreateResult], Any]] = None,
+    ) -> BulkCreateReport:
+        """Create many data from local files or bytes.
+
+        Every item's scenes are uploaded and its data created with ``createData``, with
+        ``concurrency`` items in flight, so uploads and mutations of different items overlap.
+        Transient failures are retried; an item that still fails is reported and does not
+        stop the others.
+
+        Args:
+            dataset_id (str): The dataset id.
+            items (List[Union[BulkCreateItem, dict]]): The data to create.
+            concurrency (int): The number of items processed concurrently. Defaults to 8.
+            max_attempts (int): The number of attempts per item. Defaults to 3.
+            hash_index (Optional[ContentHashIndex]): If given, scene bytes already uploaded are not uploaded again.
+            journal (Optional[OperationJournal]): If given, items completed by an earlier run of the job are
+                skipped, and items it left pending or failed are looked up by key before they are created again.
+            on_progress (Optional[Callable[[BulkCreateResult], Any]]): Called after every item.
+
+        Returns:
+            BulkCreateReport: The result of every item, in input order, and the throughput.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if concurrency < 1:
+            raise BadParameterError("concurrency must be at least 1.")
+        if max_attempts < 1:
+            raise BadParameterError("max_attempts must be at least 1.")
+        items = [BulkCreateItem.model_validate(item) for item in items]
+
+        from spb_onprem.contents.service import ContentService
+        return run_bulk_create(
+            self,
+            ContentService(),
+            dataset_id,
+            items,
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            hash_index=hash_index,
+            journal=journal,
+            on_progress=on_progress,
+        )
+
+    @sync_only
+    def apply_data_changes(
+        self,
+        dataset_id: str,
+        changes: List[Tuple[Data, Union[DataChanges, dict]]],
+        max_ops: int = 100,
+    ) -> DataDiffReport:
+        """Write only the fields that differ from a known snapshot of each data.
+
+        Every (snapshot, desired state) pair is compared with diff_data, and a mutation is
+        sent for each field that differs: updateData for meta, updateAnnotation for the
+        annotation meta, updateDataTags, changeDataStatus and updateDataSlice for the slice
+        fields. The snapshots can come from a page just listed or from a local mirror. The
+        mutations return only the id and are sent as aliased operations, ``max_ops`` per request.
+
+        Args:
+            dataset_id (str): The dataset id.
+            changes (List[Tuple[Data, Union[DataChanges, dict]]]): The snapshot and the desired state of every data.
+            max_ops (int): The maximum number of mutations per request. Defaults to 100.
+
+        Raises:
+            BadParameterError: A parameter is missing or a desired state is invalid.
+
+        Returns:
+            DataDiffReport: The number of mutations sent and avoided, and the errors.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if max_ops < 1:
+            raise BadParameterError("max_ops must be at least 1.")
+
+        report = DataDiffReport()
+        operations = []
+        for snapshot, desired in changes:
+            desired = DataChanges.model_validate(desired)
+            changed = diff_data(snapshot, desired)
+            report.compared += 1
+            report.mutations_skipped += sum(
+                1 for field in DIFF_FIELDS if getattr(desired, field) is not None and field not in changed
+            )
+            for field in changed:
+                report.changed_fields[field] = report.changed_fields.get(field, 0) + 1
+                operations.append((snapshot.id, self._data_change_operation(dataset_id, snapshot, desired, field)))
+
+        failed = self._send_data_mutations(operations, max_ops, max_workers=1)
+        report.mutations_sent = len(operations)
+        report.failed = {data_id: str(error) for data_id, error in failed.items()}
+        return report
+
+    def _data_change_operation(self, dataset_id: str, snapshot: Data, desired: DataChanges, field: str):
+        data_id = snapshot.id
+        if field == "meta":
+            # The keys keep the types they have on the server, e.g. a DateTime given as an ISO string.
+            query, variables = Queries.UPDATE, Queries.UPDATE["variables"](
+                dataset_id=dataset_id, data_id=data_id, meta=typed_meta(desired.meta, snapshot)
+            )
+        elif field == "annotation_meta":
+            query, variables = Queries.UPDATE_ANNOTATION, Queries.UPDATE_ANNOTATION["variables"](
+                dataset_id=dataset_id, data_id=data_id, meta=desired.annotation_meta
+            )
+        elif field == "tags":
+            query, variables = Queries.UPDATE_TAGS, Queries.UPDATE_TAGS["variables"](
+                dataset_id=dataset_id, slice_id=desired.slice_id, data_id=data_id, tags=desired.tags
+            )
+        elif field == "status":
+            query, variables = Queries.CHANGE_DATA_STATUS, Queries.CHANGE_DATA_STATUS["variables"](
+                dataset_id=dataset_id, data_id=data_id, slice_id=desired.slice_id, status=desired.status
+            )
+        else:
+            query, variables = Queries.UPDATE_DATA_SLICE, Queries.UPDATE_DATA_SLICE["variables"](
+                dataset_id=dataset_id, data_id=data_id, slice_id=desired.slice_id, meta=desired.slice_meta
+            )
+        return with_data_selection(query, "id"), variables
+
+    def _send_data_mutations(
+        self,
+        operations: List[Tuple[str, Tuple[Any, dict]]],
+        max_ops: int,
+        max_workers: int,
+    ) -> Dict[str, BaseSDKError]:
+        # Sends (data_id, (query, variables)) pairs as aliased mutations; returns the first error per data id.
+        chunks = [operations[start:start + max_ops] for start in range(0, len(operations), max_ops)]
+
+        def send(chunk) -> List[Tuple[str, BaseSDKError]]:
+            try:
+                outcomes = self.request_gql_batch([operation for _, operation in chunk])
+            except BaseSDKError as e:
+                outcomes = [(None, e)] * len(chunk)
+            return [(data_id, error) for (data_id, _), (_, error) in zip(chunk, outcomes) if error is not None]
+
+        if len(chunks) <= 1 or max_workers <= 1:
+            results = [send(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spb-onprem-data-mutations") as executor:
+                results = list(executor.map(send, chunks))
+        failed: Dict[str, BaseSDKError] = {}
+        for errors in results:
+            for data_id, error in errors:
+                failed.setdefault(data_id, error)
+        return failed
+
+    def upsert_data_meta(
+        self,
+        dataset_id: str,
+        data_id: str,
+        meta: Union[List[DataMeta], Dict[str, DataMetaValue]],
+        returning: DataSelection = "full",
+    ) -> Data:
+        """Add or replace some meta keys of a data, leaving its other meta untouched.
+
+        Unlike update_data, which replaces the whole meta list, only the given keys are sent.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_id (str): The data id.
+            meta (Union[List[DataMeta], Dict[str, DataMetaValue]]): The meta to set, as DataMeta or a {key: value} map.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
+
+        Returns:
+            Data: The updated data.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if data_id is None:
+            raise BadParameterError("data_id is required.")
+        if meta is None:
+            raise BadParameterError("meta is required.")
+
+        response = self.request_gql(
+            with_data_selection(Queries.UPSERT_DATA_META, returning),
+            Queries.UPSERT_DATA_META["variables"](
+                dataset_id=dataset_id,
+                data_id=data_id,
+                meta=_meta_list(meta),
+            )
+        )
+        return Data.model_validate(response)
+
+    def remove_data_meta(
+        self,
+        dataset_id: str,
+        data_id: str,
+        meta: Union[List[DataMeta], Dict[str, DataMetaTypes]],
+        returning: DataSelection = "full",
+    ) -> Data:
+        """Remove some meta keys of a data, leaving its other meta untouched.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_id (str): The data id.
+            meta (Union[List[DataMeta], Dict[str, DataMetaTypes]]): The meta to remove, as DataMeta
+                or a {key: type} map. Values are ignored.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
+
+        Returns:
+            Data: The updated data.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if data_id is None:
+            raise BadParameterError("data_id is required.")
+        if meta is None:
+            raise BadParameterError("meta is required.")
+
+        response = self.request_gql(
+            with_data_selection(Queries.REMOVE_DATA_META, returning),
+            Queries.REMOVE_DATA_META["variables"](
+                dataset_id=dataset_id,
+                data_id=data_id,
+                meta=_meta_keys(meta),
+            )
+        )
+        return Data.model_validate(response)
+
+    @sync_only
+    def upsert_data_meta_many(
+        self,
+        dataset_id: str,
+        meta_by_data_id: Dict[str, Union[List[DataMeta], Dict[str, DataMetaValue]]],
+        max_ops: int = 100,
+        max_workers: int = 4,
+    ) -> Dict[str, BaseSDKError]:
+        """Add or replace some meta keys of many data.
+
+        The upserts are sent as aliased mutations returning only the id, ``max_ops`` per request
+        and ``max_workers`` requests at a time.
+
+        Args:
+            dataset_id (str): The dataset id.
+            meta_by_data_id (Dict[str, Union[List[DataMeta], Dict[str, DataMetaValue]]]): The meta to set per data id.
+            max_ops (int): The maximum number of mutations per request. Defaults to 100.
+            max_workers (int): The number of requests sent concurrently. Defaults to 4.
+
+        Returns:
+            Dict[str, BaseSDKError]: The error of every data id that failed.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if max_ops < 1:
+            raise BadParameterError("max_ops must be at least 1.")
+        mutation = with_data_selection(Queries.UPSERT_DATA_META, "id")
+        return self._send_data_mutations(
+            [
+                (data_id, (mutation, Queries.UPSERT_DATA_META["variables"](
+                    dataset_id=dataset_id, data_id=data_id, meta=_meta_list(meta),
+                )))
+                for data_id, meta in meta_by_data_id.items()
+            ],
+            max_ops,
+            max_workers,
+        )
+
+    @sync_only
+    def remove_data_meta_many(
+        self,
+        dataset_id: str,
+        meta_by_data_id: Dict[str, Union[List[DataMeta], Dict[str, DataMetaTypes]]],
+        max_ops: int = 100,
+        max_workers: int = 4,
+    ) -> Dict[str, BaseSDKError]:
+        """Remove some meta keys of many data. See upsert_data_meta_many.
+
+        Args:
+            dataset_id (str): The dataset id.
+            meta_by_data_id (Dict[str, Union[List[DataMeta], Dict[str, DataMetaTypes]]]): The meta to remove per data id.
+            max_ops (int): The maximum number of mutations per request. Defaults to 100.
+            max_workers (int): The number of requests sent concurrently. Defaults to 4.
+
+        Returns:
+            Dict[str, BaseSDKError]: The error of every data id that failed.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if max_ops < 1:
+            raise BadParameterError("max_ops must be at least 1.")
+        mutation = with_data_selection(Queries.REMOVE_DATA_META, "id")
+        return self._send_data_mutations(
+            [
+                (data_id, (mutation, Queries.REMOVE_DATA_META["variables"](
+                    dataset_id=dataset_id, data_id=data_id, meta=_meta_keys(meta),
+                )))
+                for data_id, meta in meta_by_data_id.items()
+            ],
+            max_ops,
+            max_workers,
+        )
+
+    @sync_only
+    def write_buffer(
+        self,
+        max_targets: int = 100,
+        max_delay: Optional[float] = None,
+        max_ops: int = 100,
+    ) -> WriteBehindBuffer:
+        """Open a buffer that merges the edits of the same data or data slice and sends them later in batches.
+
+        Args:
+            max_targets (int): The number of pending data and data slices that triggers a flush. Defaults to 100.
+            max_delay (Optional[float]): The age in seconds of the oldest pending edit that triggers a flush.
+                Defaults to None (flush on size and on exit only).
+            max_ops (int): The maximum number of mutations per HTTP request. Defaults to 100.
+
+        Returns:
+            WriteBehindBuffer: The buffer, flushed when its context exits.
+        """
+        return WriteBehindBuffer(self, max_targets=max_targets, max_delay=max_delay, max_ops=max_ops)
+
     def update_data(
         self,
         dataset_id: str,
@@ -227,6 +941,7 @@ class DataService(BaseService):
             Optional[List[DataAnnotationStat]],
             UndefinedType,
         ] = Undefined,
+        returning: DataSelection = "full",
     ):
         """Update a data.
 
@@ -235,12 +950,14 @@ class DataService(BaseService):
             data_id (str): The data id.
             key (Union[str, UndefinedType], optional): The key of the data. Defaults to Undefined.
             meta (Union[List[DataMeta], UndefinedType], optional): The meta data. Defaults to Undefined.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
         """
         response = self.request_gql(
-            Queries.UPDATE,
+            with_data_selection(Queries.UPDATE, returning),
             variables=Queries.UPDATE["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -257,6 +974,7 @@ class DataService(BaseService):
         dataset_id: str,
         data_id: str,
         slice_id: str,
+        returning: DataSelection = "full",
     ):
         """Remove a data from a slice.
 
@@ -264,12 +982,14 @@ class DataService(BaseService):
             dataset_id (str): The dataset id.
             data_id (str): The data id.
             slice_id (str): The slice id.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
         """
         response = self.request_gql(
-            Queries.REMOVE_FROM_SLICE,
+            with_data_selection(Queries.REMOVE_FROM_SLICE, returning),
             Queries.REMOVE_FROM_SLICE["variables"](dataset_id=dataset_id, data_id=data_id, slice_id=slice_id)
         )
         data = Data.model_validate(response)
@@ -280,6 +1000,7 @@ class DataService(BaseService):
         dataset_id: str,
         data_id: str,
         slice_id: str,
+        returning: DataSelection = "full",
     ):
         """Add a data to a slice.
 
@@ -287,12 +1008,14 @@ class DataService(BaseService):
             dataset_id (str): The dataset id.
             data_id (str): The data id.
             slice_id (str): The slice id.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
         """
         response = self.request_gql(
-            Queries.ADD_TO_SLICE,
+            with_data_selection(Queries.ADD_TO_SLICE, returning),
             Queries.ADD_TO_SLICE["variables"](dataset_id=dataset_id, data_id=data_id, slice_id=slice_id)
         )
         data = Data.model_validate(response)
@@ -334,6 +1057,7 @@ class DataService(BaseService):
             dict,
             UndefinedType
         ] = Undefined,
+        returning: DataSelection = "full",
     ):
         """Update an annotation.
 
@@ -341,12 +1065,14 @@ class DataService(BaseService):
             dataset_id (str): The dataset id.
             data_id (str): The data id.
             meta (dict): The meta of the annotation.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
         """
         response = self.request_gql(
-            Queries.UPDATE_ANNOTATION,
+            with_data_selection(Queries.UPDATE_ANNOTATION, returning),
             Queries.UPDATE_ANNOTATION["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -361,6 +1087,7 @@ class DataService(BaseService):
         dataset_id: str,
         data_id: str,
         version: AnnotationVersion,
+        returning: DataSelection = "full",
     ):
         """Insert an annotation version.
 
@@ -368,6 +1095,8 @@ class DataService(BaseService):
             dataset_id (str): The dataset id.
             data_id (str): The data id.
             version (AnnotationVersion): The annotation version.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -380,7 +1109,7 @@ class DataService(BaseService):
             raise BadParameterError("version is required.")
         
         response = self.request_gql(
-            Queries.INSERT_ANNOTATION_VERSION,
+            with_data_selection(Queries.INSERT_ANNOTATION_VERSION, returning),
             Queries.INSERT_ANNOTATION_VERSION["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -399,6 +1128,7 @@ class DataService(BaseService):
         version: Union[str, UndefinedType, None] = Undefined,
         meta: Union[dict, UndefinedType, None] = Undefined,
         content_id: Union[str, UndefinedType, None] = Undefined,
+        returning: DataSelection = "full",
     ):
         """Update an annotation version.
 
@@ -409,6 +1139,8 @@ class DataService(BaseService):
             channels (Union[List[str], UndefinedType, None], optional): The channels. Defaults to Undefined.
             version (Union[str, UndefinedType, None], optional): The version. Defaults to Undefined.
             meta (Union[dict, UndefinedType, None], optional): The meta. Defaults to Undefined.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -421,7 +1153,7 @@ class DataService(BaseService):
             raise BadParameterError("version_id is required.")
         
         response = self.request_gql(
-            Queries.UPDATE_ANNOTATION_VERSION,
+            with_data_selection(Queries.UPDATE_ANNOTATION_VERSION, returning),
             Queries.UPDATE_ANNOTATION_VERSION["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -440,6 +1172,7 @@ class DataService(BaseService):
         dataset_id: str,
         data_id: str,
         version_id: str,
+        returning: DataSelection = "full",
     ):
         """Delete an annotation version.
 
@@ -447,12 +1180,14 @@ class DataService(BaseService):
             dataset_id (str): The dataset id.
             data_id (str): The data id.
             version_id (str): The version id.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
         """
         response = self.request_gql(
-            Queries.DELETE_ANNOTATION_VERSION,
+            with_data_selection(Queries.DELETE_ANNOTATION_VERSION, returning),
             Queries.DELETE_ANNOTATION_VERSION["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -468,6 +1203,7 @@ class DataService(BaseService):
         data_id: str,
         slice_id: str,
         meta: dict,
+        returning: DataSelection = "full",
     ):
         """Update a slice annotation.
 
@@ -476,12 +1212,14 @@ class DataService(BaseService):
             data_id (str): The data id.
             slice_id (str): The slice id.
             meta (dict): The meta of the slice annotation.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
         """
         response = self.request_gql(
-            Queries.UPDATE_SLICE_ANNOTATION,
+            with_data_selection(Queries.UPDATE_SLICE_ANNOTATION, returning),
             Queries.UPDATE_SLICE_ANNOTATION["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -498,6 +1236,7 @@ class DataService(BaseService):
         data_id: str,
         slice_id: str,
         version: AnnotationVersion,
+        returning: DataSelection = "full",
     ):
         """Insert a slice annotation version.
 
@@ -506,6 +1245,8 @@ class DataService(BaseService):
             data_id (str): The data id.
             slice_id (str): The slice id.
             version (AnnotationVersion): The annotation version.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -520,7 +1261,7 @@ class DataService(BaseService):
             raise BadParameterError("version is required.")
         
         response = self.request_gql(
-            Queries.INSERT_SLICE_ANNOTATION_VERSION,
+            with_data_selection(Queries.INSERT_SLICE_ANNOTATION_VERSION, returning),
             Queries.INSERT_SLICE_ANNOTATION_VERSION["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -541,6 +1282,7 @@ class DataService(BaseService):
         version: Union[str, UndefinedType, None] = Undefined,
         meta: Union[dict, UndefinedType, None] = Undefined,
         content_id: Union[str, UndefinedType, None] = Undefined,
+        returning: DataSelection = "full",
     ):
         """Update a slice annotation version.
 
@@ -552,6 +1294,8 @@ class DataService(BaseService):
             channels (Union[List[str], UndefinedType, None], optional): The channels. Defaults to Undefined.
             version (Union[str, UndefinedType, None], optional): The version. Defaults to Undefined.
             meta (Union[dict, UndefinedType, None], optional): The meta. Defaults to Undefined.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -566,7 +1310,7 @@ class DataService(BaseService):
             raise BadParameterError("id is required.")
         
         response = self.request_gql(
-            Queries.UPDATE_SLICE_ANNOTATION_VERSION,
+            with_data_selection(Queries.UPDATE_SLICE_ANNOTATION_VERSION, returning),
             Queries.UPDATE_SLICE_ANNOTATION_VERSION["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -587,6 +1331,7 @@ class DataService(BaseService):
         data_id: str,
         slice_id: str,
         id: str,
+        returning: DataSelection = "full",
     ):
         """Delete a slice annotation version.
 
@@ -595,6 +1340,8 @@ class DataService(BaseService):
             data_id (str): The data id.
             slice_id (str): The slice id.
             id (str): The annotation version id.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -609,7 +1356,7 @@ class DataService(BaseService):
             raise BadParameterError("id is required.")
         
         response = self.request_gql(
-            Queries.DELETE_SLICE_ANNOTATION_VERSION,
+            with_data_selection(Queries.DELETE_SLICE_ANNOTATION_VERSION, returning),
             Queries.DELETE_SLICE_ANNOTATION_VERSION["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -626,6 +1373,7 @@ class DataService(BaseService):
         data_id: str,
         slice_id: str,
         status: DataStatus,
+        returning: DataSelection = "full",
     ):
         """Change the status of a data slice.
 
@@ -634,6 +1382,8 @@ class DataService(BaseService):
             data_id (str): The data id.
             slice_id (str): The slice id.
             status (DataStatus): The new status.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -648,7 +1398,7 @@ class DataService(BaseService):
             raise BadParameterError("status is required.")
         
         response = self.request_gql(
-            Queries.CHANGE_DATA_STATUS,
+            with_data_selection(Queries.CHANGE_DATA_STATUS, returning),
             Queries.CHANGE_DATA_STATUS["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -665,6 +1415,7 @@ class DataService(BaseService):
         data_id: str,
         slice_id: str,
         labeler: Optional[str],
+        returning: DataSelection = "full",
     ):
         """Change the labeler of a data slice.
 
@@ -673,6 +1424,8 @@ class DataService(BaseService):
             data_id (str): The data id.
             slice_id (str): The slice id.
             labeler (Optional[str]): The labeler id. None to unassign.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -685,7 +1438,7 @@ class DataService(BaseService):
             raise BadParameterError("slice_id is required.")
         
         response = self.request_gql(
-            Queries.CHANGE_DATA_LABELER,
+            with_data_selection(Queries.CHANGE_DATA_LABELER, returning),
             Queries.CHANGE_DATA_LABELER["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -702,6 +1455,7 @@ class DataService(BaseService):
         data_id: str,
         slice_id: str,
         reviewer: Optional[str],
+        returning: DataSelection = "full",
     ):
         """Change the reviewer of a data slice.
 
@@ -710,6 +1464,8 @@ class DataService(BaseService):
             data_id (str): The data id.
             slice_id (str): The slice id.
             reviewer (Optional[str]): The reviewer id. None to unassign.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -722,7 +1478,7 @@ class DataService(BaseService):
             raise BadParameterError("slice_id is required.")
         
         response = self.request_gql(
-            Queries.CHANGE_DATA_REVIEWER,
+            with_data_selection(Queries.CHANGE_DATA_REVIEWER, returning),
             Queries.CHANGE_DATA_REVIEWER["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -746,6 +1502,7 @@ class DataService(BaseService):
             Optional[List[DataAnnotationStat]],
             UndefinedType
         ] = Undefined,
+        returning: DataSelection = "full",
     ):
         """Update the metadata of a data slice.
 
@@ -754,6 +1511,8 @@ class DataService(BaseService):
             data_id (str): The data id.
             slice_id (str): The slice id.
             meta (dict): The meta of the data slice.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -766,7 +1525,7 @@ class DataService(BaseService):
             raise BadParameterError("slice_id is required.")
         
         response = self.request_gql(
-            Queries.UPDATE_DATA_SLICE,
+            with_data_selection(Queries.UPDATE_DATA_SLICE, returning),
             Queries.UPDATE_DATA_SLICE["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -782,13 +1541,16 @@ class DataService(BaseService):
         self,
         dataset_id: str,
         data_id: str,
-        frames: Union[List[Frame], UndefinedType, None] = Undefined,  
+        frames: Union[List[Frame], FrameColumns, UndefinedType, None] = Undefined,
+        returning: DataSelection = "full",
     ):
         """Update frames of selected data.
         Args:
             dataset_id (str): dataset id which the data belongs to
             data_id (str): data id to be updated
-            frames (list[Frame]): list of frames to be updated  
+            frames (Union[List[Frame], FrameColumns]): list of frames to be updated
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
             
         Returns:
             Data: The updated data.
@@ -797,9 +1559,11 @@ class DataService(BaseService):
             raise BadParameterError("dataset_id is required.")
         if data_id is None:
             raise BadParameterError("data_id is required.")
+        if isinstance(frames, FrameColumns):
+            frames = frames.to_frames()
 
         response = self.request_gql(
-            Queries.UPDATE_FRAMES,
+            with_data_selection(Queries.UPDATE_FRAMES, returning),
             Queries.UPDATE_FRAMES["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -809,12 +1573,163 @@ class DataService(BaseService):
         data = Data.model_validate(response)
         return data
 
+    def get_frame_columns(
+        self,
+        dataset_id: str,
+        data_id: str,
+    ) -> FrameColumns:
+        """Get the frames of a data as compact columns, without building a Frame model per frame.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_id (str): The data id.
+
+        Returns:
+            FrameColumns: The frames of the data.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if data_id is None:
+            raise BadParameterError("data_id is required.")
+
+        response = self.request_gql(
+            with_data_selection(Queries.GET, "frames"),
+            Queries.GET["variables"](dataset_id=dataset_id, data_id=data_id)
+        )
+        return FrameColumns.from_response((response or {}).get("frames") or [])
+
+    def patch_frames(
+        self,
+        dataset_id: str,
+        data_id: str,
+        patches: List[Union[FramePatch, dict]],
+        frames: Optional[List[Frame]] = None,
+    ) -> int:
+        """Change the meta, capture time or location of the frames in index ranges.
+
+        The server replaces the whole frame list on every update, so the patches are applied
+        to the current frames locally. The frames are read with the "frames" projection unless
+        they are given (e.g. from a page just listed), and are sent only if a frame changed.
+        The response is only the id, so the frames are not echoed back.
+
+        Args:
+            dataset_id (str): The dataset id.
+            data_id (str): The data id.
+            patches (List[Union[FramePatch, dict]]): The changes, applied in order.
+            frames (Optional[List[Frame]]): The current frames of the data, if already known.
+
+        Returns:
+            int: The number of frames changed.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if data_id is None:
+            raise BadParameterError("data_id is required.")
+        patches = [FramePatch.model_validate(patch) for patch in patches]
+        if frames is None:
+            frames = self.get_data(dataset_id=dataset_id, data_id=data_id, fields="frames").frames or []
+        patched, changed = apply_frame_patches(frames, patches)
+        if changed:
+            self.update_frames(dataset_id=dataset_id, data_id=data_id, frames=patched, returning="id")
+        return changed
+
+    @sync_only
+    def patch_frames_many(
+        self,
+        dataset_id: str,
+        patches_by_data_id: Dict[str, List[Union[FramePatch, dict]]],
+        max_frames_per_request: int = 20000,
+        chunk_size: int = 20,
+        max_workers: int = 4,
+        on_progress: Optional[Callable[[int, int], Any]] = None,
+    ) -> Dict[str, BaseSDKError]:
+        """Patch the frames of many data, in bounded batches.
+
+        The data are processed ``chunk_size`` at a time: their frames are read with aliased
+        lookups, patched locally, and the changed frame lists are sent as aliased updateFrames
+        mutations packing up to ``max_frames_per_request`` frames per request (a longer data is
+        sent alone). Only one chunk of frame lists is held in memory at a time.
+
+        Args:
+            dataset_id (str): The dataset id.
+            patches_by_data_id (Dict[str, List[Union[FramePatch, dict]]]): The patches of every data.
+            max_frames_per_request (int): The number of frames that fills a request. Defaults to 20000.
+            chunk_size (int): The number of data read and patched together. Defaults to 20.
+            max_workers (int): The number of requests sent concurrently. Defaults to 4.
+            on_progress (Optional[Callable[[int, int], Any]]): Called after every chunk with the
+                number of data processed and the number of frames changed so far.
+
+        Returns:
+            Dict[str, BaseSDKError]: The error of every data id that failed.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if max_frames_per_request < 1:
+            raise BadParameterError("max_frames_per_request must be at least 1.")
+        if chunk_size < 1:
+            raise BadParameterError("chunk_size must be at least 1.")
+        if max_workers < 1:
+            raise BadParameterError("max_workers must be at least 1.")
+        patches_by_data_id = {
+            data_id: [FramePatch.model_validate(patch) for patch in patches]
+            for data_id, patches in patches_by_data_id.items()
+        }
+        query = with_data_selection(Queries.GET, "frames")
+        mutation = with_data_selection(Queries.UPDATE_FRAMES, "id")
+        data_ids = list(patches_by_data_id)
+        failed: Dict[str, BaseSDKError] = {}
+        processed = 0
+        frames_changed = 0
+
+        for start in range(0, len(data_ids), chunk_size):
+            chunk = data_ids[start:start + chunk_size]
+            lookups = [Queries.GET["variables"](dataset_id=dataset_id, data_id=data_id) for data_id in chunk]
+            requests: List[List[Tuple[str, Tuple[Any, dict]]]] = [[]]
+            request_frames = 0
+            try:
+                outcomes = self.request_gql_batch([(query, variables) for variables in lookups])
+            except BaseSDKError as e:
+                # The chunks already written stay written; this chunk fails and the next one is tried.
+                outcomes = [(None, e)] * len(chunk)
+            for data_id, (response, error) in zip(chunk, outcomes):
+                if error is not None or response is None:
+                    failed[data_id] = error or NotFoundError(f"Data '{data_id}' was not found.")
+                    continue
+                frames = Data.model_validate(response).frames or []
+                patched, changed = apply_frame_patches(frames, patches_by_data_id[data_id])
+                if not changed:
+                    continue
+                frames_changed += changed
+                if requests[-1] and request_frames + len(patched) > max_frames_per_request:
+                    requests.append([])
+                    request_frames = 0
+                request_frames += len(patched)
+                requests[-1].append((data_id, (mutation, Queries.UPDATE_FRAMES["variables"](
+                    dataset_id=dataset_id, data_id=data_id, frames=patched,
+                ))))
+            # One request per group: the frame budget, not the operation count, bounds it.
+            requests = [request for request in requests if request]
+            if len(requests) <= 1 or max_workers <= 1:
+                results = [self._send_data_mutations(request, len(request), 1) for request in requests]
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spb-onprem-frames") as executor:
+                    results = list(executor.map(
+                        lambda request: self._send_data_mutations(request, len(request), 1), requests
+                    ))
+            for result in results:
+                failed.update(result)
+            processed += len(chunk)
+            if on_progress is not None:
+                on_progress(processed, frames_changed)
+        return failed
+
     def update_tags(
         self,
         dataset_id: str,
         slice_id: str,
         data_id: str,
         tags: Union[List[str], UndefinedType, None] = Undefined,
+        returning: DataSelection = "full",
     ):
         """Update tags of selected data slice.
         Args:
@@ -822,6 +1737,8 @@ class DataService(BaseService):
             slice_id (str): slice id which the data belongs to
             data_id (str): data id to be updated
             tags (list[str]): list of tags to be updated  
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
             
         Returns:
             Data: The updated data.
@@ -834,7 +1751,7 @@ class DataService(BaseService):
             raise BadParameterError("data_id is required.")
 
         response = self.request_gql(
-            Queries.UPDATE_TAGS,
+            with_data_selection(Queries.UPDATE_TAGS, returning),
             Queries.UPDATE_TAGS["variables"](
                 dataset_id=dataset_id,
                 slice_id=slice_id,
@@ -850,6 +1767,7 @@ class DataService(BaseService):
         dataset_id: str,
         data_id: str,
         scene: Scene,
+        returning: DataSelection = "full",
     ):
         """Update scene of selected data.
 
@@ -857,6 +1775,8 @@ class DataService(BaseService):
             dataset_id (str): The dataset id which the data belongs to.
             data_id (str): The data id to be updated.
             scene (Scene): The scene to be updated. Must include scene.id and scene.type.
+            returning (DataSelection, optional): The fields of the returned data: "id", "minimal", "full",
+                or a set of Data field names. Defaults to "full".
 
         Returns:
             Data: The updated data.
@@ -872,7 +1792,7 @@ class DataService(BaseService):
             raise BadParameterError("scene is required.")
 
         response = self.request_gql(
-            Queries.UPDATE_SCENE,
+            with_data_selection(Queries.UPDATE_SCENE, returning),
             Queries.UPDATE_SCENE["variables"](
                 dataset_id=dataset_id,
                 data_id=data_id,
@@ -0,0 +1,308 @@
+"""
+This module defines the WriteBehindBuffer class, which coalesces per-data mutations before they are sent.
+
+Classes:
+    WriteBehindBuffer: Merges pending edits of the same data or data slice and sends them in batches.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from spb_onprem.base_types import Undefined, UndefinedType
+from spb_onprem.exceptions import BadParameterError
+from .entities import DataAnnotationStat, DataMeta
+from .queries import Queries, with_data_selection
+
+# (dataset_id, data_id, slice_id); slice_id is None for the edits of the data itself.
+Target = Tuple[str, str, Optional[str]]
+
+# The mutations a target can need, keyed by the fields they send, in the order they are sent.
+_DATA_FIELDS = ("key", "meta", "annotation_stats")
+_DATA_SLICE_FIELDS = ("meta", "annotation_stats")
+_TAG_FIELDS = ("tags",)
+
+
+class WriteBehindBuffer():
+    """Coalesce the edits of data and data slices, and send them later in batches.
+
+    Every edit is merged into the pending edits of its target, ``(dataset_id, data_id,
+    slice_id)``, with the later value of a field replacing the earlier one, since the
+    server replaces these fields as a whole. The pending targets are sent as aliased
+    mutations returning only the id, ``max_ops`` per request::
+
+        with data_service.write_buffer(max_targets=500, max_delay=2.0) as buffer:
+            for data_id in data_ids:
+                buffer.update_data(dataset_id, data_id, meta=meta_of(data_id))
+                buffer.update_tags(dataset_id, slice_id, data_id, tags=["night"])
+                buffer.update_data_slice(dataset_id, data_id, slice_id, meta={"checked": True})
+        print(buffer.stats())
+
+    A data target is sent as one updateData mutation. A data slice target is sent as one
+    updateDataSlice mutation for its meta and annotation stats and one updateDataTags
+    mutation for its tags, as the server has no mutation that sets both.
+
+    The buffer is flushed when it holds ``max_targets`` targets, when its oldest edit is
+    ``max_delay`` seconds old (checked by a background thread), and when the context exits.
+    Errors are reported by flush() and collected in ``failed``, with the fields that were not
+    sent kept in ``failed_fields``; retry_failed() queues them again, under any newer edit of
+    the same fields, and flushes. The buffer is thread-safe.
+
+    Args:
+        service (DataService): The service the mutations are sent with.
+        max_targets (int): The number of pending targets that triggers a flush.
+        max_delay (Optional[float]): The age in seconds of the oldest edit that triggers a flush.
+            None flushes only on size and on exit.
+        max_ops (int): The maximum number of mutations per HTTP request.
+        clock (Callable[[], float]): The monotonic clock. Defaults to time.monotonic.
+    """
+
+    def __init__(
+        self,
+        service,
+        max_targets: int = 100,
+        max_delay: Optional[float] = None,
+        max_ops: int = 100,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_targets < 1:
+            raise BadParameterError("max_targets must be at least 1.")
+        if max_ops < 1:
+            raise BadParameterError("max_ops must be at least 1.")
+        if max_delay is not None and max_delay <= 0:
+            raise BadParameterError("max_delay must be positive.")
+        self._service = service
+        self.max_targets = max_targets
+        self.max_delay = max_delay
+        self.max_ops = max_ops
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[Target, Dict[str, Any]] = {}
+        self._oldest: Optional[float] = None
+        self._closed = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        self.failed: Dict[Target, Exception] = {}
+        self.failed_fields: Dict[Target, Dict[str, Any]] = {}
+        self._edits = 0
+        self._edits_sent = 0
+        self._targets_sent = 0
+        self._mutations_sent = 0
+        self._requests_sent = 0
+        self._flushes = 0
+        self._flush_seconds = 0.0
+        self._last_flush_seconds = 0.0
+        self._max_edit_age_seconds = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """The number of targets with edits that have not been sent."""
+        with self._lock:
+            return len(self._pending)
+
+    def update_data(
+        self,
+        dataset_id: str,
+        data_id: str,
+        key: Union[str, UndefinedType] = Undefined,
+        meta: Union[List[DataMeta], UndefinedType] = Undefined,
+        annotation_stats: Union[Optional[List[DataAnnotationStat]], UndefinedType] = Undefined,
+    ):
+        """Buffer an edit of a data. See DataService.update_data."""
+        self._add(dataset_id, data_id, None, key=key, meta=meta, annotation_stats=annotation_stats)
+
+    def update_data_slice(
+        self,
+        dataset_id: str,
+        data_id: str,
+        slice_id: str,
+        meta: Union[Optional[dict], UndefinedType] = Undefined,
+        annotation_stats: Union[Optional[List[DataAnnotationStat]], UndefinedType] = Undefined,
+    ):
+        """Buffer an edit of the meta or annotation stats of a data slice. See DataService.update_data_slice."""
+        if slice_id is None:
+            raise BadParameterError("slice_id is required.")
+        self._add(dataset_id, data_id, slice_id, meta=meta, annotation_stats=annotation_stats)
+
+    def update_tags(
+        self,
+        dataset_id: str,
+        slice_id: str,
+        data_id: str,
+        tags: Union[List[str], UndefinedType, None] = Undefined,
+    ):
+        """Buffer an edit of the tags of a data slice. See DataService.update_tags."""
+        if slice_id is None:
+            raise BadParameterError("slice_id is required.")
+        self._add(dataset_id, data_id, slice_id, tags=tags)
+
+    def _add(self, dataset_id: str, data_id: str, slice_id: Optional[str], **fields):
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if data_id is None:
+            raise BadParameterError("data_id is required.")
+        fields = {name: value for name, value in fields.items() if value is not Undefined}
+        if not fields:
+            return
+        with self._lock:
+            if self._closed.is_set():
+                raise BadParameterError("The buffer is closed.")
+            self._pending.setdefault((dataset_id, data_id, slice_id), {}).update(fields)
+            self._edits += 1
+            if self._oldest is None:
+                self._oldest = self._clock()
+            full = len(self._pending) >= self.max_targets
+            if self.max_delay is not None and self._timer is None:
+                self._timer = threading.Thread(
+                    target=self._flush_when_due, name="spb-onprem-write-buffer", daemon=True
+                )
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def _flush_when_due(self):
+        while not self._closed.wait(self.max_delay / 4):
+            with self._lock:
+                due = self._oldest is not None and self._clock() - self._oldest >= self.max_delay
+            if due:
+                self.flush()
+
+    def _operations(self, target: Target, fields: Dict[str, Any]) -> List[Tuple[Any, Dict[str, Any]]]:
+        dataset_id, data_id, slice_id = target
+        operations = []
+        if slice_id is None:
+            operations.append((
+                with_data_selection(Queries.UPDATE, "id"),
+                Queries.UPDATE["variables"](dataset_id=dataset_id, data_id=data_id, **{
+                    name: fields.get(name, Undefined) for name in _DATA_FIELDS
+                }),
+            ))
+            return operations
+        if any(name in fields for name in _DATA_SLICE_FIELDS):
+            operations.append((
+                with_data_selection(Queries.UPDATE_DATA_SLICE, "id"),
+                Queries.UPDATE_DATA_SLICE["variables"](dataset_id=dataset_id, data_id=data_id, slice_id=slice_id, **{
+                    name: fields[name] for name in _DATA_SLICE_FIELDS if name in fields
+                }),
+            ))
+        if "tags" in fields:
+            operations.append((
+                with_data_selection(Queries.UPDATE_TAGS, "id"),
+                Queries.UPDATE_TAGS["variables"](
+                    dataset_id=dataset_id, slice_id=slice_id, data_id=data_id, tags=fields["tags"]
+                ),
+            ))
+        return operations
+
+    def flush(self) -> Dict[Target, Exception]:
+        """Send every pending edit.
+
+        Returns:
+            Dict[Target, Exception]: The error of every target of this flush that failed.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                oldest, self._oldest = self._oldest, None
+                edits, self._edits = self._edits, 0
+            if not pending:
+                return {}
+            started = self._clock()
+            failed: Dict[Target, Exception] = {}
+            operations = []
+            for target, fields in pending.items():
+                try:
+                    operations.extend((target, operation) for operation in self._operations(target, fields))
+                except Exception as e:
+                    failed[target] = e
+
+            requests = 0
+            for start in range(0, len(operations), self.max_ops):
+                chunk = operations[start:start + self.max_ops]
+                try:
+                    outcomes = self._service.request_gql_batch([operation for _, operation in chunk])
+                except Exception as e:
+                    # Whatever goes wrong, the edits of the chunk are reported, never dropped silently.
+                    outcomes = [(None, e)] * len(chunk)
+                requests += 1
+                for (target, _), (_, error) in zip(chunk, outcomes):
+                    if error is not None:
+                        failed.setdefault(target, error)
+
+            elapsed = self._clock() - started
+            with self._lock:
+                for target, fields in pending.items():
+                    if target in failed:
+                        self.failed[target] = failed[target]
+                        self.failed_fields[target] = {**self.failed_fields.get(target, {}), **fields}
+                    elif target in self.failed_fields:
+                        # The fields just sent supersede the ones that failed earlier.
+                        unsent = {
+                            name: value for name, value in self.failed_fields[target].items() if name not in fields
+                        }
+                        if unsent:
+                            self.failed_fields[target] = unsent
+                        else:
+                            del self.failed_fields[target]
+                            del self.failed[target]
+                self._flushes += 1
+                self._edits_sent += edits
+                self._targets_sent += len(pending)
+                self._mutations_sent += len(operations)
+                self._requests_sent += requests
+                self._flush_seconds += elapsed
+                self._last_flush_seconds = elapsed
+                self._max_edit_age_seconds = max(self._max_edit_age_seconds, started - oldest + elapsed)
+            return failed
+
+    def retry_failed(self) -> Dict[Target, Exception]:
+        """Queue the fields of the failed targets again and send every pending edit.
+
+        A field edited again since it failed keeps its newer value. It can be called after
+        the buffer is closed.
+
+        Returns:
+            Dict[Target, Exception]: The error of every target of this flush that failed.
+        """
+        with self._lock:
+            failed_fields, self.failed_fields = self.failed_fields, {}
+            self.failed = {}
+            for target, fields in failed_fields.items():
+                self._pending[target] = {**fields, **self._pending.get(target, {})}
+                self._edits += 1
+            if failed_fields and self._oldest is None:
+                self._oldest = self._clock()
+        return self.flush()
+
+    def close(self):
+        """Flush the pending edits and stop the background flushes."""
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        self.flush()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Get the counters of the buffer.
+
+        ``merge_ratio`` is the number of edits sent per mutation sent. ``max_edit_age_seconds``
+        is the longest time an edit waited in the buffer before its flush completed.
+        """
+        with self._lock:
+            return {
+                "pending_targets": len(self._pending),
+                "pending_edits": self._edits,
+                "edits_sent": self._edits_sent,
+                "targets_sent": self._targets_sent,
+                "mutations_sent": self._mutations_sent,
+                "requests_sent": self._requests_sent,
+                "flushes": self._flushes,
+                "merge_ratio": self._edits_sent / self._mutations_sent if self._mutations_sent else 0.0,
+                "last_flush_seconds": self._last_flush_seconds,
+                "avg_flush_seconds": self._flush_seconds / self._flushes if self._flushes else 0.0,
+                "max_edit_age_seconds": self._max_edit_age_seconds,
+            }
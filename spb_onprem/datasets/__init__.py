@@ -1,6 +1,8 @@
 from .service import DatasetService
+from .async_service import AsyncDatasetService
 
 
 __all__ = (
     "DatasetService",
+    "AsyncDatasetService",
 )
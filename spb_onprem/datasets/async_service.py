@@ -0,0 +1,15 @@
+"""
+This module defines the AsyncDatasetService class, the asyncio variant of DatasetService.
+
+Classes:
+    AsyncDatasetService: An asyncio service class that provides every DatasetService method as a coroutine.
+"""
+from spb_onprem.async_base_service import AsyncBaseService
+from .service import DatasetService
+
+
+class AsyncDatasetService(AsyncBaseService, service_class=DatasetService):
+    """
+    Asyncio service class for handling dataset-related operations.
+    Every public method of DatasetService is available as a coroutine with the same arguments.
+    """
@@ -1,4 +1,5 @@
 from .service import DiagnosisService
+from .async_service import AsyncDiagnosisService
 from .entities import (
     Diagnosis,
     DiagnosisReportItem,
@@ -20,6 +21,7 @@ DiagnosesFilterOptions = DiagnosisFilterOptions
 
 __all__ = (
     "DiagnosisService",
+    "AsyncDiagnosisService",
     "Diagnosis",
     "DiagnosisReportItem",
     "DiagnosisReportItemType",
@@ -0,0 +1,15 @@
+"""
+This module defines the AsyncDiagnosisService class, the asyncio variant of DiagnosisService.
+
+Classes:
+    AsyncDiagnosisService: An asyncio service class that provides every DiagnosisService method as a coroutine.
+"""
+from spb_onprem.async_base_service import AsyncBaseService
+from .service import DiagnosisService
+
+
+class AsyncDiagnosisService(AsyncBaseService, service_class=DiagnosisService):
+    """
+    Asyncio service class for handling diagnosis-related operations.
+    Every public method of DiagnosisService is available as a coroutine with the same arguments.
+    """
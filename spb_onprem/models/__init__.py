@@ -1,8 +1,10 @@
 from .service import ModelService
+from .async_service import AsyncModelService
 from .entities import Model, ModelPageInfo
 
 __all__ = (
     "ModelService",
+    "AsyncModelService",
     "Model",
     "ModelPageInfo",
 )
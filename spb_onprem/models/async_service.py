@@ -0,0 +1,15 @@
+"""
+This module defines the AsyncModelService class, the asyncio variant of ModelService.
+
+Classes:
+    AsyncModelService: An asyncio service class that provides every ModelService method as a coroutine.
+"""
+from spb_onprem.async_base_service import AsyncBaseService
+from .service import ModelService
+
+
+class AsyncModelService(AsyncBaseService, service_class=ModelService):
+    """
+    Asyncio service class for handling model-related operations.
+    Every public method of ModelService is available as a coroutine with the same arguments.
+    """
@@ -1,4 +1,5 @@
 from .service import ReportService
+from .async_service import AsyncReportService
 from .entities import (
     AnalyticsReport,
     AnalyticsReportStatus,
@@ -15,6 +16,7 @@ from .params import (
 
 __all__ = (
     "ReportService",
+    "AsyncReportService",
     "AnalyticsReport",
     "AnalyticsReportStatus",
     "AnalyticsReportItem",
@@ -0,0 +1,15 @@
+"""
+This module defines the AsyncReportService class, the asyncio variant of ReportService.
+
+Classes:
+    AsyncReportService: An asyncio service class that provides every ReportService method as a coroutine.
+"""
+from spb_onprem.async_base_service import AsyncBaseService
+from .service import ReportService
+
+
+class AsyncReportService(AsyncBaseService, service_class=ReportService):
+    """
+    Asyncio service class for handling report-related operations.
+    Every public method of ReportService is available as a coroutine with the same arguments.
+    """
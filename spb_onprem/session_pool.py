@@ -0,0 +1,215 @@
+"""
+This module defines the SessionPool class, the pooled HTTP transport shared by all services.
+
+Classes:
+    SessionPool: A thread-safe registry of long-lived, keep-alive sessions, one per host.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from spb_onprem.base_types import Undefined, UndefinedType
+
+
+class SessionPool():
+    """Thread-safe registry of long-lived ``requests.Session`` objects, one per host.
+
+    Sessions are kept open between calls so that TCP/TLS connections are reused
+    (keep-alive). A session that has not been used for ``idle_timeout`` seconds is
+    closed and replaced on the next call, because the server has most likely dropped
+    its connections by then. A session is never evicted while a request checked out
+    with ``session()`` runs or while one of its connections is checked out (e.g. by a
+    streamed download), and its idle time starts when the request ends.
+
+    Args:
+        pool_connections (int): The number of urllib3 connection pools to cache per session.
+        pool_maxsize (int): The maximum number of connections kept per connection pool.
+        idle_timeout (Optional[float]): Seconds of inactivity after which a host session is evicted.
+            None disables idle eviction.
+        max_retries (Callable[[], Any]): A factory for the retry policy mounted on every adapter.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        idle_timeout: Optional[float] = 300.0,
+        max_retries: Optional[Callable[[], object]] = None,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self._max_retries = max_retries
+        self._lock = threading.RLock()
+        self._sessions: Dict[Tuple[str, str], requests.Session] = {}
+        self._last_used: Dict[Tuple[str, str], float] = {}
+        self._requests: Dict[Tuple[str, str], int] = {}
+        self._in_flight: Dict[Tuple[str, str], int] = {}
+        self._sessions_created = 0
+        self._sessions_evicted = 0
+
+    @staticmethod
+    def _host_key(url: str) -> Tuple[str, str]:
+        parts = urlsplit(url)
+        return (parts.scheme or "http", parts.netloc)
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=self._max_retries() if self._max_retries else 0,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        self._sessions_created += 1
+        return session
+
+    @staticmethod
+    def _connection_pools(session: requests.Session, host_key: Tuple[str, str]) -> list:
+        adapter = session.get_adapter(f"{host_key[0]}://{host_key[1]}")
+        pools = adapter.poolmanager.pools
+        return [pool for pool in (pools.get(pool_key) for pool_key in list(pools.keys())) if pool is not None]
+
+    def _busy(self, host_key: Tuple[str, str]) -> bool:
+        if self._in_flight.get(host_key, 0) > 0:
+            return True
+        # A connection taken out of its urllib3 queue is in use, e.g. by a streamed response.
+        return any(
+            pool.pool is not None and pool.pool.qsize() < pool.pool.maxsize
+            for pool in self._connection_pools(self._sessions[host_key], host_key)
+        )
+
+    def _evict(self, host_key: Tuple[str, str]):
+        session = self._sessions.pop(host_key, None)
+        self._last_used.pop(host_key, None)
+        self._in_flight.pop(host_key, None)
+        if session is not None:
+            session.close()
+            self._sessions_evicted += 1
+
+    def get_session(self, url: str) -> requests.Session:
+        """Get the long-lived session for the host of the given url.
+
+        Prefer ``session()``, which also keeps the session from being evicted until the request ends.
+
+        Args:
+            url (str): Any url on the target host.
+
+        Returns:
+            requests.Session: The pooled session for the host.
+        """
+        host_key = self._host_key(url)
+        now = time.monotonic()
+        with self._lock:
+            self.evict_idle(now=now)
+            session = self._sessions.get(host_key)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host_key] = session
+            self._last_used[host_key] = now
+            self._requests[host_key] = self._requests.get(host_key, 0) + 1
+            return session
+
+    @contextmanager
+    def session(self, url: str) -> Iterator[requests.Session]:
+        """Check out the session of the host of the given url for one request.
+
+        Args:
+            url (str): Any url on the target host.
+
+        Yields:
+            requests.Session: The pooled session for the host. It is not evicted until the block exits.
+        """
+        host_key = self._host_key(url)
+        with self._lock:
+            session = self.get_session(url)
+            self._in_flight[host_key] = self._in_flight.get(host_key, 0) + 1
+        try:
+            yield session
+        finally:
+            with self._lock:
+                if self._sessions.get(host_key) is session:
+                    self._in_flight[host_key] -= 1
+                    self._last_used[host_key] = time.monotonic()
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Close every host session that has been idle for longer than ``idle_timeout`` and has no request in flight.
+
+        Returns:
+            int: The number of evicted sessions.
+        """
+        if self.idle_timeout is None:
+            return 0
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [
+                host_key
+                for host_key, last_used in self._last_used.items()
+                if now - last_used > self.idle_timeout and not self._busy(host_key)
+            ]
+            for host_key in expired:
+                self._evict(host_key)
+            return len(expired)
+
+    def configure(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        idle_timeout: Union[Optional[float], UndefinedType] = Undefined,
+    ):
+        """Change the pool settings. Open sessions are closed and rebuilt lazily with the new settings.
+
+        Args:
+            pool_connections (Optional[int]): The number of connection pools to cache per session.
+            pool_maxsize (Optional[int]): The maximum number of connections kept per connection pool.
+            idle_timeout (Union[Optional[float], UndefinedType]): Seconds of inactivity after which a host
+                session is evicted. None disables idle eviction; leave it undefined to keep the current value.
+        """
+        with self._lock:
+            if pool_connections is not None:
+                self.pool_connections = pool_connections
+            if pool_maxsize is not None:
+                self.pool_maxsize = pool_maxsize
+            if idle_timeout is not Undefined:
+                self.idle_timeout = idle_timeout
+            self.close()
+
+    def close(self):
+        """Close every pooled session."""
+        with self._lock:
+            for host_key in list(self._sessions):
+                self._evict(host_key)
+
+    def stats(self) -> dict:
+        """Get the pool statistics.
+
+        Returns:
+            dict: The pool settings, lifetime counters and per-host usage,
+                including the urllib3 connection counts of each host session.
+        """
+        now = time.monotonic()
+        with self._lock:
+            hosts = {}
+            for host_key, session in self._sessions.items():
+                scheme, netloc = host_key
+                connections = sum(pool.num_connections for pool in self._connection_pools(session, host_key))
+                hosts[f"{scheme}://{netloc}"] = {
+                    "requests": self._requests.get(host_key, 0),
+                    "in_flight": self._in_flight.get(host_key, 0),
+                    "idle_seconds": now - self._last_used[host_key],
+                    "connections_opened": connections,
+                }
+            return {
+                "pool_connections": self.pool_connections,
+                "pool_maxsize": self.pool_maxsize,
+                "idle_timeout": self.idle_timeout,
+                "sessions_created": self._sessions_created,
+                "sessions_evicted": self._sessions_evicted,
+                "hosts": hosts,
+            }
@@ -1,6 +1,11 @@
 from .service import SliceService
+from .async_service import AsyncSliceService
+from .assignment import Assignee, SliceAssignmentReport
 
 
 __all__ = (
     "SliceService",
-)
\ No newline at end of file
+    "AsyncSliceService",
+    "Assignee",
+    "SliceAssignmentReport",
+)
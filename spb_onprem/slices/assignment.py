@@ -0,0 +1,109 @@
+"""
+This module defines the load-balanced assignment of labelers and reviewers used by SliceService.assign_data.
+
+Classes:
+    Assignee: A labeler or reviewer with a weight and an optional capacity.
+    SliceAssignmentReport: The outcome of a bulk assignment.
+
+Functions:
+    validate_assignees: Check a pool of users.
+    plan_assignment: Assign data to a pool of users in proportion to their weights.
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional
+
+from spb_onprem.base_model import CustomBaseModel, Field
+from spb_onprem.exceptions import BadParameterError
+
+
+class Assignee(CustomBaseModel):
+    """A labeler or reviewer of a bulk assignment."""
+    user: str = Field(..., description="The user id")
+    weight: float = Field(1.0, description="The share of the data relative to the other assignees")
+    capacity: Optional[int] = Field(
+        None, description="The maximum number of data of the user in the slice, including the data already assigned"
+    )
+
+
+class SliceAssignmentReport(CustomBaseModel):
+    """The outcome of assigning many data of a slice to a pool of users."""
+    slice_id: str = Field(..., description="The slice id")
+    role: str = Field(..., description="The assigned role: labeler or reviewer")
+    requested: int = Field(0, description="The number of data selected")
+    assigned: Dict[str, int] = Field(default_factory=dict, description="The number of data assigned to every user")
+    unassigned: List[str] = Field(default_factory=list, description="The data left over once every capacity was reached")
+    failed: Dict[str, str] = Field(default_factory=dict, description="The error of every data id that failed")
+    elapsed_seconds: float = Field(0.0, description="The duration of the assignment")
+
+    @property
+    def changed(self) -> int:
+        return sum(self.assigned.values())
+
+    @property
+    def items_per_second(self) -> float:
+        return self.changed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def validate_assignees(assignees: List[Assignee]):
+    """Check a pool of users.
+
+    Raises:
+        BadParameterError: The pool is empty, lists a user twice, or has a weight that is not positive.
+    """
+    if not assignees:
+        raise BadParameterError("assignees must not be empty.")
+    if len({assignee.user for assignee in assignees}) != len(assignees):
+        raise BadParameterError("assignees must not list a user twice.")
+    if any(assignee.weight <= 0 for assignee in assignees):
+        raise BadParameterError("The weight of every assignee must be positive.")
+
+
+def plan_assignment(
+    data_ids: Iterable[str],
+    assignees: List[Assignee],
+    current_load: Optional[Dict[str, int]] = None,
+) -> Dict[str, Optional[str]]:
+    """Assign data to a pool of users in proportion to their weights.
+
+    Every data goes to the user whose load after taking it, divided by their weight, is the
+    lowest (ties go to the user listed first), so the final loads are as close to the weights
+    as whole data allow. ``current_load`` counts the data users already have; a user at
+    capacity takes no more data.
+
+    Args:
+        data_ids (Iterable[str]): The data to assign.
+        assignees (List[Assignee]): The pool of users.
+        current_load (Optional[Dict[str, int]]): The number of data every user already has.
+
+    Raises:
+        BadParameterError: The pool is empty, lists a user twice, or has a weight that is not positive.
+
+    Returns:
+        Dict[str, Optional[str]]: The user of every data, in the order of data_ids; None for the
+            data left over once every capacity was reached.
+    """
+    validate_assignees(assignees)
+    current_load = current_load or {}
+    loads = [current_load.get(assignee.user, 0) for assignee in assignees]
+
+    def has_room(index: int) -> bool:
+        capacity = assignees[index].capacity
+        return capacity is None or loads[index] < capacity
+
+    heap = [
+        ((loads[index] + 1) / assignee.weight, index)
+        for index, assignee in enumerate(assignees)
+        if has_room(index)
+    ]
+    heapq.heapify(heap)
+    plan = {}
+    for data_id in data_ids:
+        if not heap:
+            plan[data_id] = None
+            continue
+        _, index = heapq.heappop(heap)
+        plan[data_id] = assignees[index].user
+        loads[index] += 1
+        if has_room(index):
+            heapq.heappush(heap, ((loads[index] + 1) / assignees[index].weight, index))
+    return plan
@@ -0,0 +1,15 @@
+"""
+This module defines the AsyncSliceService class, the asyncio variant of SliceService.
+
+Classes:
+    AsyncSliceService: An asyncio service class that provides every SliceService method as a coroutine.
+"""
+from spb_onprem.async_base_service import AsyncBaseService
+from .service import SliceService
+
+
+class AsyncSliceService(AsyncBaseService, service_class=SliceService):
+    """
+    Asyncio service class for handling slice-related operations.
+    Every public method of SliceService is available as a coroutine with the same arguments.
+    """
@@ -1,5 +1,7 @@
 from .slice import Slice
+from .slice_membership_report import SliceMembershipReport
 
 __all__ = (
     "Slice",
-)
\ No newline at end of file
+    "SliceMembershipReport",
+)
@@ -0,0 +1,17 @@
+from typing import Dict
+
+from spb_onprem.base_model import CustomBaseModel, Field
+
+
+class SliceMembershipReport(CustomBaseModel):
+    """The outcome of adding many data to a slice, or removing them from it."""
+    slice_id: str = Field(..., description="The slice id")
+    requested: int = Field(0, description="The number of data ids processed")
+    changed: int = Field(0, description="The number of data added or removed")
+    skipped: int = Field(0, description="The number of data already in the desired state")
+    failed: Dict[str, str] = Field(default_factory=dict, description="The error of every data id that failed")
+    elapsed_seconds: float = Field(0.0, description="The duration of the operation")
+
+    @property
+    def items_per_second(self) -> float:
+        return self.requested / self.elapsed_seconds if self.elapsed_seconds else 0.0
@@ -1,13 +1,30 @@
-from typing import Optional, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
 
-from spb_onprem.base_service import BaseService
+from spb_onprem.base_service import BaseService, sync_only
 from spb_onprem.base_types import (
     Undefined,
     UndefinedType,
 )
+from spb_onprem.data.enums import DataStatus
+from spb_onprem.data.params import (
+    DataFilterOptions,
+    DataListFilter,
+    DataSliceFilter,
+    DataSlicePropertiesFilter,
+    DataSliceUserFilterOption,
+)
+from spb_onprem.data.queries import Queries as DataQueries, with_data_selection
+from spb_onprem.exceptions import BadParameterError
+from spb_onprem.utils.pagination import iter_pages
 
+from .assignment import Assignee, SliceAssignmentReport, plan_assignment, validate_assignees
 from .entities import (
-    Slice
+    Slice,
+    SliceMembershipReport,
 )
 from .params import (
     SlicesFilter
@@ -17,6 +34,49 @@ from .queries import (
 )
 
 
+# The dataList query returns at most 50 ids per request.
+_ID_PAGE_SIZE = 50
+
+
+def _filter_depends_on_slice(data_filter: DataListFilter, slice_id: str) -> bool:
+    # Whether adding to or removing from the slice can change what the filter matches.
+    if data_filter.slice is not None and data_filter.slice.id == slice_id:
+        return True
+    for options in (data_filter.must_filter, data_filter.not_filter):
+        if options is not None and slice_id in (options.slice_id_in or []) + (options.slice_id_all or []):
+            return True
+    return False
+
+
+def _assignment_filter(
+    data_filter: Optional[DataListFilter],
+    slice_id: str,
+    role: str,
+    reassign: bool,
+) -> DataListFilter:
+    # Narrows the filter to the slice, and to the data without a user in the role unless reassigning.
+    data_filter = data_filter.model_copy(deep=True) if data_filter is not None else DataListFilter()
+    if data_filter.slice is None:
+        data_filter.slice = DataSliceFilter(id=slice_id)
+    elif data_filter.slice.id != slice_id:
+        raise BadParameterError("The slice filter of data_filter must be on the assigned slice.")
+    if not reassign:
+        if data_filter.slice.not_filter is None:
+            data_filter.slice.not_filter = DataSlicePropertiesFilter()
+        if getattr(data_filter.slice.not_filter, role) is None:
+            setattr(data_filter.slice.not_filter, role, DataSliceUserFilterOption(exists=True))
+    return data_filter
+
+
+def _chunks(ids: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(ids)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 class SliceService(BaseService):
     """Service class for handling slice-related operations."""
     
@@ -208,3 +268,323 @@ class SliceService(BaseService):
             )
         )
         return response
+
+    @sync_only
+    def add_data(
+        self,
+        dataset_id: str,
+        slice_id: str,
+        data: Union[List[str], DataListFilter],
+        batch_size: int = 100,
+        max_workers: int = 4,
+        skip_unchanged: bool = True,
+        on_progress: Optional[Callable[[SliceMembershipReport], Any]] = None,
+    ) -> SliceMembershipReport:
+        """Add many data to a slice.
+
+        The ids are processed in batches of ``batch_size``: the data of a batch already in the
+        slice are looked up with one request and skipped, and the others are added with one
+        request of aliased mutations. ``max_workers`` batches are sent concurrently. The ids of
+        a filter are streamed while earlier batches are applied.
+
+        Args:
+            dataset_id (str): The ID of the dataset the slice belongs to.
+            slice_id (str): The ID of the slice.
+            data (Union[List[str], DataListFilter]): The data ids, or a filter matching the data.
+            batch_size (int): The number of data per request. Defaults to 100.
+            max_workers (int): The number of batches sent concurrently. Defaults to 4.
+            skip_unchanged (bool): Skip the data already in the slice. Defaults to True.
+            on_progress (Optional[Callable[[SliceMembershipReport], Any]]): Called after every batch.
+
+        Returns:
+            SliceMembershipReport: The number of data added and skipped, and the errors.
+        """
+        return self._change_membership(
+            dataset_id, slice_id, data, True, batch_size, max_workers, skip_unchanged, on_progress
+        )
+
+    @sync_only
+    def remove_data(
+        self,
+        dataset_id: str,
+        slice_id: str,
+        data: Union[List[str], DataListFilter],
+        batch_size: int = 100,
+        max_workers: int = 4,
+        skip_unchanged: bool = True,
+        on_progress: Optional[Callable[[SliceMembershipReport], Any]] = None,
+    ) -> SliceMembershipReport:
+        """Remove many data from a slice.
+
+        Works like add_data; the data of a batch that are not in the slice are skipped.
+
+        Args:
+            dataset_id (str): The ID of the dataset the slice belongs to.
+            slice_id (str): The ID of the slice.
+            data (Union[List[str], DataListFilter]): The data ids, or a filter matching the data.
+            batch_size (int): The number of data per request. Defaults to 100.
+            max_workers (int): The number of batches sent concurrently. Defaults to 4.
+            skip_unchanged (bool): Skip the data not in the slice. Defaults to True.
+            on_progress (Optional[Callable[[SliceMembershipReport], Any]]): Called after every batch.
+
+        Returns:
+            SliceMembershipReport: The number of data removed and skipped, and the errors.
+        """
+        return self._change_membership(
+            dataset_id, slice_id, data, False, batch_size, max_workers, skip_unchanged, on_progress
+        )
+
+    def _iter_data_ids(self, dataset_id: str, data_filter: DataListFilter) -> Iterator[str]:
+        def fetch_page(cursor: Optional[str]):
+            response = self.request_gql(
+                DataQueries.GET_ID_LIST,
+                DataQueries.GET_ID_LIST["variables"](
+                    dataset_id=dataset_id,
+                    data_filter=data_filter,
+                    cursor=cursor,
+                    length=_ID_PAGE_SIZE,
+                )
+            )
+            return [data["id"] for data in response.get("data") or []], response.get("next")
+
+        for ids, _ in iter_pages(fetch_page, prefetch=2):
+            yield from ids
+
+    def _slice_members(self, dataset_id: str, slice_id: str, data_ids: List[str]) -> set:
+        pages = [data_ids[start:start + _ID_PAGE_SIZE] for start in range(0, len(data_ids), _ID_PAGE_SIZE)]
+        members = set()
+        for response, error in self.request_gql_batch([
+            (
+                DataQueries.GET_ID_LIST,
+                DataQueries.GET_ID_LIST["variables"](
+                    dataset_id=dataset_id,
+                    data_filter=DataListFilter(
+                        must_filter=DataFilterOptions(id_in=page, slice_id_in=[slice_id])
+                    ),
+                    length=len(page),
+                )
+            )
+            for page in pages
+        ]):
+            if error is not None:
+                raise error
+            members.update(data["id"] for data in (response or {}).get("data") or [])
+        return members
+
+    def _change_membership(
+        self,
+        dataset_id: str,
+        slice_id: str,
+        data: Union[List[str], DataListFilter],
+        add: bool,
+        batch_size: int,
+        max_workers: int,
+        skip_unchanged: bool,
+        on_progress: Optional[Callable[[SliceMembershipReport], Any]],
+    ) -> SliceMembershipReport:
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if slice_id is None:
+            raise BadParameterError("slice_id is required.")
+        if data is None:
+            raise BadParameterError("data is required.")
+        if batch_size < 1:
+            raise BadParameterError("batch_size must be at least 1.")
+        if max_workers < 1:
+            raise BadParameterError("max_workers must be at least 1.")
+
+        if isinstance(data, DataListFilter):
+            data_ids = self._iter_data_ids(dataset_id, data)
+            if _filter_depends_on_slice(data, slice_id):
+                # The pages of the filter would shift under the changes; list every id first.
+                data_ids = list(data_ids)
+        else:
+            data_ids = data
+        query = DataQueries.ADD_TO_SLICE if add else DataQueries.REMOVE_FROM_SLICE
+        mutation = with_data_selection(query, "id")
+
+        report = SliceMembershipReport(slice_id=slice_id)
+        started = time.monotonic()
+        lock = threading.Lock()
+        # Bounds the batches read from the filter ahead of the mutations.
+        in_flight = threading.BoundedSemaphore(max_workers * 2)
+
+        def apply(chunk: List[str]):
+            pending = chunk
+            outcomes = []
+            error = None
+            try:
+                if skip_unchanged:
+                    members = self._slice_members(dataset_id, slice_id, chunk)
+                    pending = [data_id for data_id in chunk if (data_id in members) != add]
+                if pending:
+                    outcomes = self.request_gql_batch([
+                        (
+                            mutation,
+                            query["variables"](dataset_id=dataset_id, data_id=data_id, slice_id=slice_id),
+                        )
+                        for data_id in pending
+                    ])
+            except Exception as e:
+                error = e
+            finally:
+                in_flight.release()
+            with lock:
+                report.requested += len(chunk)
+                report.skipped += len(chunk) - len(pending)
+                if error is not None:
+                    report.failed.update((data_id, str(error)) for data_id in pending)
+                for data_id, (_, data_error) in zip(pending, outcomes):
+                    if data_error is None:
+                        report.changed += 1
+                    else:
+                        report.failed[data_id] = str(data_error)
+                report.elapsed_seconds = time.monotonic() - started
+                if on_progress is not None:
+                    on_progress(report)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spb-onprem-slice-membership") as executor:
+            for chunk in _chunks(data_ids, batch_size):
+                in_flight.acquire()
+                executor.submit(apply, chunk)
+
+        report.elapsed_seconds = time.monotonic() - started
+        return report
+
+    @sync_only
+    def assign_data(
+        self,
+        dataset_id: str,
+        slice_id: str,
+        role: str,
+        assignees: List[Union[str, Assignee, dict]],
+        data_filter: Optional[DataListFilter] = None,
+        status: Optional[DataStatus] = None,
+        reassign: bool = False,
+        batch_size: int = 100,
+        max_workers: int = 4,
+        on_progress: Optional[Callable[[SliceAssignmentReport], Any]] = None,
+    ) -> SliceAssignmentReport:
+        """Assign the data of a slice to a pool of labelers or reviewers.
+
+        The data of the slice that match the filter are listed, balanced over the assignees
+        in proportion to their weights and within their capacities (see plan_assignment), and
+        then changed with batches of aliased mutations, ``max_workers`` batches at a time.
+
+        Unless ``reassign`` is set, only the data without a user in the role are selected, and
+        the data the assignees already have in the slice count towards their share and capacity.
+
+        Args:
+            dataset_id (str): The ID of the dataset the slice belongs to.
+            slice_id (str): The ID of the slice.
+            role (str): "labeler" or "reviewer".
+            assignees (List[Union[str, Assignee, dict]]): The pool of users. A plain user id has weight 1.
+            data_filter (Optional[DataListFilter]): The filter of the data to assign. Defaults to every data of the slice.
+            status (Optional[DataStatus]): If given, the status every assigned data is set to.
+            reassign (bool): Also reassign the data that already have a user in the role. Defaults to False.
+            batch_size (int): The number of data per request. Defaults to 100.
+            max_workers (int): The number of batches sent concurrently. Defaults to 4.
+            on_progress (Optional[Callable[[SliceAssignmentReport], Any]]): Called after every batch.
+
+        Raises:
+            BadParameterError: A parameter is missing or invalid.
+
+        Returns:
+            SliceAssignmentReport: The number of data assigned to every user, the data left over and the errors.
+        """
+        if dataset_id is None:
+            raise BadParameterError("dataset_id is required.")
+        if slice_id is None:
+            raise BadParameterError("slice_id is required.")
+        if role not in ("labeler", "reviewer"):
+            raise BadParameterError("role must be 'labeler' or 'reviewer'.")
+        if batch_size < 1:
+            raise BadParameterError("batch_size must be at least 1.")
+        if max_workers < 1:
+            raise BadParameterError("max_workers must be at least 1.")
+        assignees = [
+            Assignee(user=assignee) if isinstance(assignee, str) else Assignee.model_validate(assignee)
+            for assignee in assignees or []
+        ]
+        validate_assignees(assignees)
+
+        started = time.monotonic()
+        # The selection changes as the data are assigned, so every id is listed first.
+        data_ids = list(self._iter_data_ids(
+            dataset_id, _assignment_filter(data_filter, slice_id, role, reassign)
+        ))
+        current_load = None if reassign else self._assignee_loads(
+            dataset_id, slice_id, role, [assignee.user for assignee in assignees]
+        )
+        plan = plan_assignment(data_ids, assignees, current_load)
+
+        report = SliceAssignmentReport(slice_id=slice_id, role=role, requested=len(data_ids))
+        report.unassigned = [data_id for data_id, user in plan.items() if user is None]
+        query = DataQueries.CHANGE_DATA_LABELER if role == "labeler" else DataQueries.CHANGE_DATA_REVIEWER
+        mutation = with_data_selection(query, "id")
+        status_mutation = with_data_selection(DataQueries.CHANGE_DATA_STATUS, "id")
+        lock = threading.Lock()
+
+        def apply(chunk: List[tuple]):
+            operations = []
+            for data_id, user in chunk:
+                operations.append((
+                    mutation,
+                    query["variables"](dataset_id=dataset_id, data_id=data_id, slice_id=slice_id, **{role: user}),
+                ))
+                if status is not None:
+                    operations.append((
+                        status_mutation,
+                        DataQueries.CHANGE_DATA_STATUS["variables"](
+                            dataset_id=dataset_id, data_id=data_id, slice_id=slice_id, status=status
+                        ),
+                    ))
+            try:
+                outcomes = self.request_gql_batch(operations)
+            except Exception as e:
+                outcomes = [(None, e)] * len(operations)
+            per_data = len(operations) // len(chunk)
+            with lock:
+                for index, (data_id, user) in enumerate(chunk):
+                    errors = [
+                        error for _, error in outcomes[index * per_data:(index + 1) * per_data]
+                        if error is not None
+                    ]
+                    if errors:
+                        report.failed[data_id] = str(errors[0])
+                    else:
+                        report.assigned[user] = report.assigned.get(user, 0) + 1
+                report.elapsed_seconds = time.monotonic() - started
+                if on_progress is not None:
+                    on_progress(report)
+
+        assignments = [(data_id, user) for data_id, user in plan.items() if user is not None]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spb-onprem-slice-assignment") as executor:
+            for future in [executor.submit(apply, chunk) for chunk in _chunks(assignments, batch_size)]:
+                future.result()
+
+        report.elapsed_seconds = time.monotonic() - started
+        return report
+
+    def _assignee_loads(self, dataset_id: str, slice_id: str, role: str, users: List[str]) -> dict:
+        # The number of data every user has in the role in the slice, counted in one request.
+        loads = {}
+        outcomes = self.request_gql_batch([
+            (
+                DataQueries.GET_ID_LIST,
+                DataQueries.GET_ID_LIST["variables"](
+                    dataset_id=dataset_id,
+                    data_filter=DataListFilter(slice=DataSliceFilter(
+                        id=slice_id,
+                        must_filter=DataSlicePropertiesFilter(**{role: DataSliceUserFilterOption(equals=user)}),
+                    )),
+                    length=1,
+                )
+            )
+            for user in users
+        ])
+        for user, (response, error) in zip(users, outcomes):
+            if error is not None:
+                raise error
+            loads[user] = (response or {}).get("totalCount") or 0
+        return loads
@@ -1,4 +1,6 @@
 """Utility modules for spb_onprem."""
+from .journal import OperationJournal
 
-__all__ = []
-
+__all__ = [
+    "OperationJournal",
+]
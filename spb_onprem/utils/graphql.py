@@ -0,0 +1,94 @@
+"""GraphQL document helpers."""
+import re
+from typing import Any, Dict, List, Tuple
+
+_OPERATION_RE = re.compile(
+    r"^\s*(?P<type>query|mutation)\b[^({]*(?:\((?P<declarations>[^)]*)\))?\s*\{(?P<body>.*)\}\s*$",
+    re.S,
+)
+_VARIABLE_RE = re.compile(r"\$(\w+)")
+
+
+def operation_type(query: Dict[str, Any]) -> str:
+    """Get the operation type ("query" or "mutation") of a query object.
+
+    Args:
+        query (Dict[str, Any]): A query object with "name" and "query" keys, as defined in the ``Queries`` classes.
+
+    Returns:
+        str: The operation type.
+    """
+    match = _OPERATION_RE.match(query["query"])
+    if match is None:
+        raise ValueError(f"Can not parse the GraphQL operation '{query.get('name')}'.")
+    return match.group("type")
+
+
+def merge_aliased_operations(
+    operations: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    alias_prefix: str = "op",
+) -> Tuple[str, Dict[str, Any], List[str]]:
+    """Merge several single-field operations into one document using field aliases.
+
+    Every operation is renamed to ``{alias_prefix}{i}: field(...)`` and its variables are
+    prefixed with ``{alias_prefix}{i}_`` so that they do not collide::
+
+        mutation (
+            $op0_data_id: ID!, ...
+            $op1_data_id: ID!, ...
+        ) {
+            op0: updateData(id: $op0_data_id, ...) { id }
+            op1: updateData(id: $op1_data_id, ...) { id }
+        }
+
+    Args:
+        operations (List[Tuple[Dict[str, Any], Dict[str, Any]]]): The (query object, variables) pairs.
+            All operations must have the same operation type.
+        alias_prefix (str): The prefix of the aliases.
+
+    Raises:
+        ValueError: An operation can not be parsed, selects several root fields,
+            or the operations have different operation types.
+
+    Returns:
+        Tuple[str, Dict[str, Any], List[str]]: The merged document, the merged variables
+            and the alias of every operation, in order.
+    """
+    merged_type = None
+    declarations: List[str] = []
+    fields: List[str] = []
+    merged_variables: Dict[str, Any] = {}
+    aliases: List[str] = []
+
+    for i, (query, variables) in enumerate(operations):
+        match = _OPERATION_RE.match(query["query"])
+        if match is None:
+            raise ValueError(f"Can not parse the GraphQL operation '{query.get('name')}'.")
+        if merged_type is None:
+            merged_type = match.group("type")
+        elif merged_type != match.group("type"):
+            raise ValueError("Queries and mutations can not be merged into one document.")
+
+        body = match.group("body").strip()
+        field = re.match(r"\w+", body)
+        if field is None or field.group(0) != query["name"]:
+            raise ValueError(f"The GraphQL operation '{query.get('name')}' must select exactly its own root field.")
+
+        alias = f"{alias_prefix}{i}"
+        rename = lambda m: f"${alias}_{m.group(1)}"
+        if match.group("declarations"):
+            declarations.extend(
+                _VARIABLE_RE.sub(rename, declaration.strip())
+                for declaration in match.group("declarations").split(",")
+                if declaration.strip()
+            )
+        fields.append(f"{alias}: {_VARIABLE_RE.sub(rename, body)}")
+        for key, value in (variables or {}).items():
+            merged_variables[f"{alias}_{key}"] = value
+        aliases.append(alias)
+
+    header = merged_type or "query"
+    if declarations:
+        header += "(\n    " + ",\n    ".join(declarations) + "\n)"
+    document = header + " {\n" + "\n".join(fields) + "\n}"
+    return document, merged_variables, aliases
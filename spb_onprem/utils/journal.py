@@ -0,0 +1,158 @@
+"""
+This module defines the OperationJournal class, a write-ahead journal for long-running bulk jobs.
+
+Classes:
+    OperationJournal: Records the intent and the completion of every item of a bulk job.
+"""
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .jsonl import JsonLinesLog
+
+INTENT = "intent"
+DONE = "done"
+FAILED = "failed"
+
+
+class OperationJournal():
+    """A crash-safe record of the items of a bulk job.
+
+    Every item is run through ``run``: the intent is appended and flushed to disk before
+    the operation is issued, and the completion (with the operation's result) after it
+    returns. Rerunning a job with the same journal skips the completed items and returns
+    their recorded results; only pending and failed items are run again::
+
+        journal = OperationJournal("ingest.journal")
+        for item in items:
+            journal.run(
+                f"create:{item.key}",
+                lambda: data_service.create_data(make_data(item), returning="id").id,
+                reconcile=lambda: find_data_id(item.key),
+            )
+
+    An item that is pending (its completion was never recorded) or failed (for example on a
+    timeout) may still have been applied by the server. ``reconcile`` is then called first;
+    if it returns a value other than None, the item is recorded as done with it instead of
+    being issued again.
+
+    Results are stored as JSON, so operations should return ids or other plain values.
+
+    Args:
+        path (str): The journal file. It is created if it does not exist.
+        fsync (bool): Sync every record to disk. Defaults to True.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._states: Dict[str, str] = {}
+        self._results: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._log = JsonLinesLog(path, fsync=fsync)
+        for record in self._log.load():
+            self._apply(record)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def close(self):
+        """Close the journal file."""
+        with self._lock:
+            self._log.close()
+
+    def status(self, item_id: str) -> Optional[str]:
+        """Get the state of an item: "intent" (pending), "done", "failed", or None if it was never run."""
+        with self._lock:
+            return self._states.get(item_id)
+
+    def result(self, item_id: str) -> Any:
+        """Get the recorded result of a completed item."""
+        with self._lock:
+            return self._results.get(item_id)
+
+    def completed(self) -> Dict[str, Any]:
+        """Get the result of every completed item."""
+        with self._lock:
+            return {item_id: self._results.get(item_id) for item_id, state in self._states.items() if state == DONE}
+
+    def pending(self) -> List[str]:
+        """Get the items whose operation was issued but never completed nor failed."""
+        with self._lock:
+            return [item_id for item_id, state in self._states.items() if state == INTENT]
+
+    def failed(self) -> Dict[str, str]:
+        """Get the error of every item whose last attempt failed."""
+        with self._lock:
+            return {item_id: self._errors[item_id] for item_id, state in self._states.items() if state == FAILED}
+
+    def run(
+        self,
+        item_id: str,
+        operation: Callable[[], Any],
+        reconcile: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """Run the operation of an item unless the journal records it as done.
+
+        Args:
+            item_id (str): The id of the item, unique within the job.
+            operation (Callable[[], Any]): Issues the operation and returns its JSON-serializable result.
+            reconcile (Optional[Callable[[], Any]]): Called for an item left pending or failed by an
+                earlier run. Returns the result if the operation was applied, or None to issue it again.
+
+        Raises:
+            Exception: The error of the operation, after it has been recorded as failed.
+
+        Returns:
+            Any: The result of the operation, or the recorded result of a completed item.
+        """
+        with self._lock:
+            state = self._states.get(item_id)
+            if state == DONE:
+                return self._results.get(item_id)
+        if state in (INTENT, FAILED) and reconcile is not None:
+            result = reconcile()
+            if result is not None:
+                self._write({"id": item_id, "state": DONE, "result": result})
+                return result
+
+        self._write({"id": item_id, "state": INTENT})
+        try:
+            result = operation()
+        except Exception as e:
+            self._write({"id": item_id, "state": FAILED, "error": str(e)})
+            raise
+        self._write({"id": item_id, "state": DONE, "result": result})
+        return result
+
+    def compact(self):
+        """Rewrite the journal with only the last record of every item."""
+        with self._lock:
+            records = []
+            for item_id, state in self._states.items():
+                record = {"id": item_id, "state": state}
+                if state == DONE:
+                    record["result"] = self._results.get(item_id)
+                elif state == FAILED:
+                    record["error"] = self._errors.get(item_id)
+                records.append(record)
+            self._log.replace(records)
+
+    def _apply(self, record: dict):
+        item_id = record["id"]
+        self._states[item_id] = record["state"]
+        if record["state"] == DONE:
+            self._results[item_id] = record.get("result")
+        elif record["state"] == FAILED:
+            self._errors[item_id] = record.get("error")
+
+    def _write(self, record: dict):
+        with self._lock:
+            self._log.append(record)
+            self._apply(record)
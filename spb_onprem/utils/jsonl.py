@@ -0,0 +1,72 @@
+"""
+This module defines the JsonLinesLog class, the append-only file behind the local journals.
+
+Classes:
+    JsonLinesLog: An append-only file of JSON records, one per line, that survives a crash mid-write.
+"""
+import json
+import os
+from typing import Any, Iterable, List, Optional
+
+
+class JsonLinesLog():
+    """An append-only file of JSON records, one per line.
+
+    Every record is flushed (and synced, with ``fsync``) before ``append`` returns. A crash
+    while a record is written leaves a torn last line; ``load`` drops it and truncates the
+    file after the last complete line, so the next record starts on a line of its own.
+
+    Args:
+        path (str): The file. It is created on the first append if it does not exist.
+        fsync (bool): Sync every record to disk. Defaults to True.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._file = None
+
+    def load(self) -> List[dict]:
+        """Read every complete record, repairing a torn last line."""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            content = f.read()
+        complete = content.rfind(b"\n") + 1
+        if complete < len(content):
+            # A line torn by a crash while it was written.
+            with open(self.path, "r+b") as f:
+                f.truncate(complete)
+        records = []
+        for line in content[:complete].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+    def append(self, record: Any):
+        """Append a record and flush it to disk."""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def replace(self, records: Iterable[Any]):
+        """Atomically replace the whole file with the given records."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.close()
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        """Close the file. It is reopened by the next append."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,75 @@
+"""Cursor pagination helpers."""
+import queue
+import threading
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+Page = Tuple[List[Any], Optional[str]]
+
+_DONE = object()
+
+
+def iter_pages(
+    fetch_page: Callable[[Optional[str]], Page],
+    cursor: Optional[str] = None,
+    prefetch: int = 1,
+) -> Iterator[Page]:
+    """Walk a cursor-paginated listing page by page.
+
+    With ``prefetch > 0`` the next pages are fetched by a background thread while the
+    current page is consumed. At most ``prefetch`` fetched pages wait in memory; the
+    thread blocks until the consumer catches up (backpressure). Closing the iterator
+    stops the thread after its current request.
+
+    Args:
+        fetch_page (Callable[[Optional[str]], Page]): Fetches the page at a cursor and
+            returns its items and the next cursor (None on the last page).
+        cursor (Optional[str]): The cursor to start from. None starts from the beginning.
+        prefetch (int): The number of pages fetched ahead of the consumer. 0 fetches in the caller's thread.
+
+    Yields:
+        Page: The items of each page and the cursor of the page after it.
+    """
+    if prefetch <= 0:
+        while True:
+            items, cursor = fetch_page(cursor)
+            yield items, cursor
+            if cursor is None:
+                return
+
+    pages: "queue.Queue[Any]" = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(cursor: Optional[str]):
+        try:
+            while not stop.is_set():
+                items, cursor = fetch_page(cursor)
+                if not put((items, cursor)) or cursor is None:
+                    break
+        except BaseException as e:
+            put(e)
+            return
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, args=(cursor,), name="spb-onprem-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            page = pages.get()
+            if page is _DONE:
+                return
+            if isinstance(page, BaseException):
+                raise page
+            yield page
+            if page[1] is None:
+                return
+    finally:
+        stop.set()
@@ -0,0 +1,34 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from spb_onprem import AsyncContentService
+from spb_onprem.async_base_service import AsyncResponse
+from spb_onprem.contents.queries import Queries
+
+
+class TestAsyncContentService:
+    """Test cases for the asyncio variant of ContentService."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.content_service = AsyncContentService(transport=Mock(limit=4))
+        self.content_service.request_gql = AsyncMock()
+        self.content_service.request = AsyncMock()
+
+    def test_method_with_several_requests(self):
+        """Test that a method issuing a GraphQL call and an upload runs to completion."""
+        self.content_service.request_gql.return_value = {
+            "content": {"id": "content-1"},
+            "uploadURL": "https://storage.example.com/upload",
+        }
+        self.content_service.request.return_value = AsyncResponse(200, {}, b"", "https://storage.example.com/upload")
+
+        content = asyncio.run(self.content_service.upload_json_content({"a": 1}, key="a.json"))
+
+        assert content.id == "content-1"
+        self.content_service.request_gql.assert_awaited_once_with(
+            query=Queries.CREATE,
+            variables=Queries.CREATE["variables"]("a.json", "application/json"),
+        )
+        self.content_service.request.assert_awaited_once()
+        assert self.content_service.request.await_args.kwargs["json_data"] == {"a": 1}
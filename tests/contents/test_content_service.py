@@ -1,8 +1,16 @@
+import hashlib
 import pytest
+from io import BytesIO
 from unittest.mock import Mock, patch
 
 from spb_onprem.contents.service import ContentService
 from spb_onprem.contents.queries import Queries
+from spb_onprem.contents.entities import BaseContent
+from spb_onprem.contents.hash_index import ContentHashIndex
+from spb_onprem.contents.upload_journal import UploadJournal
+from spb_onprem.contents.upload_stream import UploadStream
+from spb_onprem.data.entities import Data
+from spb_onprem.exceptions import BadRequestError, NotFoundError
 
 
 class TestContentService:
@@ -96,4 +104,243 @@ class TestContentService:
         with pytest.raises(Exception, match="Network error"):
             self.content_service.delete_content(content_id)
 
-        self.content_service.request_gql.assert_called_once()
\ No newline at end of file
+        self.content_service.request_gql.assert_called_once()
+
+    def test_upload_content_streams_the_file(self, tmp_path):
+        """Test that upload_content sends a sized stream instead of the file bytes."""
+        # Arrange
+        path = tmp_path / "scene.mp4"
+        path.write_bytes(b"x" * 1000)
+        self.content_service.request_gql.return_value = {
+            "uploadURL": "https://storage.example.com/upload",
+            "content": {"id": "content-1"},
+        }
+        self.content_service.request = Mock()
+
+        # Act
+        content = self.content_service.upload_content(str(path), buffer_size=64)
+
+        # Assert
+        assert content.id == "content-1"
+        kwargs = self.content_service.request.call_args.kwargs
+        assert isinstance(kwargs["data"], UploadStream)
+        assert kwargs["headers"] == {"Content-Length": "1000", "Content-Type": "video/mp4"}
+        assert kwargs["data"].read(1000) == b"x" * 64
+
+    def test_upload_content_with_data_streams_from_start(self):
+        """Test that upload_content_with_data uploads the whole file object from its start."""
+        # Arrange
+        file_data = BytesIO(b"hello")
+        file_data.seek(3)
+        self.content_service.request_gql.return_value = {
+            "uploadURL": "https://storage.example.com/upload",
+            "content": {"id": "content-1"},
+        }
+        self.content_service.request = Mock()
+
+        # Act
+        self.content_service.upload_content_with_data(file_data, content_type="text/plain")
+
+        # Assert
+        assert self.content_service.request.call_args.kwargs["data"].read() == b"hello"
+
+    def test_upload_contents_resumes_from_journal(self, tmp_path):
+        """Test that upload_contents skips the files a journal records as uploaded."""
+        # Arrange
+        paths = []
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            path = tmp_path / name
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+        journal_path = str(tmp_path / "uploads.jsonl")
+        UploadJournal(journal_path).record(paths[1], "content-b")
+        self.content_service.upload_content = Mock(
+            side_effect=lambda file_path, key, buffer_size, hash_index: BaseContent(id=f"content-{file_path[-5]}")
+        )
+
+        # Act
+        contents = self.content_service.upload_contents(paths, max_workers=2, journal=journal_path)
+
+        # Assert
+        assert [content.id for content in contents] == ["content-a", "content-b", "content-c"]
+        assert self.content_service.upload_content.call_count == 2
+        assert len(UploadJournal(journal_path)) == 3
+
+    def test_upload_contents_journal_ignores_modified_files(self, tmp_path):
+        """Test that a file changed since it was journaled is uploaded again."""
+        # Arrange
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"old")
+        journal = UploadJournal(str(tmp_path / "uploads.jsonl"))
+        journal.record(str(path), "content-old")
+        path.write_bytes(b"newer")
+
+        # Act & Assert
+        assert journal.lookup(str(path)) is None
+
+    def test_upload_journal_repairs_a_torn_last_line(self, tmp_path):
+        """Test that a record appended after a crash mid-write is not glued to the torn line."""
+        # Arrange
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"bytes")
+        journal_path = tmp_path / "uploads.jsonl"
+        journal_path.write_text('{"path": "/other.jpg", "si')
+
+        # Act
+        journal = UploadJournal(str(journal_path))
+        journal.record(str(path), "content-a")
+        journal.close()
+
+        # Assert
+        assert UploadJournal(str(journal_path)).lookup(str(path)) == "content-a"
+
+    def test_upload_folder_batches_urls_and_reports_failures(self, tmp_path):
+        """Test that upload_folder generates URLs in batches and reports each failed file."""
+        # Arrange
+        (tmp_path / "cam0").mkdir()
+        (tmp_path / "cam0" / "0001.jpg").write_bytes(b"aaaa")
+        (tmp_path / "cam1").mkdir()
+        (tmp_path / "cam1" / "0001.jpg").write_bytes(b"bb")
+        (tmp_path / "scene.json").write_bytes(b"{}")
+        self.content_service.create_folder_content = Mock(return_value="folder-1")
+        self.content_service.request_gql_batch = Mock(side_effect=lambda operations: [
+            (f"https://storage.example.com/{variables['file_name']}", None)
+            for _, variables in operations
+        ])
+
+        def put(method, url, headers, data):
+            if url.endswith("cam1/0001.jpg"):
+                raise BadRequestError("HTTP request failed: 403")
+            data.read()
+        self.content_service.request = Mock(side_effect=put)
+
+        # Act
+        report = self.content_service.upload_folder(str(tmp_path), concurrency=2, url_batch_size=2)
+
+        # Assert
+        assert report.content_id == "folder-1"
+        assert sorted(report.uploaded) == ["cam0/0001.jpg", "scene.json"]
+        assert list(report.failed) == ["cam1/0001.jpg"]
+        assert report.bytes_uploaded == 6
+        assert self.content_service.request_gql_batch.call_count == 2
+        first_batch = self.content_service.request_gql_batch.call_args_list[0].args[0]
+        assert first_batch[0][1] == {
+            "content_id": "folder-1", "file_name": "cam0/0001.jpg", "content_type": "image/jpeg",
+        }
+
+    def test_get_download_url_uses_url_cache(self):
+        """Test that a cached download URL is reused without a request."""
+        # Arrange
+        ContentService.configure_url_cache(max_size=10)
+        self.content_service.request_gql.return_value = "https://storage.example.com/a.jpg?Expires=9999999999"
+
+        try:
+            # Act
+            first = self.content_service.get_download_url("content-1")
+            second = self.content_service.get_download_url("content-1")
+
+            # Assert
+            assert first == second
+            self.content_service.request_gql.assert_called_once()
+        finally:
+            ContentService.configure_url_cache(max_size=0)
+
+    def test_prefetch_download_urls_batches_scene_contents(self):
+        """Test that prefetch_download_urls requests the scene contents of data in one batch."""
+        # Arrange
+        data = Data.model_validate({
+            "id": "data-1",
+            "scene": [
+                {"id": "scene-1", "type": "IMAGE", "content": {"id": "content-1"}},
+                {"id": "scene-2", "type": "IMAGE", "content": {"id": "content-2"}},
+            ],
+        })
+        self.content_service.request_gql_batch = Mock(return_value=[
+            ("https://storage.example.com/1", None),
+            (None, NotFoundError("not found")),
+        ])
+
+        # Act
+        urls = self.content_service.prefetch_download_urls([data])
+
+        # Assert
+        assert urls == {"content-1": "https://storage.example.com/1"}
+        operations = self.content_service.request_gql_batch.call_args.args[0]
+        assert [variables for _, variables in operations] == [{"id": "content-1"}, {"id": "content-2"}]
+
+    def test_upload_content_skips_known_bytes(self, tmp_path):
+        """Test that bytes recorded in the hash index are not uploaded again."""
+        # Arrange
+        first = tmp_path / "a.jpg"
+        first.write_bytes(b"same bytes")
+        second = tmp_path / "copy_of_a.jpg"
+        second.write_bytes(b"same bytes")
+        index = ContentHashIndex()
+        self.content_service.request_gql.return_value = {
+            "uploadURL": "https://storage.example.com/upload",
+            "content": {"id": "content-1"},
+        }
+        self.content_service.request = Mock()
+
+        # Act
+        uploaded = self.content_service.upload_content(str(first), hash_index=index)
+        skipped = self.content_service.upload_content(str(second), hash_index=index)
+
+        # Assert
+        assert uploaded.id == skipped.id == "content-1"
+        self.content_service.request.assert_called_once()
+        assert self.content_service.request.call_args.kwargs["data"].tell() == 0
+        assert len(index) == 1
+
+    def test_upload_content_reuses_known_bytes_only_for_the_same_key_and_type(self, tmp_path):
+        """Test that known bytes uploaded with another key or content type are uploaded again."""
+        # Arrange
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"same bytes")
+        index = ContentHashIndex()
+        self.content_service.request_gql.side_effect = [
+            {"uploadURL": "https://storage.example.com/upload", "content": {"id": f"content-{i}"}}
+            for i in range(3)
+        ]
+        self.content_service.request = Mock()
+
+        # Act
+        first = self.content_service.upload_content(str(path), key="a", hash_index=index)
+        other_key = self.content_service.upload_content(str(path), key="b", hash_index=index)
+        other_type = self.content_service.upload_content_stream(
+            str(path), content_type="application/octet-stream", key="a", hash_index=index
+        )
+        again = self.content_service.upload_content(str(path), key="a", hash_index=index)
+
+        # Assert
+        assert [first.id, other_key.id, other_type.id, again.id] == ["content-0", "content-1", "content-2", "content-0"]
+        assert len(index) == 3
+
+    def test_new_bytes_are_hashed_while_they_are_uploaded(self, tmp_path):
+        """Test that a file of a size not in the index is read once, by the upload."""
+        # Arrange
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"new bytes" * 1000)
+        index = ContentHashIndex()
+        self.content_service.request_gql.return_value = {
+            "uploadURL": "https://storage.example.com/upload",
+            "content": {"id": "content-1"},
+        }
+        read_by_upload = []
+        self.content_service.request = Mock(side_effect=lambda **kwargs: read_by_upload.append(kwargs["data"].read()))
+
+        bytes_read = []
+        readinto = UploadStream.readinto
+
+        def counting_readinto(stream, buffer):
+            bytes_read.append(readinto(stream, buffer))
+            return bytes_read[-1]
+
+        # Act
+        with patch.object(UploadStream, "readinto", counting_readinto):
+            self.content_service.upload_content(str(path), hash_index=index, buffer_size=4096)
+
+        # Assert
+        assert read_by_upload == [b"new bytes" * 1000]
+        assert sum(bytes_read) == 9000
+        assert index.lookup(hashlib.sha256(b"new bytes" * 1000).hexdigest(), content_type="image/jpeg") == "content-1"
@@ -0,0 +1,104 @@
+import http.server
+import os
+import threading
+
+import pytest
+import requests
+
+from spb_onprem.contents.download import download_to_file, iter_download, parse_content_range
+from spb_onprem.exceptions import BadRequestError
+
+PAYLOAD = os.urandom(10_000)
+
+
+class RangeHandler(http.server.BaseHTTPRequestHandler):
+    requested = []
+    fail_ranges = set()
+
+    def do_GET(self):
+        header = self.headers.get("Range")
+        type(self).requested.append(header)
+        if header in type(self).fail_ranges:
+            type(self).fail_ranges.discard(header)
+            self.send_response(403)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if header is None:
+            body = PAYLOAD
+            self.send_response(200)
+        else:
+            first, last = header[len("bytes="):].split("-")
+            first, last = int(first), min(int(last) if last else len(PAYLOAD) - 1, len(PAYLOAD) - 1)
+            body = PAYLOAD[first:last + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {first}-{last}/{len(PAYLOAD)}")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDownload:
+    """Test cases for the ranged content downloads."""
+
+    def setup_method(self):
+        RangeHandler.requested = []
+        RangeHandler.fail_ranges = set()
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/object"
+        self.session = requests.Session()
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.session.close()
+
+    def get_session(self, url):
+        return self.session
+
+    def test_parallel_ranged_download(self, tmp_path):
+        # Arrange
+        dest = str(tmp_path / "object.bin")
+
+        # Act
+        size = download_to_file(self.get_session, self.url, dest, part_size=3000, max_workers=3)
+
+        # Assert
+        assert size == len(PAYLOAD)
+        assert open(dest, "rb").read() == PAYLOAD
+        assert sorted(RangeHandler.requested) == sorted([
+            "bytes=0-2999", "bytes=3000-5999", "bytes=6000-8999", "bytes=9000-11999",
+        ])
+        assert not os.path.exists(dest + ".part.json")
+
+    def test_interrupted_download_resumes_missing_parts(self, tmp_path):
+        # Arrange
+        dest = str(tmp_path / "object.bin")
+        RangeHandler.fail_ranges = {"bytes=6000-8999"}
+        with pytest.raises(BadRequestError):
+            download_to_file(self.get_session, self.url, dest, part_size=3000, max_workers=1)
+        RangeHandler.requested = []
+
+        # Act
+        download_to_file(self.get_session, self.url, dest, part_size=3000, max_workers=1)
+
+        # Assert
+        assert open(dest, "rb").read() == PAYLOAD
+        assert RangeHandler.requested == ["bytes=6000-8999"]
+
+    def test_iter_download(self):
+        # Act
+        chunks = list(iter_download(self.get_session, self.url, chunk_size=4096))
+
+        # Assert
+        assert b"".join(chunks) == PAYLOAD
+        assert RangeHandler.requested == [None]
+
+    def test_parse_content_range(self):
+        assert parse_content_range("bytes 0-99/1000") == (0, 99, 1000)
+        assert parse_content_range("bytes 0-99/*") == (0, 99, None)
+        assert parse_content_range(None) is None
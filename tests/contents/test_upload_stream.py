@@ -0,0 +1,57 @@
+import io
+import mmap
+
+import pytest
+
+from spb_onprem.contents.upload_stream import UploadStream
+from spb_onprem.exceptions import BadParameterError
+
+
+class TestUploadStream:
+    """Test cases for UploadStream."""
+
+    def test_reads_region_of_file_with_bounded_reads(self, tmp_path):
+        # Arrange
+        path = tmp_path / "video.bin"
+        path.write_bytes(bytes(range(256)) * 4)
+        stream = UploadStream(str(path), offset=10, length=100, buffer_size=16)
+
+        # Act
+        first = stream.read(1000)
+        rest = stream.read()
+
+        # Assert
+        assert len(stream) == 100
+        assert len(first) == 16
+        assert first + rest == (bytes(range(256)) * 4)[10:110]
+        assert stream._file is None
+
+    def test_rewind_reopens_the_file(self, tmp_path):
+        # Arrange
+        path = tmp_path / "video.bin"
+        path.write_bytes(b"abcdef")
+        stream = UploadStream(str(path))
+        assert stream.read() == b"abcdef"
+
+        # Act
+        stream.seek(2)
+
+        # Assert
+        assert stream.tell() == 2
+        assert stream.read() == b"cdef"
+
+    def test_streams_from_mmap(self, tmp_path):
+        # Arrange
+        path = tmp_path / "video.bin"
+        path.write_bytes(b"0123456789")
+
+        # Act & Assert
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as region:
+            stream = UploadStream(region, offset=4)
+            assert len(stream) == 6
+            assert stream.read() == b"456789"
+
+    def test_region_past_the_end(self):
+        # Act & Assert
+        with pytest.raises(BadParameterError):
+            UploadStream(io.BytesIO(b"abc"), offset=1, length=5)
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from spb_onprem.contents.url_cache import PresignedURLCache, parse_url_expiry
+
+SIGNED_AT = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+S3_URL = (
+    "https://bucket.s3.amazonaws.com/key.jpg"
+    "?X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Date=20250101T000000Z&X-Amz-Expires=600&X-Amz-Signature=abc"
+)
+
+
+class TestPresignedURLCache:
+    """Test cases for PresignedURLCache."""
+
+    def setup_method(self):
+        self.now = SIGNED_AT
+        self.cache = PresignedURLCache(max_size=2, refresh_margin=60, clock=lambda: self.now)
+
+    def test_parse_url_expiry(self):
+        assert parse_url_expiry(S3_URL) == SIGNED_AT + 600
+        assert parse_url_expiry("https://cdn.example.com/key.jpg?Expires=1735690000&Signature=x") == 1735690000
+        assert parse_url_expiry("https://account.blob.core.windows.net/c/key?se=2025-01-01T00:10:00Z&sig=x") == SIGNED_AT + 600
+        assert parse_url_expiry("https://example.com/key.jpg") is None
+
+    def test_refreshes_before_expiry(self):
+        # Arrange
+        self.cache.put(("download", "content-1", None), S3_URL)
+
+        # Act & Assert
+        self.now = SIGNED_AT + 539
+        assert self.cache.get(("download", "content-1", None)) == S3_URL
+        self.now = SIGNED_AT + 540
+        assert self.cache.get(("download", "content-1", None)) is None
+
+    def test_evicts_least_recently_used(self):
+        # Arrange
+        self.cache.put("a", S3_URL)
+        self.cache.put("b", S3_URL)
+        self.cache.get("a")
+
+        # Act
+        self.cache.put("c", S3_URL)
+
+        # Assert
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == S3_URL
+        assert self.cache.stats()["size"] == 2
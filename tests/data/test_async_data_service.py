@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from spb_onprem import AsyncDataService
+from spb_onprem.data.queries import Queries
+from spb_onprem.exceptions import BadParameterError, NotFoundError
+
+
+class TestAsyncDataService:
+    """Test cases for the asyncio variant of DataService."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.data_service = AsyncDataService(transport=Mock(limit=4))
+        self.data_service.request_gql = AsyncMock()
+
+    def test_every_public_method_has_a_coroutine(self):
+        """Test that the sync service methods are exposed as coroutines."""
+        for name in ("get_data", "get_data_list", "update_data", "change_data_status", "update_frames"):
+            assert asyncio.iscoroutinefunction(getattr(AsyncDataService, name))
+
+    def test_get_data_reuses_sync_query_and_params(self):
+        """Test that the coroutine sends the same query and variables as the sync service."""
+        self.data_service.request_gql.return_value = {"id": "data-1", "key": "a.jpg"}
+
+        data = asyncio.run(self.data_service.get_data(dataset_id="dataset-1", data_id="data-1"))
+
+        assert data.id == "data-1"
+        self.data_service.request_gql.assert_awaited_once_with(
+            query=Queries.GET,
+            variables=Queries.GET["variables"](dataset_id="dataset-1", data_id="data-1"),
+        )
+
+    def test_validation_runs_before_any_request(self):
+        """Test that parameter validation errors surface without a request."""
+        with pytest.raises(BadParameterError):
+            asyncio.run(self.data_service.get_data(dataset_id=None, data_id="data-1"))
+        self.data_service.request_gql.assert_not_awaited()
+
+    def test_request_errors_are_raised_at_the_call_site(self):
+        """Test that transport errors propagate to the caller."""
+        self.data_service.request_gql.side_effect = NotFoundError("missing")
+
+        with pytest.raises(NotFoundError):
+            asyncio.run(self.data_service.get_data(dataset_id="dataset-1", data_id="data-1"))
+
+    def test_method_with_several_requests_continues_off_the_event_loop(self):
+        """Test that a method with several requests finishes in a worker thread without resending a request."""
+        calls = []
+
+        def get_two(service, dataset_id):
+            calls.append(threading.current_thread())
+            return [service.get_data(dataset_id=dataset_id, data_id=f"data-{i}").id for i in range(2)]
+
+        self.data_service.request_gql.side_effect = lambda query, variables: {"id": variables["id"]}
+
+        async def run():
+            first = await self.data_service._run(get_two, ("dataset-1",), {})
+            second = await self.data_service._run(get_two, ("dataset-1",), {})
+            return threading.current_thread(), first, second
+
+        loop_thread, first, second = asyncio.run(run())
+
+        assert first == second == ["data-0", "data-1"]
+        assert calls[-2] is not loop_thread and calls[-1] is not loop_thread
+        assert len(calls) == 4
+        assert self.data_service.request_gql.await_count == 4
+        assert self.data_service._get_executor()._max_workers == 4
+
+    def test_single_request_methods_do_not_use_threads(self):
+        """Test that concurrent single-request calls are all in flight at once, on the event loop."""
+        state = {"in_flight": 0, "peak": 0}
+        threads = set()
+
+        async def respond(query, variables):
+            threads.add(threading.current_thread())
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return {"id": variables["data_id"]}
+
+        self.data_service.request_gql.side_effect = respond
+
+        async def run():
+            return threading.current_thread(), await asyncio.gather(*[
+                self.data_service.update_data(dataset_id="dataset-1", data_id=f"data-{i}", key=f"k-{i}")
+                for i in range(200)
+            ])
+
+        loop_thread, results = asyncio.run(run())
+
+        assert [data.id for data in results] == [f"data-{i}" for i in range(200)]
+        assert state["peak"] == 200
+        assert threads == {loop_thread}
+        assert self.data_service._executor is None
+
+    def test_many_calls_in_flight(self):
+        """Test that concurrent coroutines get their own responses."""
+        async def respond(query, variables):
+            await asyncio.sleep(0)
+            return {"id": variables["id"]}
+
+        self.data_service.request_gql.side_effect = respond
+
+        async def run():
+            return await asyncio.gather(*[
+                self.data_service.get_data(dataset_id="dataset-1", data_id=f"data-{i}")
+                for i in range(20)
+            ])
+
+        results = asyncio.run(run())
+        assert [data.id for data in results] == [f"data-{i}" for i in range(20)]
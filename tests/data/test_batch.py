@@ -0,0 +1,91 @@
+from unittest.mock import Mock
+
+import pytest
+
+from spb_onprem.base_service import _call_signature, _CallRecorder
+from spb_onprem.data.service import DataService
+from spb_onprem.data.queries import Queries
+from spb_onprem.data.enums import DataStatus
+from spb_onprem.exceptions import BadParameterError, NotFoundError, RequestError
+from spb_onprem.utils.graphql import merge_aliased_operations
+
+
+class TestGraphQLBatch:
+    """Test cases for alias-multiplexed GraphQL batches."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.data_service = DataService()
+        self.data_service.request = Mock()
+
+    def _respond(self, body):
+        response = Mock()
+        response.json.return_value = body
+        self.data_service.request.return_value = response
+
+    def test_merge_aliased_operations(self):
+        """Test that operations are aliased and their variables are prefixed."""
+        operations = [
+            (Queries.UPDATE, Queries.UPDATE["variables"](dataset_id="ds", data_id=f"data-{i}", key=f"k{i}"))
+            for i in range(2)
+        ]
+
+        document, variables, aliases = merge_aliased_operations(operations)
+
+        assert aliases == ["op0", "op1"]
+        assert document.startswith("mutation(")
+        assert "op0: updateData(" in document
+        assert "op1: updateData(" in document
+        assert "$op1_data_id: ID!" in document
+        assert "id: $op1_data_id" in document
+        assert variables["op0_data_id"] == "data-0"
+        assert variables["op1_key"] == "k1"
+
+    def test_merge_rejects_mixed_operation_types(self):
+        """Test that queries and mutations can not share a document."""
+        with pytest.raises(ValueError):
+            merge_aliased_operations([
+                (Queries.GET, {"dataset_id": "ds", "id": "a"}),
+                (Queries.UPDATE, {"dataset_id": "ds", "data_id": "a"}),
+            ])
+
+    def test_batch_demultiplexes_results_and_errors(self):
+        """Test that per-alias results and errors reach the right operation."""
+        self._respond({
+            "data": {"op0": {"id": "data-0"}, "op1": None},
+            "errors": [{"message": "not found", "code": "NOT_FOUND", "path": ["op1"]}],
+        })
+
+        with self.data_service.batch() as batch:
+            first = batch.change_data_status(dataset_id="ds", data_id="data-0", slice_id="s", status=DataStatus.COMPLETED)
+            second = batch.change_data_status(dataset_id="ds", data_id="data-1", slice_id="s", status=DataStatus.COMPLETED)
+            assert not first.done
+
+        assert self.data_service.request.call_count == 1
+        assert first.result().id == "data-0"
+        with pytest.raises(NotFoundError):
+            second.result()
+
+    def test_batch_flushes_at_max_ops(self):
+        """Test that a full batch is sent before more operations are queued."""
+        self._respond({"data": {"op0": {"id": "a"}, "op1": {"id": "b"}}})
+
+        with self.data_service.batch(max_ops=2) as batch:
+            batch.update_data(dataset_id="ds", data_id="a", key="a")
+            batch.update_data(dataset_id="ds", data_id="b", key="b")
+            assert self.data_service.request.call_count == 1
+            assert batch.pending == 0
+
+    def test_parameter_errors_are_raised_when_queued(self):
+        """Test that service validation runs at queue time."""
+        with self.data_service.batch() as batch:
+            with pytest.raises(BadParameterError):
+                batch.change_data_status(dataset_id=None, data_id="a", slice_id="s", status=DataStatus.COMPLETED)
+        self.data_service.request.assert_not_called()
+
+    def test_recorded_response_is_not_given_to_another_request(self):
+        """Test that playing back an outcome checks the request it was recorded for."""
+        recorder = _CallRecorder([(_call_signature("gql", {"query": Queries.GET}), False, {"id": "a"})])
+
+        with pytest.raises(RequestError):
+            recorder.request_gql(Queries.UPDATE, {"dataset_id": "ds", "data_id": "a"})
@@ -0,0 +1,170 @@
+from unittest.mock import Mock
+
+from spb_onprem.contents.entities import BaseContent
+from spb_onprem.data.bulk import BulkCreateItem, run_bulk_create
+from spb_onprem.data.entities import Data
+from spb_onprem.exceptions import BadRequestError, NotFoundError, RequestError, UnknownError
+from spb_onprem.utils import OperationJournal
+
+
+class TestBulkCreate:
+    """Test cases for the bulk ingest pipeline."""
+
+    def setup_method(self):
+        self.data_service = Mock()
+        self.content_service = Mock()
+        self.content_service.upload_content_with_data.side_effect = (
+            lambda file_data, content_type, hash_index: BaseContent(id=f"content-{file_data.getvalue().decode()}")
+        )
+        self.data_service.create_data.side_effect = lambda data, returning: Data(id=f"data-{data.key}")
+
+    def test_creates_every_item_in_order(self):
+        # Arrange
+        items = [
+            BulkCreateItem(key=f"k{i}", scenes=[f"s{i}".encode()], meta={"camera": "front"}, slice_ids=["slice-1"])
+            for i in range(5)
+        ]
+
+        # Act
+        report = run_bulk_create(self.data_service, self.content_service, "dataset-1", items, concurrency=3)
+
+        # Assert
+        assert [result.data_id for result in report.results] == [f"data-k{i}" for i in range(5)]
+        assert report.created == 5
+        assert report.bytes_uploaded == 10
+        created = self.data_service.create_data.call_args_list[0].args[0]
+        assert created.dataset_id == "dataset-1"
+        assert created.meta[0].key == "camera"
+        assert created.slices[0].id == "slice-1"
+
+    def test_retries_transient_failure_without_reuploading(self):
+        # Arrange
+        self.data_service.create_data.side_effect = [
+            BadRequestError("HTTP request failed: 502"),
+            Data(id="data-k0"),
+        ]
+        self.data_service.get_data_by_key.side_effect = NotFoundError("not found")
+
+        # Act
+        report = run_bulk_create(
+            self.data_service, self.content_service, "dataset-1",
+            [BulkCreateItem(key="k0", scenes=[b"s0"])], backoff=0,
+        )
+
+        # Assert
+        result = report.results[0]
+        assert result.data_id == "data-k0"
+        assert result.attempts == 2
+        assert result.error is None
+        assert self.content_service.upload_content_with_data.call_count == 1
+
+    def test_retry_finds_data_created_by_the_failed_attempt(self):
+        # Arrange
+        self.data_service.create_data.side_effect = BadRequestError("HTTP request failed: read timeout")
+        self.data_service.get_data_by_key.return_value = Data(id="data-existing")
+
+        # Act
+        report = run_bulk_create(
+            self.data_service, self.content_service, "dataset-1",
+            [BulkCreateItem(key="k0", scenes=[b"s0"])], backoff=0,
+        )
+
+        # Assert
+        assert report.results[0].data_id == "data-existing"
+        assert self.data_service.create_data.call_count == 1
+
+    def test_graphql_error_is_reported_without_retry(self):
+        # Arrange
+        self.data_service.create_data.side_effect = UnknownError("GraphQL errors: duplicate key")
+
+        # Act
+        report = run_bulk_create(
+            self.data_service, self.content_service, "dataset-1",
+            [BulkCreateItem(key="k0", scenes=[b"s0"])], backoff=0,
+        )
+
+        # Assert
+        assert report.failed[0].error == "GraphQL errors: duplicate key"
+        assert report.failed[0].attempts == 1
+
+    def test_journal_skips_items_completed_by_an_earlier_run(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "ingest.journal")
+        items = [BulkCreateItem(key=f"k{i}", scenes=[f"s{i}".encode()]) for i in range(3)]
+        self.data_service.create_data.side_effect = [
+            Data(id="data-k0"),
+            UnknownError("GraphQL errors: server is shutting down"),
+            Data(id="data-k2"),
+        ]
+        with OperationJournal(path) as journal:
+            run_bulk_create(self.data_service, self.content_service, "dataset-1", items, concurrency=1, journal=journal)
+        self.data_service.create_data.side_effect = lambda data, returning: Data(id=f"data-{data.key}")
+        self.data_service.get_data_by_key.side_effect = NotFoundError("not found")
+
+        # Act
+        with OperationJournal(path) as journal:
+            report = run_bulk_create(
+                self.data_service, self.content_service, "dataset-1", items, concurrency=1, journal=journal,
+            )
+
+        # Assert
+        assert [result.data_id for result in report.results] == ["data-k0", "data-k1", "data-k2"]
+        assert [result.attempts for result in report.results] == [0, 1, 0]
+        assert self.data_service.create_data.call_count == 4
+
+    def test_journal_reconciles_failed_create_applied_by_the_server(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "ingest.journal")
+        items = [BulkCreateItem(key="k0", scenes=[b"s0"])]
+        self.data_service.create_data.side_effect = RequestError("read timed out")
+        self.data_service.get_data_by_key.side_effect = NotFoundError("not found")
+        with OperationJournal(path) as journal:
+            run_bulk_create(
+                self.data_service, self.content_service, "dataset-1", items,
+                max_attempts=1, journal=journal,
+            )
+        self.data_service.get_data_by_key.side_effect = None
+        self.data_service.get_data_by_key.return_value = Data(id="data-k0")
+
+        # Act
+        with OperationJournal(path) as journal:
+            report = run_bulk_create(self.data_service, self.content_service, "dataset-1", items, journal=journal)
+
+        # Assert
+        assert report.results[0].data_id == "data-k0"
+        assert self.data_service.create_data.call_count == 1
+
+    def test_scenes_skipped_by_the_hash_index_are_not_counted_as_uploaded(self):
+        # Arrange
+        items = [BulkCreateItem(key="k0", scenes=[b"known"]), BulkCreateItem(key="k1", scenes=[b"new"])]
+        hash_index = Mock()
+        hash_index.lookup.side_effect = lambda sha256, key, content_type: "content-known" if sha256 == "known" else None
+
+        def upload(file_data, content_type, hash_index):
+            content_id = hash_index.lookup(file_data.getvalue().decode(), None, content_type)
+            return BaseContent(id=content_id or "content-new")
+        self.content_service.upload_content_with_data.side_effect = upload
+
+        # Act
+        report = run_bulk_create(self.data_service, self.content_service, "dataset-1", items, hash_index=hash_index)
+
+        # Assert
+        assert [result.bytes_uploaded for result in report.results] == [0, 3]
+        assert report.bytes_uploaded == 3
+
+    def test_unexpected_error_fails_only_its_item(self):
+        # Arrange
+        items = [BulkCreateItem(key=f"k{i}", scenes=[f"s{i}".encode()]) for i in range(3)]
+
+        def create(data, returning):
+            if data.key == "k1":
+                raise ValueError("invalid meta")
+            return Data(id=f"data-{data.key}")
+        self.data_service.create_data.side_effect = create
+
+        # Act
+        report = run_bulk_create(self.data_service, self.content_service, "dataset-1", items)
+
+        # Assert
+        assert [result.data_id for result in report.results] == ["data-k0", None, "data-k2"]
+        assert report.results[1].error == "invalid meta"
@@ -3,7 +3,8 @@ from unittest.mock import Mock
 
 from spb_onprem.data.service import DataService
 from spb_onprem.data.queries import Queries
-from spb_onprem.exceptions import BadParameterError
+from spb_onprem.data.enums import DataStatus
+from spb_onprem.exceptions import BadParameterError, NotFoundError, UnknownError
 
 
 class TestDataService:
@@ -103,4 +104,264 @@ class TestDataService:
 
         # Act & Assert
         with pytest.raises(BadParameterError, match="data_id is required"):
-            self.data_service.delete_data(dataset_id=dataset_id, data_id=None)
\ No newline at end of file
+            self.data_service.delete_data(dataset_id=dataset_id, data_id=None)
+
+    def test_mutation_returning_id_selects_only_id(self):
+        """Test that returning="id" sends a mutation selecting only the id."""
+        # Arrange
+        self.data_service.request_gql.return_value = {"id": "data-456"}
+
+        # Act
+        result = self.data_service.update_data(
+            dataset_id="dataset-123", data_id="data-456", key="new-key", returning="id"
+        )
+
+        # Assert
+        assert result.id == "data-456"
+        query = self.data_service.request_gql.call_args.args[0]
+        assert query["name"] == "updateData"
+        assert "slices" not in query["query"]
+        assert "comments" not in query["query"]
+
+    def test_mutation_returning_field_set(self):
+        """Test that a custom field set selects the requested fields and the id."""
+        # Arrange
+        self.data_service.request_gql.return_value = {"id": "data-456", "meta": []}
+
+        # Act
+        self.data_service.change_data_status(
+            dataset_id="dataset-123",
+            data_id="data-456",
+            slice_id="slice-1",
+            status=DataStatus.COMPLETED,
+            returning={"meta", "annotation_stats"},
+        )
+
+        # Assert
+        query = self.data_service.request_gql.call_args.args[0]["query"]
+        assert "meta {" in query
+        assert "annotationStats {" in query
+        assert "frames {" not in query
+
+    def test_mutation_returning_full_is_the_default_query(self):
+        """Test that the default selection keeps the original query object."""
+        # Arrange
+        self.data_service.request_gql.return_value = {"id": "data-456"}
+
+        # Act
+        self.data_service.add_data_to_slice(dataset_id="dataset-123", data_id="data-456", slice_id="slice-1")
+
+        # Assert
+        assert self.data_service.request_gql.call_args.args[0] is Queries.ADD_TO_SLICE
+
+    def test_mutation_returning_unknown_field(self):
+        """Test that unknown field names are rejected before the request."""
+        with pytest.raises(BadParameterError):
+            self.data_service.update_data(dataset_id="dataset-123", data_id="data-456", returning={"nope"})
+        self.data_service.request_gql.assert_not_called()
+
+    def test_iter_data_walks_every_page(self):
+        """Test that iter_data follows the cursor until the last page."""
+        # Arrange
+        pages = {
+            None: {"data": [{"id": "a"}, {"id": "b"}], "next": "c1", "totalCount": 3},
+            "c1": {"data": [{"id": "c"}], "next": None, "totalCount": 3},
+        }
+        self.data_service.request_gql.side_effect = lambda query, variables: pages[variables["cursor"]]
+
+        # Act
+        result = [data.id for data in self.data_service.iter_data(dataset_id="dataset-123", page_size=2)]
+
+        # Assert
+        assert result == ["a", "b", "c"]
+        assert self.data_service.request_gql.call_count == 2
+
+    def test_iter_data_propagates_errors(self):
+        """Test that a failing page request surfaces in the consumer."""
+        # Arrange
+        self.data_service.request_gql.side_effect = BadParameterError("boom")
+
+        # Act & Assert
+        with pytest.raises(BadParameterError, match="boom"):
+            list(self.data_service.iter_data(dataset_id="dataset-123"))
+
+    def test_get_data_ids_returns_plain_strings(self):
+        """Test that get_data_ids returns ids and frame tuples without Data objects."""
+        # Arrange
+        self.data_service.request_gql.return_value = {
+            "data": [{"id": "a"}, {"id": "b"}],
+            "selectedFrames": [{"dataId": "a", "selectedFrameIndex": 3}],
+            "next": "cursor-2",
+            "totalCount": 5,
+        }
+
+        # Act
+        ids, next_cursor, total, frames = self.data_service.get_data_ids(
+            dataset_id="dataset-123", include_selected_frames=True
+        )
+
+        # Assert
+        assert ids == ["a", "b"]
+        assert next_cursor == "cursor-2"
+        assert total == 5
+        assert frames == [("a", 3)]
+        assert self.data_service.request_gql.call_args.args[0] is Queries.GET_ID_LIST
+
+    def test_iter_data_ids_streams_every_page(self):
+        """Test that iter_data_ids follows the cursor until the last page."""
+        # Arrange
+        pages = {
+            None: {"data": [{"id": "a"}], "next": "c1", "totalCount": 2},
+            "c1": {"data": [{"id": "b"}], "next": None, "totalCount": 2},
+        }
+        self.data_service.request_gql.side_effect = lambda query, variables: pages[variables["cursor"]]
+
+        # Act & Assert
+        assert list(self.data_service.iter_data_ids(dataset_id="dataset-123")) == ["a", "b"]
+
+    def test_get_data_list_meta_projection(self):
+        """Test that fields="meta" selects only the id, key and meta."""
+        # Arrange
+        self.data_service.request_gql.return_value = {
+            "data": [{"id": "a", "key": "a.jpg", "meta": []}], "next": None, "totalCount": 1,
+        }
+
+        # Act
+        data, _, _ = self.data_service.get_data_list(dataset_id="dataset-123", fields="meta")
+
+        # Assert
+        query = self.data_service.request_gql.call_args.args[0]["query"]
+        assert "meta {" in query
+        assert "slices" not in query
+        assert "annotation" not in query
+        assert data[0].key == "a.jpg"
+
+    def test_get_data_slice_projection_keeps_only_that_slice(self):
+        """Test that fields="slice:<id>" fetches slim slices and drops the other slices."""
+        # Arrange
+        self.data_service.request_gql.return_value = {
+            "id": "a",
+            "key": "a.jpg",
+            "slices": [
+                {"id": "slice-1", "status": "COMPLETED"},
+                {"id": "slice-2", "status": "PENDING"},
+            ],
+        }
+
+        # Act
+        data = self.data_service.get_data(dataset_id="dataset-123", data_id="a", fields="slice:slice-1")
+
+        # Assert
+        query = self.data_service.request_gql.call_args.args[0]["query"]
+        assert "slices {" in query
+        assert "comments" not in query
+        assert [data_slice.id for data_slice in data.slices] == ["slice-1"]
+
+    def test_scan_parallel_projection_keeps_created_at(self):
+        """Test that a projected scan still selects createdAt for boundary deduplication."""
+        # Arrange
+        self.data_service.request_gql.return_value = {"data": [], "next": None}
+
+        # Act
+        list(self.data_service.scan_parallel(
+            dataset_id="dataset-123",
+            shards=1,
+            created_from="2025-01-01T00:00:00Z",
+            created_to="2025-01-02T00:00:00Z",
+            fields="keys",
+        ))
+
+        # Assert
+        query = self.data_service.request_gql.call_args.args[0]["query"]
+        assert "createdAt" in query
+        assert "meta" not in query
+
+    def test_get_data_unknown_projection(self):
+        """Test that an unknown projection is rejected before any request."""
+        # Act & Assert
+        with pytest.raises(BadParameterError):
+            self.data_service.get_data(dataset_id="dataset-123", data_id="a", fields="everything")
+        self.data_service.request_gql.assert_not_called()
+
+    def test_get_data_many_by_key_keeps_order_and_marks_not_found(self):
+        """Test that get_data_many_by_key chunks lookups and returns None for missing keys."""
+        # Arrange
+        def respond(operations):
+            return [
+                (None, NotFoundError("not found")) if variables["key"] == "missing"
+                else ({"id": f"id-{variables['key']}", "key": variables["key"]}, None)
+                for _, variables in operations
+            ]
+        self.data_service.request_gql_batch = Mock(side_effect=respond)
+
+        # Act
+        result = self.data_service.get_data_many_by_key(
+            dataset_id="dataset-123", data_keys=["a", "missing", "b", "c"], chunk_size=2
+        )
+
+        # Assert
+        assert [data.key if data else None for data in result] == ["a", None, "b", "c"]
+        assert self.data_service.request_gql_batch.call_count == 2
+
+    def test_get_data_many_raises_other_errors(self):
+        """Test that get_data_many raises errors other than not found."""
+        # Arrange
+        self.data_service.request_gql_batch = Mock(return_value=[(None, UnknownError("boom"))])
+
+        # Act & Assert
+        with pytest.raises(UnknownError):
+            self.data_service.get_data_many(dataset_id="dataset-123", data_ids=["a"])
+
+    def test_upsert_data_meta_sends_only_given_keys(self):
+        """Test that upsert_data_meta sends the given keys and no other meta."""
+        # Arrange
+        self.data_service.request_gql.return_value = {"id": "data-456"}
+
+        # Act
+        self.data_service.upsert_data_meta(
+            dataset_id="dataset-123", data_id="data-456", meta={"score": 0.9}, returning="id"
+        )
+
+        # Assert
+        query, variables = self.data_service.request_gql.call_args.args
+        assert "upsertDataMeta(" in query["query"]
+        assert variables["meta"] == [{"key": "score", "type": "Number", "value": 0.9}]
+
+    def test_upsert_data_meta_many_reports_errors(self):
+        """Test that upsert_data_meta_many batches the upserts and reports the failed data."""
+        # Arrange
+        self.data_service.request_gql_batch = Mock(return_value=[
+            ({"id": "a"}, None),
+            (None, UnknownError("boom")),
+        ])
+
+        # Act
+        failed = self.data_service.upsert_data_meta_many(
+            dataset_id="dataset-123", meta_by_data_id={"a": {"score": 0.5}, "b": {"score": 0.7}}
+        )
+
+        # Assert
+        operations = self.data_service.request_gql_batch.call_args.args[0]
+        assert operations[0][1]["meta"] == [{"key": "score", "type": "Number", "value": 0.5}]
+        assert "upsertDataMeta(" in operations[0][0]["query"]
+        assert list(failed) == ["b"]
+
+    def test_remove_data_meta_many_reports_errors(self):
+        """Test that remove_data_meta_many batches the removals and reports the failed data."""
+        # Arrange
+        self.data_service.request_gql_batch = Mock(return_value=[
+            ({"id": "a"}, None),
+            (None, UnknownError("boom")),
+        ])
+
+        # Act
+        failed = self.data_service.remove_data_meta_many(
+            dataset_id="dataset-123", meta_by_data_id={"a": {"score": "Number"}, "b": {"score": "Number"}}
+        )
+
+        # Assert
+        query, variables = self.data_service.request_gql_batch.call_args.args[0][0]
+        assert variables["meta"] == [{"key": "score", "type": "Number"}]
+        assert "removeDataMeta(" in query["query"]
+        assert "$meta: [DataMetaInput!]" in query["query"]
+        assert list(failed) == ["b"]
@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from spb_onprem.data.diff import DataChanges, diff_data
+from spb_onprem.data.entities import Data
+from spb_onprem.data.enums import DataStatus
+from spb_onprem.data.service import DataService
+
+
+class TestDiffData:
+    """Test cases for comparing a data snapshot with a desired state."""
+
+    def setup_method(self):
+        self.snapshot = Data.model_validate({
+            "id": "d1",
+            "meta": [
+                {"key": "camera", "type": "String", "value": "front"},
+                {"key": "captured", "type": "DateTime", "value": "2025-01-01T00:00:00.000Z"},
+            ],
+            "annotation": {"meta": {"reviewed": True}},
+            "slices": [{"id": "slice-1", "status": "LABELING", "tags": ["night", "rain"], "meta": {"n": 1}}],
+        })
+
+    def test_unchanged_fields_are_not_reported(self):
+        # Arrange
+        desired = DataChanges(
+            meta={"camera": "front", "captured": datetime(2025, 1, 1, tzinfo=timezone.utc)},
+            annotation_meta={"reviewed": True},
+            slice_id="slice-1",
+            tags=["rain", "night"],
+            status=DataStatus.LABELING,
+            slice_meta={"n": 1},
+        )
+
+        # Act & Assert
+        assert diff_data(self.snapshot, desired) == []
+
+    def test_datetime_strings_are_compared_as_times(self):
+        # Arrange
+        desired = DataChanges(meta={"camera": "front", "captured": "2025-01-01T09:00:00+09:00"})
+
+        # Act & Assert
+        assert diff_data(self.snapshot, desired) == []
+
+    def test_changed_and_unfetched_fields_are_reported(self):
+        # Arrange
+        snapshot = Data.model_validate({"id": "d1", "meta": [{"key": "camera", "type": "String", "value": "front"}]})
+        desired = DataChanges(meta={"camera": "rear"}, slice_id="slice-1", tags=["night"])
+
+        # Act & Assert
+        assert diff_data(snapshot, desired) == ["meta", "tags"]
+
+
+class TestApplyDataChanges:
+    """Test cases for DataService.apply_data_changes."""
+
+    def test_sends_only_changed_fields(self):
+        # Arrange
+        service = DataService()
+        service.request_gql_batch = Mock(side_effect=lambda operations: [({"id": "d1"}, None)] * len(operations))
+        snapshot = Data.model_validate({
+            "id": "d1",
+            "slices": [{"id": "slice-1", "status": "LABELING", "tags": ["night"]}],
+        })
+
+        # Act
+        report = service.apply_data_changes("dataset-1", [
+            (snapshot, {"slice_id": "slice-1", "tags": ["night"], "status": DataStatus.COMPLETED}),
+        ])
+
+        # Assert
+        operations = service.request_gql_batch.call_args.args[0]
+        assert [query["name"] for query, _ in operations] == ["changeDataStatus"]
+        assert operations[0][1]["status"] == "COMPLETED"
+        assert (report.mutations_sent, report.mutations_skipped) == (1, 1)
+
+    def test_meta_keeps_the_snapshot_types_on_the_wire(self):
+        # Arrange
+        service = DataService()
+        service.request_gql_batch = Mock(side_effect=lambda operations: [({"id": "d1"}, None)] * len(operations))
+        snapshot = Data.model_validate({
+            "id": "d1",
+            "meta": [{"key": "ts", "type": "DateTime", "value": "2025-01-01T00:00:00.000Z"}],
+        })
+
+        # Act
+        service.apply_data_changes("dataset-1", [
+            (snapshot, {"meta": {"ts": "2025-01-02T00:00:00Z", "camera": "front"}}),
+        ])
+
+        # Assert
+        (query, variables), = service.request_gql_batch.call_args.args[0]
+        assert query["name"] == "updateData"
+        assert variables["meta"] == [
+            {"key": "ts", "type": "DateTime", "value": "2025-01-02T00:00:00.000Z"},
+            {"key": "camera", "type": "String", "value": "front"},
+        ]
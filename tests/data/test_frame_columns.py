@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from spb_onprem.data.entities import Frame
+from spb_onprem.data.entities.frame import GeoLocation
+from spb_onprem.data import frame_columns
+from spb_onprem.data.frame_columns import FrameColumns
+from spb_onprem.data.service import DataService
+from spb_onprem.exceptions import SDKConfigError
+
+
+def make_response(count):
+    return [
+        {
+            "index": index,
+            "capturedAt": f"2025-01-01T00:00:{index:02d}.000Z",
+            "geoLocation": {"lat": 37.5, "lon": 127.0 + index} if index % 2 == 0 else None,
+            "meta": {"track": index},
+        }
+        for index in range(count)
+    ]
+
+
+class TestFrameColumns:
+    """Test cases for the columnar frame representation."""
+
+    def test_round_trips_frames(self):
+        # Arrange
+        frames = [
+            Frame(index=0, captured_at="2025-01-01T00:00:00.250Z", geo_location=GeoLocation(lat=1.0, lon=2.0)),
+            Frame(index=1, meta={"track": 3}),
+        ]
+
+        # Act
+        restored = FrameColumns.from_frames(frames).to_frames()
+
+        # Assert
+        assert restored == frames
+
+    def test_range_and_time_queries(self):
+        # Arrange
+        columns = FrameColumns.from_response(make_response(30))
+
+        # Act
+        clip = columns.range(5, 25).between(
+            datetime(2025, 1, 1, 0, 0, 10, tzinfo=timezone.utc), datetime(2025, 1, 1, 0, 0, 13, tzinfo=timezone.utc),
+        )
+
+        # Assert
+        assert list(clip.index) == [10, 11, 12]
+        assert clip.meta(1) == {"track": 11}
+        assert clip[0].geo_location == GeoLocation(lat=37.5, lon=137.0)
+        assert clip[1].geo_location is None
+
+    def test_unsorted_range_query(self):
+        # Arrange
+        columns = FrameColumns(index=[5, 1, 9, 3])
+
+        # Act & Assert
+        assert list(columns.range(2, 6).index) == [5, 3]
+
+    def test_sortedness_is_checked_once(self, monkeypatch):
+        # Arrange
+        columns = FrameColumns(index=range(100), captured_at=range(1000, 1100))
+        is_sorted = Mock(side_effect=AssertionError("sortedness was checked again"))
+        monkeypatch.setattr(frame_columns, "_is_sorted", is_sorted)
+
+        # Act
+        first = columns.range(10, 20)
+        second = columns.between(1050, 1060)
+
+        # Assert
+        assert list(first.index) == list(range(10, 20))
+        assert list(second.index) == list(range(50, 60))
+
+    def test_to_numpy_requires_numpy(self, monkeypatch):
+        # Arrange
+        monkeypatch.setattr(frame_columns, "numpy", None)
+        columns = FrameColumns(index=[0, 1])
+
+        # Act & Assert
+        with pytest.raises(SDKConfigError):
+            columns.to_numpy()
+
+
+class TestGetFrameColumns:
+    """Test cases for DataService.get_frame_columns."""
+
+    def test_reads_frames_projection(self):
+        # Arrange
+        service = DataService()
+        service.request_gql = Mock(return_value={"id": "data-1", "frames": make_response(3)})
+
+        # Act
+        columns = service.get_frame_columns("dataset-1", "data-1")
+
+        # Assert
+        assert len(columns) == 3
+        query = service.request_gql.call_args.args[0]["query"]
+        assert "frames" in query and "annotation" not in query
@@ -0,0 +1,118 @@
+from unittest.mock import Mock
+
+from spb_onprem.data.entities import Frame
+from spb_onprem.data.frame_patch import FramePatch, apply_frame_patches
+from spb_onprem.data.service import DataService
+from spb_onprem.exceptions import BadRequestError
+
+
+def make_frames(count):
+    return [Frame(index=index, meta={"track": index % 2}) for index in range(count)]
+
+
+class TestApplyFramePatches:
+    """Test cases for applying frame patches locally."""
+
+    def test_range_patch_merges_meta_and_counts_changes(self):
+        # Arrange
+        frames = make_frames(10)
+
+        # Act
+        patched, changed = apply_frame_patches(frames, [
+            FramePatch(start=2, stop=6, meta={"track": 1, "score": None}),
+            FramePatch(start=8, meta={"score": 0.5}),
+        ])
+
+        # Assert
+        assert changed == 3
+        assert [frame.meta["track"] for frame in patched[:7]] == [0, 1, 1, 1, 1, 1, 0]
+        assert patched[8].meta == {"track": 0, "score": 0.5}
+        assert frames[2].meta == {"track": 0}
+
+
+class TestPatchFrames:
+    """Test cases for DataService.patch_frames and patch_frames_many."""
+
+    def setup_method(self):
+        self.service = DataService()
+        self.service.request_gql = Mock(return_value={"id": "data-1"})
+
+    def test_unchanged_patch_sends_nothing(self):
+        # Act
+        changed = self.service.patch_frames(
+            "dataset-1", "data-1", [{"start": 0, "stop": 2, "meta": {"track": 0}}], frames=make_frames(1),
+        )
+
+        # Assert
+        assert changed == 0
+        self.service.request_gql.assert_not_called()
+
+    def test_patch_reads_frames_and_returns_only_id(self):
+        # Arrange
+        self.service.request_gql.side_effect = [
+            {"id": "data-1", "frames": [frame.model_dump(by_alias=True) for frame in make_frames(3)]},
+            {"id": "data-1"},
+        ]
+
+        # Act
+        changed = self.service.patch_frames("dataset-1", "data-1", [FramePatch(start=1, meta={"track": 5})])
+
+        # Assert
+        assert changed == 1
+        query, variables = self.service.request_gql.call_args.args
+        assert "updateFrames(" in query["query"] and "frames {" not in query["query"]
+        assert [frame["meta"]["track"] for frame in variables["frames"]] == [0, 5, 0]
+
+    def test_patch_many_packs_requests_by_frame_budget(self):
+        # Arrange
+        sent = []
+
+        def request_gql_batch(operations):
+            sent.append([variables.get("data_id", variables.get("id")) for _, variables in operations])
+            if operations[0][0]["name"] == "data":
+                return [({"id": v["id"], "frames": [f.model_dump(by_alias=True) for f in make_frames(4)]}, None)
+                        for _, v in operations]
+            return [({"id": "x"}, None)] * len(operations)
+
+        self.service.request_gql_batch = Mock(side_effect=request_gql_batch)
+
+        # Act
+        failed = self.service.patch_frames_many(
+            "dataset-1",
+            {f"d{i}": [{"start": 0, "meta": {"track": 9}}] for i in range(3)},
+            max_frames_per_request=8,
+            max_workers=1,
+        )
+
+        # Assert
+        assert failed == {}
+        assert sent == [["d0", "d1", "d2"], ["d0", "d1"], ["d2"]]
+
+    def test_patch_many_reports_a_failed_lookup_and_continues(self):
+        # Arrange
+        written = []
+
+        def request_gql_batch(operations):
+            data_ids = [variables.get("data_id", variables.get("id")) for _, variables in operations]
+            if operations[0][0]["name"] == "data":
+                if "d1" in data_ids:
+                    raise BadRequestError("Lookup failed.")
+                return [({"id": v["id"], "frames": [f.model_dump(by_alias=True) for f in make_frames(2)]}, None)
+                        for _, v in operations]
+            written.extend(data_ids)
+            return [({"id": "x"}, None)] * len(operations)
+
+        self.service.request_gql_batch = Mock(side_effect=request_gql_batch)
+
+        # Act
+        failed = self.service.patch_frames_many(
+            "dataset-1",
+            {f"d{i}": [{"start": 0, "meta": {"track": 9}}] for i in range(3)},
+            chunk_size=1,
+            max_workers=1,
+        )
+
+        # Assert
+        assert list(failed) == ["d1"]
+        assert isinstance(failed["d1"], BadRequestError)
+        assert written == ["d0", "d2"]
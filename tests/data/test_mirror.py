@@ -0,0 +1,140 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from spb_onprem.data.entities import Data, DataMeta
+from spb_onprem.data.mirror import DatasetMirror
+from spb_onprem.exceptions import BadParameterError
+
+
+def make_data(data_id, key, updated_at, status="PENDING", meta_value="day"):
+    return Data.model_validate({
+        "id": data_id,
+        "key": key,
+        "type": "SUPERB_IMAGE",
+        "updatedAt": updated_at,
+        "meta": [{"key": "weather", "type": "String", "value": meta_value}],
+        "slices": [{"id": "slice-1", "status": status, "tags": ["night"]}],
+        "annotationStats": [{"annotationClass": "car", "count": 2}],
+    })
+
+
+class TestDatasetMirror:
+    """Test cases for DatasetMirror."""
+
+    def setup_method(self):
+        self.data_service = Mock()
+        self.mirror = DatasetMirror(":memory:", "dataset-123", data_service=self.data_service)
+
+    def teardown_method(self):
+        self.mirror.close()
+
+    def test_first_sync_fetches_everything_and_sets_high_water_mark(self):
+        # Arrange
+        self.data_service.iter_data.return_value = iter([
+            make_data("a", "a.jpg", "2025-01-01T00:00:00.000Z"),
+            make_data("b", "b.jpg", "2025-01-03T00:00:00.000Z"),
+        ])
+
+        # Act
+        stored = self.mirror.sync()
+
+        # Assert
+        assert stored == 2
+        assert len(self.mirror) == 2
+        assert self.mirror.high_water_mark == "2025-01-03T00:00:00.000Z"
+        sync_filter = self.data_service.iter_data.call_args.kwargs["data_filter"]
+        assert sync_filter.must_filter is None
+        assert "updatedAt" in self.data_service.iter_data.call_args.kwargs["fields"]
+
+    def test_incremental_sync_filters_on_updated_at_and_replaces_rows(self):
+        # Arrange
+        self.mirror.upsert([make_data("a", "a.jpg", "2025-01-01T00:00:00.000Z")])
+        self.mirror._set_state("high_water_mark", "2025-01-01T00:00:00.000Z")
+        self.data_service.iter_data.return_value = iter([
+            make_data("a", "a.jpg", "2025-01-05T00:00:00.000Z", status="COMPLETED"),
+        ])
+
+        # Act
+        self.mirror.sync()
+
+        # Assert
+        sync_filter = self.data_service.iter_data.call_args.kwargs["data_filter"]
+        assert sync_filter.must_filter.updated_at.datetime_from == "2024-12-31T23:59:00.000Z"
+        assert len(self.mirror) == 1
+        assert self.mirror.get("a").slices[0].status == "COMPLETED"
+        assert self.mirror.query("SELECT COUNT(*) FROM data_slices")[0][0] == 1
+
+    def test_high_water_mark_compares_timestamps_of_any_precision(self):
+        # Arrange
+        self.data_service.iter_data.return_value = iter([
+            make_data("a", "a.jpg", "2025-01-01T00:00:00.900Z"),
+            make_data("b", "b.jpg", "2025-01-01T00:00:01Z"),
+            make_data("c", "c.jpg", "2025-01-01T00:00:00.950Z"),
+        ])
+
+        # Act
+        self.mirror.sync()
+
+        # Assert
+        assert self.mirror.high_water_mark == "2025-01-01T00:00:01.000Z"
+
+    def test_find_by_datetime_meta_value(self):
+        # Arrange
+        data = make_data("a", "a.jpg", "2025-01-01T00:00:00.000Z")
+        data.meta = [DataMeta.model_validate(
+            {"key": "capturedAt", "type": "DateTime", "value": "2025-01-01T09:00:00+09:00"}
+        )]
+        self.mirror.upsert([data])
+
+        # Act
+        found = self.mirror.find(meta_key="capturedAt", meta_value=datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+        # Assert
+        assert [data.id for data in found] == ["a"]
+
+    def test_failed_sync_keeps_high_water_mark(self):
+        # Arrange
+        def fail():
+            yield make_data("a", "a.jpg", "2025-01-09T00:00:00.000Z")
+            raise RuntimeError("connection lost")
+        self.data_service.iter_data.return_value = fail()
+
+        # Act & Assert
+        with pytest.raises(RuntimeError):
+            self.mirror.sync()
+        assert self.mirror.high_water_mark is None
+
+    def test_find(self):
+        # Arrange
+        self.mirror.upsert([
+            make_data("a", "a.jpg", "2025-01-01T00:00:00.000Z", status="COMPLETED", meta_value="night"),
+            make_data("b", "b.jpg", "2025-01-01T00:00:00.000Z"),
+        ])
+
+        # Act & Assert
+        assert [data.id for data in self.mirror.find(slice_id="slice-1", status="COMPLETED")] == ["a"]
+        assert [data.id for data in self.mirror.find(meta_key="weather", meta_value="day")] == ["b"]
+        assert [data.id for data in self.mirror.find(tag="night", annotation_class="car")] == ["a", "b"]
+        assert self.mirror.get_by_key("b.jpg").id == "b"
+
+    def test_prune_removes_deleted_data(self):
+        # Arrange
+        self.mirror.upsert([make_data("a", "a.jpg", "2025-01-01T00:00:00.000Z")])
+        self.data_service.iter_data.return_value = iter([])
+        self.data_service.iter_data_ids.return_value = iter([])
+
+        # Act
+        self.mirror.sync(prune=True)
+
+        # Assert
+        assert "a" not in self.mirror
+
+    def test_reopening_with_another_dataset_fails(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "mirror.sqlite")
+        DatasetMirror(path, "dataset-123", data_service=self.data_service).close()
+
+        # Act & Assert
+        with pytest.raises(BadParameterError):
+            DatasetMirror(path, "dataset-456", data_service=self.data_service)
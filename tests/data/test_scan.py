@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+from spb_onprem.data.service import DataService
+from spb_onprem.data.params import DataListFilter, DataFilterOptions
+from spb_onprem.data.scan import ScanShard, build_scan_shards, parse_datetime
+
+
+class TestParallelScan:
+    """Test cases for DataService.scan_parallel."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.data_service = DataService()
+        self.data_service.request_gql = Mock()
+
+    def test_build_scan_shards_covers_the_range(self):
+        """Test that windows are contiguous and open-ended at both ends."""
+        shards = build_scan_shards(
+            4,
+            datetime(2025, 1, 1, tzinfo=timezone.utc),
+            datetime(2025, 1, 5, tzinfo=timezone.utc),
+        )
+
+        assert [shard.created_from for shard in shards] == [
+            None, "2025-01-02T00:00:00.000Z", "2025-01-03T00:00:00.000Z", "2025-01-04T00:00:00.000Z",
+        ]
+        assert [shard.created_to for shard in shards] == [
+            "2025-01-02T00:00:00.000Z", "2025-01-03T00:00:00.000Z", "2025-01-04T00:00:00.000Z", None,
+        ]
+
+    def test_scan_parallel_merges_shards_and_drops_boundary_duplicates(self):
+        """Test that every window is walked and boundary data are yielded once."""
+        # Arrange
+        def respond(query, variables):
+            window = variables["filter"]["must"]["createdAt"]
+            if window["from"].startswith("2025-01-01"):
+                if variables["cursor"] is None:
+                    return {"data": [{"id": "a", "createdAt": "2025-01-01T12:00:00Z"}], "next": "p2"}
+                return {"data": [{"id": "edge", "createdAt": "2025-01-02T00:00:00.000Z"}], "next": None}
+            return {"data": [
+                {"id": "edge", "createdAt": "2025-01-02T00:00:00Z"},
+                {"id": "b", "createdAt": "2025-01-02T12:00:00Z"},
+            ], "next": None}
+
+        self.data_service.request_gql.side_effect = respond
+        progress = []
+
+        # Act
+        result = self.data_service.scan_parallel(
+            dataset_id="dataset-123",
+            data_filter=DataListFilter(must_filter=DataFilterOptions(type_in=["IMAGE"])),
+            shards=2,
+            created_from="2025-01-01T00:00:00Z",
+            created_to="2025-01-03T00:00:00Z",
+            on_progress=lambda shard: progress.append((shard.index, shard.done)),
+        )
+        ids = sorted(data.id for data in result)
+
+        # Assert
+        assert ids == ["a", "b", "edge"]
+        filters = [call.args[1]["filter"] for call in self.data_service.request_gql.call_args_list]
+        assert all(data_filter["must"]["typeIn"] == ["IMAGE"] for data_filter in filters)
+        assert (0, True) in progress and (1, True) in progress
+
+    def test_scan_parallel_resumes_from_saved_shards(self):
+        """Test that finished shards are skipped and others continue from their cursor."""
+        # Arrange
+        self.data_service.request_gql.return_value = {"data": [{"id": "c"}], "next": None}
+        saved = [
+            ScanShard(index=0, created_to="2025-01-02T00:00:00.000Z", done=True, count=10).model_dump(by_alias=True),
+            ScanShard(index=1, created_from="2025-01-02T00:00:00.000Z", cursor="page-7").model_dump(by_alias=True),
+        ]
+
+        # Act
+        ids = [data.id for data in self.data_service.scan_parallel(dataset_id="dataset-123", resume_from=saved)]
+
+        # Assert
+        assert ids == ["c"]
+        self.data_service.request_gql.assert_called_once()
+        assert self.data_service.request_gql.call_args.args[1]["cursor"] == "page-7"
+
+    def test_parse_datetime_normalizes_precision(self):
+        """Test that timestamps with different precisions compare equal."""
+        assert parse_datetime("2025-01-02T00:00:00Z") == parse_datetime("2025-01-02T00:00:00.000000+00:00")
@@ -0,0 +1,129 @@
+import time
+from unittest.mock import Mock
+
+from spb_onprem.data.entities import DataMeta
+from spb_onprem.data.service import DataService
+from spb_onprem.exceptions import UnknownError
+
+
+class TestWriteBehindBuffer:
+    """Test cases for the write-behind buffer of per-data mutations."""
+
+    def setup_method(self):
+        self.service = DataService()
+        self.sent = []
+
+        def request_gql_batch(operations):
+            self.sent.append(operations)
+            return [({"id": "x"}, None)] * len(operations)
+
+        self.service.request_gql_batch = Mock(side_effect=request_gql_batch)
+
+    def test_edits_of_the_same_target_are_merged(self):
+        # Act
+        with self.service.write_buffer() as buffer:
+            buffer.update_data("dataset-1", "d1", meta=DataMeta.from_dict({"a": 1}))
+            buffer.update_data("dataset-1", "d1", key="renamed")
+            buffer.update_data("dataset-1", "d1", meta=DataMeta.from_dict({"a": 2}))
+            buffer.update_data_slice("dataset-1", "d1", "slice-1", meta={"checked": True})
+            buffer.update_tags("dataset-1", "slice-1", "d1", tags=["night"])
+            buffer.update_tags("dataset-1", "slice-1", "d1", tags=["day"])
+
+        # Assert
+        assert len(self.sent) == 1
+        operations = {query["name"]: variables for query, variables in self.sent[0]}
+        assert list(operations) == ["updateData", "updateDataSlice", "updateDataTags"]
+        assert operations["updateData"]["key"] == "renamed"
+        assert operations["updateData"]["meta"][0]["value"] == 2
+        assert operations["updateDataTags"]["tags"] == ["day"]
+        stats = buffer.stats()
+        assert (stats["edits_sent"], stats["mutations_sent"], stats["merge_ratio"]) == (6, 3, 2.0)
+
+    def test_flushes_when_full_and_reports_errors(self):
+        # Arrange
+        self.service.request_gql_batch = Mock(side_effect=lambda operations: [
+            (None, UnknownError("GraphQL errors: not found")) if variables["data_id"] == "d1" else ({"id": "x"}, None)
+            for _, variables in operations
+        ])
+
+        # Act
+        buffer = self.service.write_buffer(max_targets=2)
+        buffer.update_data_slice("dataset-1", "d0", "slice-1", meta={"n": 0})
+        buffer.update_data_slice("dataset-1", "d1", "slice-1", meta={"n": 1})
+
+        # Assert
+        assert buffer.pending == 0
+        assert list(buffer.failed) == [("dataset-1", "d1", "slice-1")]
+
+    def test_flushes_after_max_delay(self):
+        # Act
+        buffer = self.service.write_buffer(max_delay=0.05)
+        buffer.update_tags("dataset-1", "slice-1", "d1", tags=["night"])
+        deadline = time.monotonic() + 2
+        while self.sent == [] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        buffer.close()
+
+        # Assert
+        assert len(self.sent) == 1
+
+    def test_unexpected_error_is_reported_and_keeps_the_timer_alive(self):
+        # Arrange
+        self.service.request_gql_batch = Mock(side_effect=[RuntimeError("connection reset"), [({"id": "x"}, None)]])
+        buffer = self.service.write_buffer(max_delay=0.05)
+
+        # Act
+        buffer.update_tags("dataset-1", "slice-1", "d1", tags=["night"])
+        deadline = time.monotonic() + 2
+        while not buffer.failed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        buffer.update_tags("dataset-1", "slice-1", "d2", tags=["day"])
+        while self.service.request_gql_batch.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        buffer.close()
+
+        # Assert
+        assert isinstance(buffer.failed[("dataset-1", "d1", "slice-1")], RuntimeError)
+        assert self.service.request_gql_batch.call_count == 2
+        assert buffer.stats()["targets_sent"] == 2
+
+    def test_failed_fields_are_kept_and_retried(self):
+        # Arrange
+        self.service.request_gql_batch = Mock(side_effect=[
+            RuntimeError("connection reset"),
+            [({"id": "x"}, None), ({"id": "x"}, None)],
+        ])
+        buffer = self.service.write_buffer()
+        buffer.update_data_slice("dataset-1", "d1", "slice-1", meta={"n": 1})
+        buffer.update_tags("dataset-1", "slice-1", "d1", tags=["night"])
+        buffer.flush()
+
+        # Act
+        buffer.update_tags("dataset-1", "slice-1", "d1", tags=["day"])
+        failed = buffer.retry_failed()
+
+        # Assert
+        assert failed == {}
+        assert (buffer.failed, buffer.failed_fields) == ({}, {})
+        operations = {query["name"]: variables for query, variables in self.service.request_gql_batch.call_args.args[0]}
+        assert operations["updateDataSlice"]["meta"] == {"n": 1}
+        assert operations["updateDataTags"]["tags"] == ["day"]
+
+    def test_sent_fields_supersede_failed_ones(self):
+        # Arrange
+        self.service.request_gql_batch = Mock(side_effect=[
+            [(None, UnknownError("GraphQL errors: timeout"))] * 2,
+            [({"id": "x"}, None)],
+        ])
+        buffer = self.service.write_buffer()
+        buffer.update_data_slice("dataset-1", "d1", "slice-1", meta={"n": 1})
+        buffer.update_tags("dataset-1", "slice-1", "d1", tags=["night"])
+        buffer.flush()
+
+        # Act
+        buffer.update_tags("dataset-1", "slice-1", "d1", tags=["day"])
+        buffer.flush()
+
+        # Assert
+        assert buffer.failed_fields == {("dataset-1", "d1", "slice-1"): {"meta": {"n": 1}}}
+        assert isinstance(buffer.failed[("dataset-1", "d1", "slice-1")], UnknownError)
@@ -0,0 +1,83 @@
+from collections import Counter
+from unittest.mock import Mock
+
+import pytest
+
+from spb_onprem.data.enums import DataStatus
+from spb_onprem.exceptions import BadParameterError
+from spb_onprem.slices import Assignee
+from spb_onprem.slices.assignment import plan_assignment
+from spb_onprem.slices.service import SliceService
+
+
+class TestPlanAssignment:
+    """Test cases for the load-balanced assignment plan."""
+
+    def test_loads_follow_weights(self):
+        # Arrange
+        assignees = [Assignee(user="a", weight=3), Assignee(user="b"), Assignee(user="c", weight=2)]
+
+        # Act
+        plan = plan_assignment([f"d{i}" for i in range(600)], assignees)
+
+        # Assert
+        assert Counter(plan.values()) == {"a": 300, "b": 100, "c": 200}
+
+    def test_current_load_and_capacity_are_respected(self):
+        # Arrange
+        assignees = [Assignee(user="a", capacity=5), Assignee(user="b", capacity=10)]
+
+        # Act
+        plan = plan_assignment([f"d{i}" for i in range(12)], assignees, current_load={"a": 1, "b": 3})
+
+        # Assert
+        assert Counter(plan.values()) == {"a": 4, "b": 7, None: 1}
+
+    def test_duplicate_user_is_rejected(self):
+        with pytest.raises(BadParameterError):
+            plan_assignment(["d0"], [Assignee(user="a"), Assignee(user="a")])
+
+
+class TestAssignData:
+    """Test cases for SliceService.assign_data."""
+
+    def setup_method(self):
+        self.service = SliceService()
+        self.service.request_gql = Mock(return_value={"data": [{"id": f"d{i}"} for i in range(4)], "next": None})
+        self.operations = []
+
+        def request_gql_batch(operations):
+            self.operations.extend(operations)
+            if operations[0][0]["name"] == "dataList":
+                return [({"data": [], "totalCount": 2 if i == 0 else 0}, None) for i in range(len(operations))]
+            return [({"id": variables["data_id"]}, None) for _, variables in operations]
+
+        self.service.request_gql_batch = Mock(side_effect=request_gql_batch)
+
+    def test_assigns_unassigned_data_balanced_with_existing_load(self):
+        # Act
+        report = self.service.assign_data(
+            "dataset-1", "slice-1", "labeler", ["alice", "bob"], status=DataStatus.LABELING, max_workers=1,
+        )
+
+        # Assert
+        selection = self.service.request_gql.call_args.args[1]["filter"]
+        assert selection == {"slice": {"id": "slice-1", "not": {"labeler": {"exists": True}}}}
+        assert report.assigned == {"alice": 1, "bob": 3}
+        mutations = [(query["name"], variables) for query, variables in self.operations if query["name"] != "dataList"]
+        assert [name for name, _ in mutations[:2]] == ["changeDataLabeler", "changeDataStatus"]
+        assert mutations[1][1]["status"] == "LABELING"
+
+    def test_reassign_skips_existing_load_and_reports_failures(self):
+        # Arrange
+        self.service.request_gql_batch = Mock(side_effect=lambda operations: [
+            (None, BadParameterError("no such user")) if variables["reviewer"] == "bob" else ({"id": "x"}, None)
+            for _, variables in operations
+        ])
+
+        # Act
+        report = self.service.assign_data("dataset-1", "slice-1", "reviewer", ["alice", "bob"], reassign=True)
+
+        # Assert
+        assert report.assigned == {"alice": 2}
+        assert sorted(report.failed) == ["d1", "d3"]
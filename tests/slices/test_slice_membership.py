@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+from spb_onprem.data.params import DataFilterOptions, DataListFilter
+from spb_onprem.exceptions import UnknownError
+from spb_onprem.slices.service import SliceService
+
+
+class TestSliceMembership:
+    """Test cases for adding and removing many data to and from a slice."""
+
+    def setup_method(self):
+        self.service = SliceService()
+        self.service.request_gql = Mock()
+        self.members = {"d1"}
+        self.applied = []
+
+        def request_gql_batch(operations):
+            outcomes = []
+            for query, variables in operations:
+                if query["name"] == "dataList":
+                    ids = variables["filter"]["must"]["idIn"]
+                    outcomes.append(({"data": [{"id": i} for i in ids if i in self.members]}, None))
+                else:
+                    self.applied.append((query["name"], variables["data_id"]))
+                    outcomes.append(({"id": variables["data_id"]}, None))
+            return outcomes
+
+        self.service.request_gql_batch = Mock(side_effect=request_gql_batch)
+
+    def test_add_data_skips_members(self):
+        # Arrange
+        progress = []
+
+        # Act
+        report = self.service.add_data(
+            "dataset-1", "slice-1", ["d0", "d1", "d2"], batch_size=2, max_workers=1,
+            on_progress=lambda report: progress.append(report.requested),
+        )
+
+        # Assert
+        assert self.applied == [("addDataToSlice", "d0"), ("addDataToSlice", "d2")]
+        assert (report.requested, report.changed, report.skipped) == (3, 2, 1)
+        assert progress == [2, 3]
+
+    def test_remove_data_streams_ids_from_filter(self):
+        # Arrange
+        self.service.request_gql.side_effect = [
+            {"data": [{"id": "d0"}, {"id": "d1"}], "next": "cursor-1"},
+            {"data": [{"id": "d2"}], "next": None},
+        ]
+        data_filter = DataListFilter(must_filter=DataFilterOptions(key_contains="night"))
+
+        # Act
+        report = self.service.remove_data("dataset-1", "slice-1", data_filter, max_workers=1)
+
+        # Assert
+        assert self.applied == [("removeDataFromSlice", "d1")]
+        assert (report.requested, report.changed, report.skipped) == (3, 1, 2)
+        assert self.service.request_gql.call_args_list[1].args[1]["cursor"] == "cursor-1"
+
+    def test_mutation_errors_are_reported_per_data(self):
+        # Arrange
+        self.service.request_gql_batch = Mock(return_value=[
+            ({"id": "d0"}, None),
+            (None, UnknownError("GraphQL errors: data not found")),
+        ])
+
+        # Act
+        report = self.service.add_data("dataset-1", "slice-1", ["d0", "d9"], skip_unchanged=False)
+
+        # Assert
+        assert report.changed == 1
+        assert report.failed == {"d9": "GraphQL errors: data not found"}
+        mutation = self.service.request_gql_batch.call_args.args[0][0][0]
+        assert "addDataToSlice" in mutation["query"]
+        assert "annotation" not in mutation["query"]
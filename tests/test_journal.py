@@ -0,0 +1,114 @@
+from unittest.mock import Mock
+
+import pytest
+
+from spb_onprem.utils import OperationJournal
+
+
+class TestOperationJournal:
+    """Test cases for the write-ahead journal of bulk jobs."""
+
+    def setup_method(self):
+        self.operation = Mock(return_value="data-1")
+
+    def test_records_completion_and_skips_it_on_restart(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "job.journal")
+        with OperationJournal(path) as journal:
+            journal.run("create:k1", self.operation)
+
+        # Act
+        with OperationJournal(path) as journal:
+            result = journal.run("create:k1", self.operation)
+            status = journal.status("create:k1")
+
+        # Assert
+        assert result == "data-1"
+        assert status == "done"
+        assert self.operation.call_count == 1
+
+    def test_pending_item_is_reconciled_instead_of_reissued(self, tmp_path):
+        # Arrange
+        path = tmp_path / "job.journal"
+        path.write_text('{"id": "create:k1", "state": "intent"}\n{"id": "create:k2", "st')
+        reconcile = Mock(return_value="data-found")
+
+        # Act
+        with OperationJournal(str(path)) as journal:
+            pending = journal.pending()
+            result = journal.run("create:k1", self.operation, reconcile=reconcile)
+
+        # Assert
+        assert pending == ["create:k1"]
+        assert result == "data-found"
+        self.operation.assert_not_called()
+
+    def test_record_after_a_torn_line_survives_a_restart(self, tmp_path):
+        # Arrange
+        path = tmp_path / "job.journal"
+        path.write_text('{"id": "create:k1", "state": "done", "result": "data-1"}\n{"id": "create:k2", "st')
+
+        # Act
+        with OperationJournal(str(path)) as journal:
+            journal.run("create:k2", lambda: "data-2")
+
+        # Assert
+        assert OperationJournal(str(path)).completed() == {"create:k1": "data-1", "create:k2": "data-2"}
+
+    def test_pending_item_is_reissued_when_reconcile_finds_nothing(self, tmp_path):
+        # Arrange
+        path = tmp_path / "job.journal"
+        path.write_text('{"id": "create:k1", "state": "intent"}\n')
+
+        # Act
+        with OperationJournal(str(path)) as journal:
+            result = journal.run("create:k1", self.operation, reconcile=lambda: None)
+
+        # Assert
+        assert result == "data-1"
+        self.operation.assert_called_once()
+
+    def test_failure_is_recorded_and_retried_on_next_run(self, tmp_path):
+        # Arrange
+        path = str(tmp_path / "job.journal")
+        self.operation.side_effect = [ValueError("boom"), "data-1"]
+        with OperationJournal(path) as journal:
+            with pytest.raises(ValueError):
+                journal.run("create:k1", self.operation)
+
+        # Act
+        with OperationJournal(path) as journal:
+            failed = journal.failed()
+            result = journal.run("create:k1", self.operation)
+
+        # Assert
+        assert failed == {"create:k1": "boom"}
+        assert result == "data-1"
+
+    def test_compact_keeps_last_state_of_every_item(self, tmp_path):
+        # Arrange
+        path = tmp_path / "job.journal"
+        with OperationJournal(str(path), fsync=False) as journal:
+            for i in range(3):
+                journal.run(f"create:k{i}", lambda i=i: f"data-{i}")
+
+            # Act
+            journal.compact()
+            journal.run("create:k3", lambda: "data-3")
+
+        # Assert
+        assert len(path.read_text().splitlines()) == 5
+        assert OperationJournal(str(path)).completed() == {f"create:k{i}": f"data-{i}" for i in range(4)}
+
+    def test_failed_item_is_reconciled_before_it_is_reissued(self, tmp_path):
+        # Arrange
+        path = tmp_path / "job.journal"
+        path.write_text('{"id": "create:k1", "state": "failed", "error": "read timed out"}\n')
+
+        # Act
+        with OperationJournal(str(path)) as journal:
+            result = journal.run("create:k1", self.operation, reconcile=lambda: "data-found")
+
+        # Assert
+        assert result == "data-found"
+        self.operation.assert_not_called()
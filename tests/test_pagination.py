@@ -0,0 +1,46 @@
+import time
+
+from spb_onprem.utils.pagination import iter_pages
+
+
+class TestIterPages:
+    """Test cases for the prefetching page iterator."""
+
+    def test_prefetch_is_bounded(self):
+        """Test that the producer does not run more than prefetch pages ahead."""
+        fetched = []
+
+        def fetch_page(cursor):
+            index = 0 if cursor is None else int(cursor)
+            fetched.append(index)
+            return [index], (str(index + 1) if index < 9 else None)
+
+        pages = iter_pages(fetch_page, prefetch=2)
+        first = next(pages)
+        time.sleep(0.3)
+
+        assert first == ([0], "1")
+        # One page consumed, two queued and one blocked in put.
+        assert len(fetched) <= 4
+        assert [items[0] for items, _ in pages] == list(range(1, 10))
+
+    def test_close_stops_the_producer(self):
+        """Test that closing the iterator stops fetching."""
+        fetched = []
+
+        def fetch_page(cursor):
+            fetched.append(cursor)
+            return [cursor], "next"
+
+        pages = iter_pages(fetch_page, prefetch=1)
+        next(pages)
+        pages.close()
+        count = len(fetched)
+        time.sleep(0.3)
+
+        assert len(fetched) <= count + 1
+
+    def test_without_prefetch(self):
+        """Test the synchronous mode."""
+        pages = list(iter_pages(lambda cursor: ([cursor], None if cursor else "x"), prefetch=0))
+        assert pages == [([None], "x"), (["x"], None)]
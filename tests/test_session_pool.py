@@ -0,0 +1,100 @@
+import pytest
+import requests
+
+from spb_onprem.base_service import BaseService
+from spb_onprem.session_pool import SessionPool
+
+
+class TestSessionPool:
+    """Test cases for SessionPool."""
+
+    def test_session_is_reused_per_host(self):
+        """Test that the same host gets the same long-lived session."""
+        pool = SessionPool()
+
+        first = pool.get_session("https://api.example.com/graphql/")
+        second = pool.get_session("https://api.example.com/other")
+        other_host = pool.get_session("https://bucket.s3.amazonaws.com/key")
+
+        assert first is second
+        assert first is not other_host
+        stats = pool.stats()
+        assert stats["sessions_created"] == 2
+        assert stats["hosts"]["https://api.example.com"]["requests"] == 2
+
+    def test_idle_session_is_evicted(self):
+        """Test that a session idle for longer than idle_timeout is replaced."""
+        pool = SessionPool(idle_timeout=10)
+        session = pool.get_session("https://api.example.com/graphql/")
+        last_used = pool._last_used[("https", "api.example.com")]
+
+        assert pool.evict_idle(now=last_used + 5) == 0
+        assert pool.evict_idle(now=last_used + 11) == 1
+        assert pool.get_session("https://api.example.com/graphql/") is not session
+        assert pool.stats()["sessions_evicted"] == 1
+
+    def test_configure_rebuilds_sessions(self):
+        """Test that configure applies the new pool size to fresh sessions."""
+        pool = SessionPool()
+        session = pool.get_session("https://api.example.com/graphql/")
+
+        pool.configure(pool_connections=4, pool_maxsize=32)
+        rebuilt = pool.get_session("https://api.example.com/graphql/")
+
+        assert rebuilt is not session
+        adapter = rebuilt.get_adapter("https://api.example.com")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+
+    def test_session_in_flight_is_not_evicted(self):
+        """Test that a checked-out session survives idle eviction until its request ends."""
+        pool = SessionPool(idle_timeout=10)
+        host_key = ("https", "api.example.com")
+
+        with pool.session("https://api.example.com/upload") as session:
+            started = pool._last_used[host_key]
+            assert pool.evict_idle(now=started + 600) == 0
+            assert pool.stats()["hosts"]["https://api.example.com"]["in_flight"] == 1
+
+        assert pool.get_session("https://api.example.com/graphql/") is session
+        assert pool._last_used[host_key] > started
+
+    def test_session_with_a_streamed_response_is_not_evicted(self):
+        """Test that a session whose connection is still checked out is kept."""
+        pool = SessionPool(idle_timeout=10)
+        session = pool.get_session("https://bucket.example.com/key")
+        connection_pool = session.get_adapter("https://bucket.example.com").poolmanager.connection_from_url(
+            "https://bucket.example.com/key"
+        )
+        connection = connection_pool._get_conn()
+        last_used = pool._last_used[("https", "bucket.example.com")]
+
+        assert pool.evict_idle(now=last_used + 600) == 0
+        connection_pool._put_conn(connection)
+        assert pool.evict_idle(now=last_used + 600) == 1
+
+    def test_configure_can_disable_idle_eviction(self):
+        """Test that configure(idle_timeout=None) turns eviction off and omitting it keeps the value."""
+        pool = SessionPool(idle_timeout=10)
+
+        pool.configure(pool_maxsize=4)
+        assert pool.idle_timeout == 10
+        pool.configure(idle_timeout=None)
+        pool.get_session("https://api.example.com/graphql/")
+
+        assert pool.idle_timeout is None
+        assert pool.evict_idle(now=float("inf")) == 0
+
+
+class TestRequestsRetrySession:
+    """Test cases for the deprecated arguments of BaseService.requests_retry_session."""
+
+    def test_retry_arguments_build_a_session_of_their_own(self):
+        """Test that the legacy retry arguments still configure the returned session."""
+        session = requests.Session()
+
+        with pytest.warns(DeprecationWarning):
+            result = BaseService.requests_retry_session(retries=2, session=session)
+
+        assert result is session
+        assert result.get_adapter("https://api.example.com").max_retries.total == 2